@@ -1,69 +1,43 @@
 """
 인증 시스템
 간단한 사번/이름 기반 인증 (MVP)
+- stateful: 서버 세션 저장소 (기본)
+- signed: HMAC 서명 토큰 (공유 상태 없이 검증, 로그아웃은 폐기 목록)
 """
 import secrets
-import json
-import os
-from typing import Optional, Dict
+from typing import Optional
 from datetime import datetime, timedelta
-from pathlib import Path
 from models import User, LoginRequest, LoginResponse
 from database import db
+from config.settings import settings, DEFAULT_SECRET_KEY
+from utils.session_store import SessionStore
+from utils.signed_token import SignedTokenCodec, RevocationList, is_signed_token
 
 
 class AuthManager:
     """인증 관리 클래스 (세션 영속화 지원)"""
     
     def __init__(self):
-        # 세션 파일 경로
-        self.session_file = Path("data/sessions.json")
-        self.session_timeout = timedelta(hours=8)  # 8시간 세션 유지
+        if settings.SESSION_TOKEN_MODE == "signed" and settings.SECRET_KEY == DEFAULT_SECRET_KEY:
+            # 기본 키는 저장소에 공개되어 있어 누구나 토큰을 위조할 수 있음
+            raise RuntimeError("SESSION_TOKEN_MODE=signed에서는 SECRET_KEY를 기본값에서 변경해야 합니다")
+        
+        self.session_timeout = timedelta(hours=settings.SESSION_TIMEOUT_HOURS)
+        
+        # 세션 저장소 (스냅샷 + write-behind 로그, 만료 힙)
+        self.sessions = SessionStore(
+            snapshot_file=settings.SESSION_FILE,
+            log_file=settings.SESSION_LOG_FILE,
+            flush_interval=settings.SESSION_FLUSH_INTERVAL_SECONDS,
+            sweep_interval=settings.SESSION_SWEEP_INTERVAL_SECONDS,
+            compact_threshold=settings.SESSION_COMPACT_THRESHOLD
+        )
+        self.sessions.start()
         
-        # 세션 저장소 (파일에서 로드)
-        self.sessions: Dict[str, Dict] = self._load_sessions()
-    
-    def _load_sessions(self) -> Dict:
-        """세션 파일에서 로드"""
-        if not self.session_file.exists():
-            return {}
-        
-        try:
-            with open(self.session_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-                # datetime 문자열을 객체로 복원
-                for token, session in data.items():
-                    session['login_time'] = datetime.fromisoformat(session['login_time'])
-                    session['expire_time'] = datetime.fromisoformat(session['expire_time'])
-                
-                print(f"✅ {len(data)}개 세션 로드 완료")
-                return data
-        except Exception as e:
-            print(f"⚠️  세션 로드 실패: {e}, 새로 시작합니다")
-            return {}
-    
-    def _save_sessions(self):
-        """세션 파일에 저장"""
-        try:
-            # data 디렉토리 확인
-            self.session_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            # datetime 객체를 문자열로 변환
-            data = {}
-            for token, session in self.sessions.items():
-                data[token] = {
-                    'user': session['user'],
-                    'login_time': session['login_time'].isoformat(),
-                    'expire_time': session['expire_time'].isoformat()
-                }
-            
-            # 파일에 저장
-            with open(self.session_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-                
-        except Exception as e:
-            print(f"⚠️  세션 저장 실패: {e}")
+        # 서명 토큰 (SESSION_TOKEN_MODE=signed 일 때만 발급/검증)
+        self.token_mode = settings.SESSION_TOKEN_MODE
+        self.token_codec = SignedTokenCodec(settings.SECRET_KEY)
+        self.revoked_tokens = RevocationList(settings.REVOKED_TOKENS_FILE)
     
     def generate_session_token(self) -> str:
         """세션 토큰 생성"""
@@ -99,18 +73,25 @@ class AuthManager:
                 session_token=None
             )
         
+        # 서명 토큰 모드: 서버에 세션을 저장하지 않음
+        if self.token_mode == "signed":
+            return LoginResponse(
+                success=True,
+                message="로그인 성공",
+                user=user.dict(),
+                session_token=self.issue_signed_token(user)
+            )
+        
         # 세션 토큰 생성
         session_token = self.generate_session_token()
         
-        # 세션 저장
-        self.sessions[session_token] = {
+        # 세션 저장 (파일 영속화는 백그라운드에서 로그로 기록)
+        now = datetime.now()
+        self.sessions.put(session_token, {
             "user": user.dict(),
-            "login_time": datetime.now(),
-            "expire_time": datetime.now() + self.session_timeout
-        }
-        
-        # 파일에 영속화
-        self._save_sessions()
+            "login_time": now,
+            "expire_time": now + self.session_timeout
+        })
         
         return LoginResponse(
             success=True,
@@ -129,35 +110,79 @@ class AuthManager:
         Returns:
             성공 여부
         """
-        if session_token in self.sessions:
-            del self.sessions[session_token]
-            # 파일에 영속화
-            self._save_sessions()
+        if is_signed_token(session_token):
+            if self.token_mode != "signed":
+                return False
+            payload = self.token_codec.verify(session_token)
+            if not payload or self.revoked_tokens.is_revoked(payload["jti"]):
+                return False
+            self.revoked_tokens.revoke(payload["jti"], payload["exp"])
             return True
-        return False
+        
+        return self.sessions.delete(session_token)
     
-    def validate_session(self, session_token: str) -> Optional[User]:
+    def issue_signed_token(self, user: User) -> str:
+        """서명 토큰 발급 (사번, 이름, 부서, 역할, 만료 포함)"""
+        token, _ = self.token_codec.issue(
+            {
+                "sub": user.employee_id,
+                "name": user.name,
+                "dept": user.department,
+                "email": user.email,
+                "role": user.role
+            },
+            ttl_seconds=int(self.session_timeout.total_seconds())
+        )
+        return token
+    
+    def validate_signed_token(self, token: str) -> Optional[User]:
         """
-        세션 검증
+        서명 토큰 검증 (세션 저장소 조회 없음)
+        
+        일반 사용자 역할은 토큰 값을 그대로 쓰고, 그 외(관리자 등) 권한 역할은
+        저장소의 현재 역할로 다시 확인합니다 (권한 회수 즉시 반영).
         
         Args:
-            session_token: 세션 토큰
+            token: 서명 토큰
             
         Returns:
             User 객체 또는 None
         """
-        if session_token not in self.sessions:
+        payload = self.token_codec.verify(token)
+        if not payload or self.revoked_tokens.is_revoked(payload["jti"]):
             return None
         
-        session = self.sessions[session_token]
+        role = payload.get("role", "user")
+        if role != "user":
+            stored = db.get_user_by_employee_id(payload["sub"])
+            role = stored.role if stored else "user"
+        
+        # 서명으로 이미 검증된 값이므로 pydantic 검증 생략
+        return User.model_construct(
+            employee_id=payload["sub"],
+            name=payload["name"],
+            department=payload["dept"],
+            email=payload.get("email"),
+            role=role
+        )
+    
+    def validate_session(self, session_token: str) -> Optional[User]:
+        """
+        세션 검증
         
-        # 세션 만료 확인
-        if datetime.now() > session["expire_time"]:
-            del self.sessions[session_token]
+        Args:
+            session_token: 세션 토큰
+            
+        Returns:
+            User 객체 또는 None
+        """
+        # 조회 (만료된 세션은 저장소에서 삭제됨)
+        session = self.sessions.get(session_token)
+        if session is None:
             return None
         
-        # 세션 갱신
-        session["expire_time"] = datetime.now() + self.session_timeout
+        # 세션 갱신 (슬라이딩 만료)
+        self.sessions.touch(session_token, datetime.now() + self.session_timeout)
         
         return User(**session["user"])
     
@@ -174,24 +199,30 @@ class AuthManager:
         if not session_token:
             return None
         
+        if is_signed_token(session_token):
+            # stateful 모드에서는 서명 토큰을 받지 않음 (발급한 적 없는 토큰)
+            if self.token_mode != "signed":
+                return None
+            return self.validate_signed_token(session_token)
+        
         return self.validate_session(session_token)
     
-    def cleanup_expired_sessions(self):
+    def cleanup_expired_sessions(self) -> int:
         """만료된 세션 정리"""
-        now = datetime.now()
-        expired_tokens = [
-            token for token, session in self.sessions.items()
-            if now > session["expire_time"]
-        ]
-        
-        for token in expired_tokens:
-            del self.sessions[token]
+        return self.sessions.purge_expired()
+    
+    def shutdown(self) -> int:
+        """
+        서버 종료 처리
         
-        if expired_tokens:
-            # 파일에 영속화
-            self._save_sessions()
+        만료 세션을 정리하고 남은 변경을 스냅샷으로 압축 저장합니다.
         
-        return len(expired_tokens)
+        Returns:
+            정리된 세션 수
+        """
+        cleaned = self.cleanup_expired_sessions()
+        self.sessions.close()
+        return cleaned
 
 
 # 싱글톤 인스턴스
@@ -6,6 +6,10 @@ from pydantic_settings import BaseSettings
 from typing import Optional, List
 
 
+# 저장소에 공개된 기본 SECRET_KEY (서명 토큰 모드에서는 사용 금지)
+DEFAULT_SECRET_KEY = "encar-copilot-secret-key-change-in-production"
+
+
 class Settings(BaseSettings):
     """애플리케이션 설정"""
     
@@ -18,20 +22,26 @@ class Settings(BaseSettings):
     
     # 보안 설정
     OPENAI_API_KEY: Optional[str] = None  # 환경변수에서 로드
-    SECRET_KEY: str = "encar-copilot-secret-key-change-in-production"  # JWT/세션 암호화용
+    SECRET_KEY: str = DEFAULT_SECRET_KEY  # JWT/세션 암호화용 (signed 토큰 모드에서는 반드시 변경)
     ALLOWED_ORIGINS: str = "http://localhost:8000,https://encar.com"  # CORS 허용 도메인
     
     # 레이트리밋 설정
     RATE_LIMIT_PER_MINUTE: int = 10  # 사용자당 분당 요청 수
     RATE_LIMIT_PER_HOUR: int = 100   # 사용자당 시간당 요청 수
     
-    # 데이터베이스 설정 (Phase 2에서 사용)
-    DATABASE_URL: Optional[str] = None  # PostgreSQL 연결 문자열
+    # 데이터베이스 설정
+    DATABASE_BACKEND: str = "json"  # json(파일), sqlite
+    SQLITE_PATH: str = "data/encar_copilot.db"  # SQLite 파일 경로 (WAL 모드)
+    SQLITE_POOL_SIZE: int = 4  # SQLite 연결 풀 크기
+    DATABASE_URL: Optional[str] = None  # PostgreSQL 연결 문자열 (Phase 2에서 사용)
     REDIS_URL: Optional[str] = None     # Redis 캐시 연결 문자열
     
     # 시맨틱 검색 설정
     SEMANTIC_SEARCH_ENABLED: bool = True
     SEMANTIC_MODEL: str = "jhgan/ko-sroberta-multitask"
+    SEMANTIC_SEARCH_MODE: str = "hybrid"  # dense(벡터만), hybrid(벡터 + 문자 n-gram 어휘 검색)
+    SEMANTIC_LEXICAL_WEIGHT: float = 0.3  # hybrid: 코사인 유사도에 더할 어휘 점수 가중치
+    SEMANTIC_H2_PROBES: int = 2  # 계층 검색: H2 중심 벡터로 고른 뒤 세부 검색할 후보 H2 수
     
     # 검색 임계값
     SEMANTIC_THRESHOLD_MD: float = 0.25  # MD 파일 최소 신뢰도
@@ -40,14 +50,28 @@ class Settings(BaseSettings):
     SEMANTIC_SCORE_DIFF: float = 0.08  # 유사 섹션 점수 차이
     KEYWORD_SEARCH_THRESHOLD: float = 0.03  # 키워드 검색 임계값
     
+    # 스트리밍 설정
+    SSE_HEARTBEAT_SECONDS: float = 15.0  # 토큰이 없을 때 하트비트 주기 (연결 종료 확인 주기 겸용)
+    
     # 세션 설정
     SESSION_TIMEOUT_HOURS: int = 8
+    SESSION_FILE: str = "data/sessions.json"  # 세션 스냅샷
+    SESSION_LOG_FILE: str = "data/sessions.log"  # 세션 변경 로그 (write-behind)
+    SESSION_FLUSH_INTERVAL_SECONDS: float = 2.0  # 변경 로그 기록 주기
+    SESSION_SWEEP_INTERVAL_SECONDS: float = 60.0  # 만료 세션 정리 주기
+    SESSION_COMPACT_THRESHOLD: int = 1000  # 로그 항목 수가 넘으면 스냅샷으로 압축
+    SESSION_TOKEN_MODE: str = "stateful"  # stateful(서버 세션), signed(HMAC 서명 토큰)
+    REVOKED_TOKENS_FILE: str = "data/revoked_tokens.json"  # 서명 토큰 폐기 목록
     
     # 파일 경로
     DATA_DIR: str = "data"
     FAQ_FILE: str = "data/faq_data.json"
     USERS_FILE: str = "data/users.json"
-    FEEDBACK_FILE: str = "data/feedback.json"
+    FEEDBACK_FILE: str = "data/feedback.json"  # 레거시 (최초 실행 시 로그로 이관)
+    FEEDBACK_LOG_DIR: str = "data/feedback_log"  # 피드백 추가 전용 세그먼트 로그
+    FEEDBACK_LOG_SEGMENT_BYTES: int = 8 * 1024 * 1024  # 세그먼트 최대 크기
+    FEEDBACK_STATS_FILE: str = "data/feedback_log/stats_checkpoint.json"  # 피드백 통계 체크포인트
+    FEEDBACK_STATS_CHECKPOINT_EVERY: int = 100  # 새로 반영한 건수가 넘으면 체크포인트 저장
     SEMANTIC_INDEX_DIR: str = "data/semantic_index"
     MD_FILES_DIR: str = "docs"
     
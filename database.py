@@ -1,18 +1,199 @@
 """
 데이터베이스 관리 모듈
 JSON 파일을 사용한 간단한 데이터베이스 관리 (MVP)
-파일 잠금을 통한 동시 쓰기 방지 기능 포함
+OS 파일 잠금(공유/배타) + 원자적 쓰기로 동시 접근 보호
+FAQ/사용자는 read-through 캐시 (mtime/size 변경 시에만 다시 로드)
+피드백은 추가 전용 세그먼트 로그 (그룹 커밋 + 커서 페이지네이션)
+저장소 인터페이스(Repository) 뒤에서 JSON/SQLite 백엔드 선택 (DATABASE_BACKEND)
 """
 import json
 import os
-import time
-from typing import List, Optional, Dict
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Callable, List, NamedTuple, Optional, Dict, Tuple
 from pathlib import Path
 from models import FAQItem, User, Feedback
+from utils.file_lock import FileLock, atomic_write_json
+from utils.append_log import SegmentedLog, GroupCommitWriter
+from utils.feedback_stats import FeedbackStats
+from config.settings import settings
 
 
-class Database:
-    """데이터베이스 관리 클래스"""
+class FAQSnapshot(NamedTuple):
+    """FAQ 캐시 스냅샷 (불변 모델 + 조회 인덱스)"""
+    faqs: Tuple[FAQItem, ...]
+    by_id: Dict[int, FAQItem]
+    by_category: Dict[str, Tuple[FAQItem, ...]]
+    categories: Tuple[str, ...]
+
+
+class UserSnapshot(NamedTuple):
+    """사용자 캐시 스냅샷 (불변 모델 + 사번 인덱스)"""
+    users: Tuple[User, ...]
+    by_employee_id: Dict[str, User]
+
+
+def _build_faq_snapshot(data: dict) -> FAQSnapshot:
+    """FAQ JSON → 스냅샷 (모델 생성과 인덱스 구축은 로드 시 1회)"""
+    faqs = tuple(FAQItem(**faq) for faq in data.get("faqs", []))
+    
+    by_category: Dict[str, List[FAQItem]] = {}
+    for faq in faqs:
+        by_category.setdefault(faq.category, []).append(faq)
+    
+    return FAQSnapshot(
+        faqs=faqs,
+        by_id={faq.id: faq for faq in faqs},
+        by_category={category: tuple(items) for category, items in by_category.items()},
+        categories=tuple(sorted(by_category))
+    )
+
+
+def _build_user_snapshot(data: dict) -> UserSnapshot:
+    """사용자 JSON → 스냅샷"""
+    users = tuple(User(**user) for user in data.get("users", []))
+    by_employee_id: Dict[str, User] = {}
+    for user in users:
+        # 중복 사번은 기존 선형 탐색과 같게 첫 번째 항목 우선
+        by_employee_id.setdefault(user.employee_id, user)
+    return UserSnapshot(users=users, by_employee_id=by_employee_id)
+
+
+class CachedJSONFile:
+    """
+    JSON 파일 read-through 캐시
+    
+    파일의 (mtime, size)가 바뀌었을 때만 다시 읽고 builder로 스냅샷을 만듭니다.
+    같은 프로세스의 쓰기는 invalidate()로 즉시 무효화합니다.
+    generation은 스냅샷을 다시 만들 때마다 증가합니다 (파생 색인의 재구축 판단용).
+    """
+    
+    def __init__(self, file_path: str, loader: Callable[[str], dict], builder: Callable[[dict], Any]):
+        self.file_path = file_path
+        self._loader = loader
+        self._builder = builder
+        self._signature: Optional[Tuple[int, int]] = None
+        self._value: Any = None
+        self.generation = 0
+        self._lock = threading.Lock()
+    
+    def _stat_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.file_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+    
+    def get(self) -> Any:
+        """스냅샷 반환 (파일이 바뀐 경우에만 다시 로드)"""
+        signature = self._stat_signature()
+        value = self._value
+        if value is not None and signature == self._signature:
+            return value
+        
+        with self._lock:
+            # 다른 스레드가 먼저 다시 로드했는지 확인
+            signature = self._stat_signature()
+            if self._value is None or signature != self._signature:
+                data = self._loader(self.file_path)
+                self._value = self._builder(data)
+                self.generation += 1
+                # 읽기 실패(빈 결과)는 캐시 서명을 남기지 않아 다음 호출에서 다시 시도
+                self._signature = signature if data else None
+            return self._value
+    
+    def invalidate(self):
+        """캐시 무효화"""
+        with self._lock:
+            self._value = None
+            self._signature = None
+
+
+class Repository(ABC):
+    """
+    저장소 인터페이스 (db 싱글톤이 구현하는 메서드)
+    
+    모든 메서드는 동기(블로킹) 호출이므로 엔드포인트에서는 run_in_threadpool로 호출합니다.
+    """
+    
+    # FAQ
+    @abstractmethod
+    def get_all_faqs(self) -> List[FAQItem]: ...
+    
+    @abstractmethod
+    def faq_version(self) -> int:
+        """FAQ 데이터 버전 (다른 프로세스의 수정 포함, 바뀌면 값이 달라짐)"""
+    
+    @abstractmethod
+    def get_faq_by_id(self, faq_id: int) -> Optional[FAQItem]: ...
+    
+    @abstractmethod
+    def get_faqs_by_category(self, category: str) -> List[FAQItem]: ...
+    
+    @abstractmethod
+    def get_all_categories(self) -> List[str]:
+        """모든 카테고리 목록 (이름순 정렬, 백엔드와 무관하게 같은 순서)"""
+    
+    @abstractmethod
+    def add_faq(self, faq: FAQItem) -> bool: ...
+    
+    @abstractmethod
+    def update_faq(self, faq_id: int, updated_faq: FAQItem) -> bool: ...
+    
+    # 사용자
+    @abstractmethod
+    def get_all_users(self) -> List[User]: ...
+    
+    @abstractmethod
+    def get_user_by_employee_id(self, employee_id: str) -> Optional[User]: ...
+    
+    @abstractmethod
+    def add_user(self, user: User) -> bool: ...
+    
+    # 피드백
+    @abstractmethod
+    def get_all_feedbacks(self) -> List[Feedback]: ...
+    
+    @abstractmethod
+    def add_feedback(self, feedback: Feedback) -> bool: ...
+    
+    @abstractmethod
+    def add_detailed_feedback(self, feedback) -> bool: ...
+    
+    @abstractmethod
+    def get_feedback_stats(self, window: Optional[str] = None, bucket: Optional[str] = None) -> Dict: ...
+    
+    @abstractmethod
+    def get_detailed_feedbacks(self, limit: int = 100, cursor: int = 0) -> Dict: ...
+    
+    @abstractmethod
+    def get_negative_feedbacks(self, limit: int = 100, cursor: int = 0) -> Dict: ...
+    
+    @abstractmethod
+    def close(self): ...
+    
+    # FAQ 변경 알림 (검색 색인 증분 갱신 등)
+    def add_faq_listener(self, listener: Callable[[str, int, FAQItem], None]):
+        """
+        FAQ 추가/수정 성공 시 호출할 리스너 등록
+        
+        listener(action, faq_id, faq): action은 "add" 또는 "update", faq_id는 변경 전 ID
+        """
+        if not hasattr(self, "_faq_listeners"):
+            self._faq_listeners = []
+        self._faq_listeners.append(listener)
+    
+    def _notify_faq_change(self, action: str, faq_id: int, faq: FAQItem):
+        """등록된 리스너 호출 (리스너 오류는 저장 결과에 영향 없음)"""
+        for listener in getattr(self, "_faq_listeners", []):
+            try:
+                listener(action, faq_id, faq)
+            except Exception as e:
+                print(f"⚠️ FAQ 변경 리스너 오류: {e}")
+
+
+class Database(Repository):
+    """데이터베이스 관리 클래스 (JSON 파일 백엔드)"""
     
     def __init__(self):
         self.data_dir = "data"
@@ -23,50 +204,37 @@ class Database:
         # 데이터 디렉토리가 없으면 생성
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
-    
-    def _get_lock_file(self, file_path: str) -> str:
-        """잠금 파일 경로 생성"""
-        return f"{file_path}.lock"
-    
-    def _acquire_lock(self, file_path: str, timeout: float = 5.0) -> bool:
-        """
-        파일 잠금 획득 (단순 파일 기반 잠금)
         
-        Args:
-            file_path: 잠글 파일 경로
-            timeout: 최대 대기 시간 (초)
+        # read-through 캐시 (FAQ, 사용자)
+        self._faq_cache = CachedJSONFile(self.faq_file, self._read_json, _build_faq_snapshot)
+        self._user_cache = CachedJSONFile(self.users_file, self._read_json, _build_user_snapshot)
         
-        Returns:
-            잠금 획득 성공 여부
-        """
-        lock_file = self._get_lock_file(file_path)
-        start_time = time.time()
+        # 피드백 추가 전용 로그 (일반/상세)
+        self.feedback_log_dir = settings.FEEDBACK_LOG_DIR
+        self.feedback_log = SegmentedLog(
+            os.path.join(self.feedback_log_dir, "feedbacks"),
+            segment_max_bytes=settings.FEEDBACK_LOG_SEGMENT_BYTES
+        )
+        self.detailed_feedback_log = SegmentedLog(
+            os.path.join(self.feedback_log_dir, "detailed_feedbacks"),
+            segment_max_bytes=settings.FEEDBACK_LOG_SEGMENT_BYTES
+        )
+        self._import_legacy_feedback()
+        self._feedback_writer = GroupCommitWriter(self.feedback_log)
+        self._detailed_feedback_writer = GroupCommitWriter(self.detailed_feedback_log)
         
-        while True:
-            try:
-                # 잠금 파일이 없으면 생성 (원자적 연산)
-                fd = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
-                os.write(fd, str(os.getpid()).encode())
-                os.close(fd)
-                return True
-            except FileExistsError:
-                # 잠금 파일이 이미 존재하면 대기
-                if time.time() - start_time > timeout:
-                    print(f"⚠️  파일 잠금 타임아웃: {file_path}")
-                    return False
-                time.sleep(0.01)  # 10ms 대기
-    
-    def _release_lock(self, file_path: str):
-        """파일 잠금 해제"""
-        lock_file = self._get_lock_file(file_path)
-        try:
-            os.remove(lock_file)
-        except FileNotFoundError:
-            pass  # 이미 삭제됨
+        # 피드백 통계 (증분 집계, 체크포인트 + 로그에서 재구축 가능)
+        self.feedback_stats = FeedbackStats(
+            self.feedback_log,
+            self.detailed_feedback_log,
+            settings.FEEDBACK_STATS_FILE,
+            checkpoint_every=settings.FEEDBACK_STATS_CHECKPOINT_EVERY
+        )
     
     def _read_json(self, file_path: str) -> dict:
-        """JSON 파일 읽기 (잠금 사용)"""
-        if not self._acquire_lock(file_path):
+        """JSON 파일 읽기 (공유 잠금: 읽기끼리는 서로 막지 않음)"""
+        lock = FileLock(file_path, shared=True)
+        if not lock.acquire():
             return {}
         
         try:
@@ -77,117 +245,184 @@ class Database:
         except json.JSONDecodeError:
             return {}
         finally:
-            self._release_lock(file_path)
+            lock.release()
     
     def _write_json(self, file_path: str, data: dict):
-        """JSON 파일 쓰기 (잠금 사용)"""
-        if not self._acquire_lock(file_path):
+        """JSON 파일 쓰기 (배타 잠금 + 원자적 교체)"""
+        lock = FileLock(file_path)
+        if not lock.acquire():
             raise IOError(f"파일 잠금 획득 실패: {file_path}")
         
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            atomic_write_json(file_path, data)
         finally:
-            self._release_lock(file_path)
+            lock.release()
+    
+    def _update_json(self, file_path: str, mutate: Callable[[dict], bool]) -> bool:
+        """
+        JSON 읽기-수정-쓰기 (배타 잠금을 쥔 채로 수행해 동시 수정 유실 방지)
+        
+        Args:
+            file_path: 파일 경로
+            mutate: data를 수정하고 변경 여부를 반환하는 함수
+        
+        Returns:
+            변경(저장) 여부
+        """
+        lock = FileLock(file_path)
+        if not lock.acquire():
+            raise IOError(f"파일 잠금 획득 실패: {file_path}")
+        
+        try:
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                data = {}
+            
+            changed = mutate(data)
+            if changed:
+                atomic_write_json(file_path, data)
+            return changed
+        finally:
+            lock.release()
     
     # FAQ 관련 메서드
     def get_all_faqs(self) -> List[FAQItem]:
         """모든 FAQ 항목 조회"""
-        data = self._read_json(self.faq_file)
-        faqs = data.get("faqs", [])
-        return [FAQItem(**faq) for faq in faqs]
+        return list(self._faq_cache.get().faqs)
+    
+    def faq_version(self) -> int:
+        """FAQ 데이터 버전 (캐시 스냅샷 세대, 파일이 바뀌어 다시 읽을 때마다 증가)"""
+        self._faq_cache.get()
+        return self._faq_cache.generation
     
     def get_faq_by_id(self, faq_id: int) -> Optional[FAQItem]:
         """ID로 FAQ 항목 조회"""
-        faqs = self.get_all_faqs()
-        for faq in faqs:
-            if faq.id == faq_id:
-                return faq
-        return None
+        return self._faq_cache.get().by_id.get(faq_id)
     
     def get_faqs_by_category(self, category: str) -> List[FAQItem]:
         """카테고리별 FAQ 조회"""
-        faqs = self.get_all_faqs()
-        return [faq for faq in faqs if faq.category == category]
+        return list(self._faq_cache.get().by_category.get(category, ()))
     
     def get_all_categories(self) -> List[str]:
-        """모든 카테고리 목록 조회"""
-        faqs = self.get_all_faqs()
-        categories = set(faq.category for faq in faqs)
-        return sorted(list(categories))
+        """모든 카테고리 목록 조회 (이름순)"""
+        return list(self._faq_cache.get().categories)
     
     def add_faq(self, faq: FAQItem) -> bool:
         """새로운 FAQ 추가"""
-        try:
-            data = self._read_json(self.faq_file)
-            faqs = data.get("faqs", [])
-            faqs.append(faq.dict())
-            data["faqs"] = faqs
-            self._write_json(self.faq_file, data)
+        def mutate(data: dict) -> bool:
+            data.setdefault("faqs", []).append(faq.dict())
             return True
+        
+        try:
+            self._update_json(self.faq_file, mutate)
+            self._faq_cache.invalidate()
         except Exception as e:
             print(f"FAQ 추가 중 오류 발생: {e}")
             return False
+        self._notify_faq_change("add", faq.id, faq)
+        return True
     
     def update_faq(self, faq_id: int, updated_faq: FAQItem) -> bool:
         """FAQ 업데이트"""
-        try:
-            data = self._read_json(self.faq_file)
+        def mutate(data: dict) -> bool:
             faqs = data.get("faqs", [])
             for i, faq in enumerate(faqs):
                 if faq["id"] == faq_id:
                     faqs[i] = updated_faq.dict()
-                    data["faqs"] = faqs
-                    self._write_json(self.faq_file, data)
                     return True
             return False
+        
+        try:
+            updated = self._update_json(self.faq_file, mutate)
+            if updated:
+                self._faq_cache.invalidate()
         except Exception as e:
             print(f"FAQ 업데이트 중 오류 발생: {e}")
             return False
+        if updated:
+            self._notify_faq_change("update", faq_id, updated_faq)
+        return updated
     
     # 사용자 관련 메서드
     def get_all_users(self) -> List[User]:
         """모든 사용자 조회"""
-        data = self._read_json(self.users_file)
-        users = data.get("users", [])
-        return [User(**user) for user in users]
+        return list(self._user_cache.get().users)
     
     def get_user_by_employee_id(self, employee_id: str) -> Optional[User]:
         """사번으로 사용자 조회"""
-        users = self.get_all_users()
-        for user in users:
-            if user.employee_id == employee_id:
-                return user
-        return None
+        return self._user_cache.get().by_employee_id.get(employee_id)
     
     def add_user(self, user: User) -> bool:
         """새로운 사용자 추가"""
+        def mutate(data: dict) -> bool:
+            data.setdefault("users", []).append(user.dict())
+            return True
+        
         try:
-            data = self._read_json(self.users_file)
-            users = data.get("users", [])
-            users.append(user.dict())
-            data["users"] = users
-            self._write_json(self.users_file, data)
+            self._update_json(self.users_file, mutate)
+            self._user_cache.invalidate()
             return True
         except Exception as e:
             print(f"사용자 추가 중 오류 발생: {e}")
             return False
     
     # 피드백 관련 메서드
+    def _import_legacy_feedback(self):
+        """기존 feedback.json을 로그로 이관 (로그가 비어 있을 때 1회)"""
+        if not os.path.exists(self.feedback_file):
+            return
+        
+        with FileLock(os.path.join(self.feedback_log_dir, "import")):
+            if len(self.feedback_log) or len(self.detailed_feedback_log):
+                return
+            
+            data = self._read_json(self.feedback_file)
+            feedbacks = data.get("feedbacks", [])
+            detailed_feedbacks = data.get("detailed_feedbacks", [])
+            self.feedback_log.append_batch(feedbacks)
+            self.detailed_feedback_log.append_batch(detailed_feedbacks)
+            if feedbacks or detailed_feedbacks:
+                print(f"✅ 기존 피드백 이관 완료: 일반 {len(feedbacks)}건, 상세 {len(detailed_feedbacks)}건")
+    
+    def _read_feedback_page(self, log: SegmentedLog, cursor: int, limit: int,
+                            predicate: Optional[Callable[[Dict], bool]] = None) -> Dict:
+        """
+        커서 기반 페이지 조회 (희소 인덱스로 cursor 위치에서 바로 읽음)
+        
+        predicate가 있으면 조건에 맞는 기록이 limit개 모일 때까지 계속 읽으므로
+        마지막 페이지가 아니면 항상 limit개를 채워 반환합니다.
+        
+        Returns:
+            {"feedbacks": [...], "next_cursor": 다음 페이지 커서 또는 None}
+        """
+        feedbacks = []
+        if limit <= 0:
+            return {"feedbacks": feedbacks, "next_cursor": None}
+        
+        last_seq = None
+        for seq, record in log.iter_from(max(cursor, 0)):
+            last_seq = seq
+            if predicate is None or predicate(record):
+                feedbacks.append({**record, "seq": seq})
+                if len(feedbacks) >= limit:
+                    break
+        
+        next_cursor = None
+        if len(feedbacks) >= limit and last_seq + 1 < log.next_seq:
+            next_cursor = last_seq + 1
+        return {"feedbacks": feedbacks, "next_cursor": next_cursor}
+    
     def get_all_feedbacks(self) -> List[Feedback]:
         """모든 피드백 조회"""
-        data = self._read_json(self.feedback_file)
-        feedbacks = data.get("feedbacks", [])
-        return [Feedback(**feedback) for feedback in feedbacks]
+        return [Feedback(**record) for _, record in self.feedback_log.iter_from(0)]
     
     def add_feedback(self, feedback: Feedback) -> bool:
-        """피드백 추가"""
+        """피드백 추가 (그룹 커밋 완료까지 대기)"""
         try:
-            data = self._read_json(self.feedback_file)
-            feedbacks = data.get("feedbacks", [])
-            feedbacks.append(feedback.dict())
-            data["feedbacks"] = feedbacks
-            self._write_json(self.feedback_file, data)
+            self._feedback_writer.append(feedback.dict())
+            self.feedback_stats.catch_up()
             return True
         except Exception as e:
             print(f"피드백 추가 중 오류 발생: {e}")
@@ -195,63 +430,30 @@ class Database:
     
     def add_detailed_feedback(self, feedback) -> bool:
         """상세 피드백 추가 (싫어요 + 이유 + 의견)"""
+        feedback_dict = feedback.dict()
+        feedback_dict["id"] = f"fb_{feedback.question_id}"
+        
         try:
-            data = self._read_json(self.feedback_file)
-            
-            # 상세 피드백 저장
-            detailed_feedbacks = data.get("detailed_feedbacks", [])
-            feedback_dict = feedback.dict()
-            feedback_dict["id"] = f"fb_{feedback.question_id}"
-            detailed_feedbacks.append(feedback_dict)
-            data["detailed_feedbacks"] = detailed_feedbacks
-            
-            self._write_json(self.feedback_file, data)
+            self._detailed_feedback_writer.append(feedback_dict)
+            self.feedback_stats.catch_up()
             print(f"✅ 상세 피드백 저장: 질문='{feedback.user_question}', 이유={feedback.reasons}")
             return True
         except Exception as e:
             print(f"❌ 상세 피드백 추가 중 오류 발생: {e}")
             return False
     
-    def get_feedback_stats(self) -> Dict:
-        """피드백 통계 조회 (개선된 버전)"""
+    def get_feedback_stats(self, window: Optional[str] = None, bucket: Optional[str] = None) -> Dict:
+        """
+        피드백 통계 조회 (증분 집계에서 바로 반환)
+        
+        Args:
+            window: None(전체), "daily", "weekly"
+            bucket: 버킷 키 (기본: 현재 일/주, 예: 2024-05-01, 2024-W18)
+        """
         try:
-            data = self._read_json(self.feedback_file)
-            feedbacks = data.get("feedbacks", [])
-            detailed_feedbacks = data.get("detailed_feedbacks", [])
-            
-            total = len(feedbacks)
-            positive = sum(1 for f in feedbacks if f.get("is_helpful", False))
-            negative = total - positive
-            
-            # 상세 피드백 통계
-            negative_reasons = {}
-            sections_needing_improvement = {}
-            
-            for df in detailed_feedbacks:
-                # 이유별 집계
-                for reason in df.get("reasons", []):
-                    negative_reasons[reason] = negative_reasons.get(reason, 0) + 1
-                
-                # 섹션별 집계
-                section = df.get("matched_section", "알 수 없음")
-                sections_needing_improvement[section] = sections_needing_improvement.get(section, 0) + 1
-            
-            # 개선 필요 섹션 정렬 (많은 순)
-            sorted_sections = sorted(
-                [{"section": k, "count": v} for k, v in sections_needing_improvement.items()],
-                key=lambda x: x["count"],
-                reverse=True
-            )
-            
-            return {
-                "total": total,
-                "positive": positive,
-                "negative": negative,
-                "positive_rate": round(positive / total * 100, 1) if total > 0 else 0,
-                "detailed_feedbacks_count": len(detailed_feedbacks),
-                "negative_reasons": negative_reasons,
-                "sections_needing_improvement": sorted_sections[:10]  # 상위 10개
-            }
+            return self.feedback_stats.get_stats(window, bucket)
+        except ValueError:
+            raise
         except Exception as e:
             print(f"❌ 통계 조회 중 오류 발생: {e}")
             return {
@@ -264,28 +466,48 @@ class Database:
                 "sections_needing_improvement": []
             }
     
-    def get_detailed_feedbacks(self, limit: int = 100) -> List[Dict]:
-        """상세 피드백 조회"""
+    def get_detailed_feedbacks(self, limit: int = 100, cursor: int = 0) -> Dict:
+        """상세 피드백 조회 (커서 페이지네이션)"""
         try:
-            data = self._read_json(self.feedback_file)
-            detailed_feedbacks = data.get("detailed_feedbacks", [])
-            return detailed_feedbacks[:limit]
+            return self._read_feedback_page(self.detailed_feedback_log, cursor, limit)
         except Exception as e:
             print(f"❌ 상세 피드백 조회 중 오류 발생: {e}")
-            return []
+            return {"feedbacks": [], "next_cursor": None}
     
-    def get_negative_feedbacks(self) -> List[Dict]:
-        """부정 피드백만 조회"""
+    def get_negative_feedbacks(self, limit: int = 100, cursor: int = 0) -> Dict:
+        """부정 피드백만 조회 (커서 페이지네이션, 페이지마다 limit개를 채울 때까지 읽음)"""
         try:
-            data = self._read_json(self.feedback_file)
-            detailed_feedbacks = data.get("detailed_feedbacks", [])
-            return [f for f in detailed_feedbacks if not f.get("is_helpful", True)]
+            return self._read_feedback_page(
+                self.detailed_feedback_log, cursor, limit,
+                predicate=lambda f: not f.get("is_helpful", True)
+            )
         except Exception as e:
             print(f"❌ 부정 피드백 조회 중 오류 발생: {e}")
-            return []
+            return {"feedbacks": [], "next_cursor": None}
+    
+    def close(self):
+        """대기 중인 피드백 커밋 후 writer 종료"""
+        self._feedback_writer.close()
+        self._detailed_feedback_writer.close()
+        self.feedback_stats.catch_up()
+        self.feedback_stats.checkpoint()
+
+
+def create_database() -> Repository:
+    """설정(DATABASE_BACKEND)에 따라 저장소 생성"""
+    backend = settings.DATABASE_BACKEND.lower()
+    
+    if backend == "sqlite":
+        from database_sqlite import SQLiteDatabase
+        print(f"🗄️  SQLite 저장소 사용: {settings.SQLITE_PATH}")
+        return SQLiteDatabase(settings.SQLITE_PATH, pool_size=settings.SQLITE_POOL_SIZE)
+    
+    if backend != "json":
+        print(f"⚠️  알 수 없는 DATABASE_BACKEND '{settings.DATABASE_BACKEND}', JSON 저장소를 사용합니다")
+    return Database()
 
 
 # 싱글톤 인스턴스
-db = Database()
+db = create_database()
 
 
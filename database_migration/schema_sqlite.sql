@@ -0,0 +1,192 @@
+-- Encar Copilot SQLite 스키마 (schema.sql의 SQLite 버전)
+-- 배열 컬럼(keywords, reasons)은 JSON 텍스트로 저장하고,
+-- GIN 인덱스 대신 별도 테이블(faq_keywords, detailed_feedback_reasons)에 인덱스를 둡니다.
+-- user_id는 앱에서 쓰는 사번(employee_id) 문자열입니다.
+
+-- 사용자 테이블
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    employee_id TEXT UNIQUE NOT NULL,
+    name TEXT NOT NULL,
+    department TEXT,
+    email TEXT UNIQUE,
+    role TEXT DEFAULT 'user' CHECK (role IN ('admin', 'user')),
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 사용자 인덱스
+CREATE INDEX IF NOT EXISTS idx_users_employee_id ON users(employee_id);
+CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
+CREATE INDEX IF NOT EXISTS idx_users_role ON users(role);
+
+-- 세션은 SQLite에 저장하지 않음 (utils/session_store.py의 스냅샷 + 변경 로그, 또는 서명 토큰)
+
+-- FAQ 테이블
+CREATE TABLE IF NOT EXISTS faqs (
+    id INTEGER PRIMARY KEY,
+    category TEXT NOT NULL,
+    question TEXT NOT NULL,
+    main_answer TEXT NOT NULL,
+    keywords TEXT NOT NULL DEFAULT '[]',  -- JSON 배열
+    department TEXT,
+    link TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+-- FAQ 인덱스
+CREATE INDEX IF NOT EXISTS idx_faqs_category ON faqs(category);
+
+-- 데이터 버전 (트리거로 증가, 다른 프로세스의 수정도 감지 → 키워드 검색 색인 재구축 판단)
+CREATE TABLE IF NOT EXISTS data_versions (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO data_versions (name, version) VALUES ('faqs', 0);
+
+-- FAQ 키워드 (배열 검색용, PostgreSQL GIN 인덱스 대체)
+CREATE TABLE IF NOT EXISTS faq_keywords (
+    faq_id INTEGER NOT NULL REFERENCES faqs(id) ON DELETE CASCADE,
+    keyword TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_faq_keywords_keyword ON faq_keywords(keyword);
+CREATE INDEX IF NOT EXISTS idx_faq_keywords_faq_id ON faq_keywords(faq_id);
+
+-- 피드백 테이블
+CREATE TABLE IF NOT EXISTS feedbacks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT,
+    question_id INTEGER,
+    user_question TEXT NOT NULL,
+    is_helpful INTEGER NOT NULL,
+    comment TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 피드백 인덱스
+CREATE INDEX IF NOT EXISTS idx_feedbacks_user_id ON feedbacks(user_id);
+CREATE INDEX IF NOT EXISTS idx_feedbacks_is_helpful ON feedbacks(is_helpful);
+CREATE INDEX IF NOT EXISTS idx_feedbacks_created_at ON feedbacks(created_at DESC);
+
+-- 상세 피드백 테이블
+CREATE TABLE IF NOT EXISTS detailed_feedbacks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT,
+    user_name TEXT,
+    question_id INTEGER,
+    user_question TEXT NOT NULL,
+    is_helpful INTEGER DEFAULT 0,
+    reasons TEXT NOT NULL DEFAULT '[]',  -- JSON 배열: ["정확하지 않음", "도움이 안됨"]
+    comment TEXT,
+    matched_section TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 상세 피드백 인덱스
+CREATE INDEX IF NOT EXISTS idx_detailed_feedbacks_user_id ON detailed_feedbacks(user_id);
+CREATE INDEX IF NOT EXISTS idx_detailed_feedbacks_created_at ON detailed_feedbacks(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_detailed_feedbacks_section ON detailed_feedbacks(matched_section, created_at);
+
+-- 상세 피드백 이유 (이유별 집계용, PostgreSQL GIN 인덱스 대체)
+CREATE TABLE IF NOT EXISTS detailed_feedback_reasons (
+    feedback_id INTEGER NOT NULL REFERENCES detailed_feedbacks(id) ON DELETE CASCADE,
+    reason TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_detailed_feedback_reasons_reason ON detailed_feedback_reasons(reason, created_at);
+CREATE INDEX IF NOT EXISTS idx_detailed_feedback_reasons_feedback_id ON detailed_feedback_reasons(feedback_id);
+
+-- 피드백 집계 (트리거로 증분 유지, 통계 조회가 피드백 행 수와 무관)
+-- bucket: 'all' 또는 일자('2024-05-01'), 주별 통계는 7개 일자 버킷을 합산
+-- metric: total, positive, detailed, reason, section
+CREATE TABLE IF NOT EXISTS feedback_aggregates (
+    bucket TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    key TEXT NOT NULL DEFAULT '',
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (bucket, metric, key)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS aggregate_feedbacks
+AFTER INSERT ON feedbacks
+BEGIN
+    INSERT INTO feedback_aggregates (bucket, metric, key, count) VALUES
+        ('all', 'total', '', 1),
+        ('all', 'positive', '', NEW.is_helpful),
+        (substr(NEW.created_at, 1, 10), 'total', '', 1),
+        (substr(NEW.created_at, 1, 10), 'positive', '', NEW.is_helpful)
+    ON CONFLICT (bucket, metric, key) DO UPDATE SET count = count + excluded.count;
+END;
+
+CREATE TRIGGER IF NOT EXISTS aggregate_detailed_feedbacks
+AFTER INSERT ON detailed_feedbacks
+BEGIN
+    INSERT INTO feedback_aggregates (bucket, metric, key, count) VALUES
+        ('all', 'detailed', '', 1),
+        ('all', 'section', COALESCE(NEW.matched_section, '알 수 없음'), 1),
+        (substr(NEW.created_at, 1, 10), 'detailed', '', 1),
+        (substr(NEW.created_at, 1, 10), 'section', COALESCE(NEW.matched_section, '알 수 없음'), 1)
+    ON CONFLICT (bucket, metric, key) DO UPDATE SET count = count + excluded.count;
+END;
+
+CREATE TRIGGER IF NOT EXISTS aggregate_detailed_feedback_reasons
+AFTER INSERT ON detailed_feedback_reasons
+BEGIN
+    INSERT INTO feedback_aggregates (bucket, metric, key, count) VALUES
+        ('all', 'reason', NEW.reason, 1),
+        (substr(NEW.created_at, 1, 10), 'reason', NEW.reason, 1)
+    ON CONFLICT (bucket, metric, key) DO UPDATE SET count = count + excluded.count;
+END;
+
+-- API 요청 로그 테이블 (선택 사항)
+CREATE TABLE IF NOT EXISTS api_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT,
+    method TEXT NOT NULL,
+    path TEXT NOT NULL,
+    status_code INTEGER,
+    duration_ms REAL,
+    ip_address TEXT,
+    user_agent TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+-- API 로그 인덱스
+CREATE INDEX IF NOT EXISTS idx_api_logs_created_at ON api_logs(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_api_logs_user_id ON api_logs(user_id);
+CREATE INDEX IF NOT EXISTS idx_api_logs_status_code ON api_logs(status_code);
+
+-- updated_at 자동 갱신
+CREATE TRIGGER IF NOT EXISTS update_users_updated_at
+AFTER UPDATE ON users
+FOR EACH ROW WHEN NEW.updated_at = OLD.updated_at
+BEGIN
+    UPDATE users SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS update_faqs_updated_at
+AFTER UPDATE ON faqs
+FOR EACH ROW WHEN NEW.updated_at = OLD.updated_at
+BEGIN
+    UPDATE faqs SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+END;
+
+-- FAQ 데이터 버전 증가
+CREATE TRIGGER IF NOT EXISTS faqs_version_insert
+AFTER INSERT ON faqs
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE name = 'faqs';
+END;
+
+CREATE TRIGGER IF NOT EXISTS faqs_version_update
+AFTER UPDATE ON faqs
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE name = 'faqs';
+END;
+
+CREATE TRIGGER IF NOT EXISTS faqs_version_delete
+AFTER DELETE ON faqs
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE name = 'faqs';
+END;
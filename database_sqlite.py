@@ -0,0 +1,440 @@
+"""
+SQLite 저장소 (database_migration/schema_sqlite.sql)
+- WAL 모드: 읽기는 쓰기를 기다리지 않음, synchronous=NORMAL
+- 스레드 간 공유 가능한 소형 연결 풀 (run_in_threadpool 워커가 연결을 빌려 씀)
+- 모든 쿼리는 파라미터 바인딩 (연결별 prepared statement 캐시 재사용)
+"""
+import json
+import os
+import queue
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from database import Repository
+from models import FAQItem, User, Feedback
+from utils.feedback_stats import bucket_key, bucket_range, WINDOWS
+
+
+SCHEMA_FILE = Path(__file__).parent / "database_migration" / "schema_sqlite.sql"
+
+
+class SQLiteConnectionPool:
+    """SQLite 연결 풀"""
+
+    def __init__(self, db_path: str, size: int = 4, timeout: float = 5.0):
+        """
+        Args:
+            db_path: DB 파일 경로
+            size: 연결 수
+            timeout: 연결 대기/잠금 대기 시간 (초)
+        """
+        self.db_path = db_path
+        self.timeout = timeout
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._connections: List[sqlite3.Connection] = []
+
+        for _ in range(size):
+            conn = self._connect()
+            self._connections.append(conn)
+            self._pool.put(conn)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            check_same_thread=False,  # 풀에서 한 번에 한 스레드만 사용
+            cached_statements=256
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """연결 대여 (반납 시 열린 트랜잭션은 롤백)"""
+        conn = self._pool.get(timeout=self.timeout)
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._pool.put(conn)
+
+    def close(self):
+        for conn in self._connections:
+            conn.close()
+        self._connections = []
+
+
+def _faq_from_row(row: sqlite3.Row) -> FAQItem:
+    return FAQItem(
+        id=row["id"],
+        category=row["category"],
+        question=row["question"],
+        main_answer=row["main_answer"],
+        keywords=json.loads(row["keywords"]),
+        department=row["department"] or "",
+        link=row["link"],
+        created_at=row["created_at"],
+        updated_at=row["updated_at"]
+    )
+
+
+def _user_from_row(row: sqlite3.Row) -> User:
+    return User(
+        employee_id=row["employee_id"],
+        name=row["name"],
+        department=row["department"] or "",
+        email=row["email"],
+        role=row["role"] or "user",
+        created_at=row["created_at"]
+    )
+
+
+def _detailed_from_row(row: sqlite3.Row) -> Dict:
+    """JSON 백엔드와 같은 형식 (seq = 행 id)"""
+    return {
+        "question_id": row["question_id"],
+        "user_question": row["user_question"],
+        "is_helpful": bool(row["is_helpful"]),
+        "reasons": json.loads(row["reasons"]),
+        "comment": row["comment"],
+        "user_id": row["user_id"],
+        "user_name": row["user_name"],
+        "matched_section": row["matched_section"],
+        "timestamp": row["created_at"],
+        "id": f"fb_{row['question_id']}",
+        "seq": row["id"]
+    }
+
+
+class SQLiteDatabase(Repository):
+    """SQLite 백엔드"""
+
+    def __init__(self, db_path: str, pool_size: int = 4, data_dir: str = "data"):
+        """
+        Args:
+            db_path: DB 파일 경로
+            pool_size: 연결 풀 크기
+            data_dir: 빈 DB에 FAQ/사용자를 채울 때 읽을 JSON 디렉토리
+        """
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.pool = SQLiteConnectionPool(db_path, size=pool_size)
+        self._init_schema()
+        self._seed_from_json(data_dir)
+
+    def _init_schema(self):
+        with self.pool.connection() as conn:
+            conn.executescript(SCHEMA_FILE.read_text(encoding="utf-8"))
+
+    def _seed_from_json(self, data_dir: str):
+        """빈 DB면 기존 FAQ/사용자 JSON을 채움 (피드백은 migrate_data.py로 이관)"""
+        if self.get_all_faqs() or self.get_all_users():
+            return
+
+        def load(name: str) -> dict:
+            try:
+                with open(os.path.join(data_dir, name), "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                return {}
+
+        faqs = [FAQItem(**faq) for faq in load("faq_data.json").get("faqs", [])]
+        users = [User(**user) for user in load("users.json").get("users", [])]
+        for faq in faqs:
+            self.add_faq(faq)
+        for user in users:
+            self.add_user(user)
+        if faqs or users:
+            print(f"✅ SQLite 초기 데이터 적재: FAQ {len(faqs)}개, 사용자 {len(users)}명")
+
+    def _write(self, work: Callable[[sqlite3.Connection], bool]) -> bool:
+        """쓰기 트랜잭션 (BEGIN IMMEDIATE로 쓰기 잠금을 먼저 확보)"""
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                changed = work(conn)
+                conn.commit()
+                return changed
+            except BaseException:
+                conn.rollback()
+                raise
+
+    # ==================== FAQ ====================
+
+    def get_all_faqs(self) -> List[FAQItem]:
+        """모든 FAQ 항목 조회"""
+        with self.pool.connection() as conn:
+            rows = conn.execute("SELECT * FROM faqs ORDER BY id").fetchall()
+        return [_faq_from_row(row) for row in rows]
+
+    def faq_version(self) -> int:
+        """FAQ 데이터 버전 (faqs 테이블 트리거가 증가시킴, 다른 프로세스의 수정 포함)"""
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT version FROM data_versions WHERE name = 'faqs'").fetchone()
+        return row["version"] if row else 0
+
+    def get_faq_by_id(self, faq_id: int) -> Optional[FAQItem]:
+        """ID로 FAQ 항목 조회"""
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT * FROM faqs WHERE id = ?", (faq_id,)).fetchone()
+        return _faq_from_row(row) if row else None
+
+    def get_faqs_by_category(self, category: str) -> List[FAQItem]:
+        """카테고리별 FAQ 조회"""
+        with self.pool.connection() as conn:
+            rows = conn.execute("SELECT * FROM faqs WHERE category = ? ORDER BY id", (category,)).fetchall()
+        return [_faq_from_row(row) for row in rows]
+
+    def get_all_categories(self) -> List[str]:
+        """모든 카테고리 목록 조회 (이름순, BINARY 정렬 = JSON 백엔드의 sorted()와 같은 순서)"""
+        with self.pool.connection() as conn:
+            rows = conn.execute("SELECT DISTINCT category FROM faqs ORDER BY category").fetchall()
+        return [row["category"] for row in rows]
+
+    @staticmethod
+    def _save_keywords(conn: sqlite3.Connection, faq: FAQItem):
+        conn.execute("DELETE FROM faq_keywords WHERE faq_id = ?", (faq.id,))
+        conn.executemany(
+            "INSERT INTO faq_keywords (faq_id, keyword) VALUES (?, ?)",
+            [(faq.id, keyword) for keyword in faq.keywords]
+        )
+
+    def add_faq(self, faq: FAQItem) -> bool:
+        """새로운 FAQ 추가"""
+        def work(conn: sqlite3.Connection) -> bool:
+            conn.execute(
+                "INSERT INTO faqs (id, category, question, main_answer, keywords, department, link, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (faq.id, faq.category, faq.question, faq.main_answer,
+                 json.dumps(faq.keywords, ensure_ascii=False), faq.department, faq.link,
+                 faq.created_at, faq.updated_at)
+            )
+            self._save_keywords(conn, faq)
+            return True
+
+        try:
+            added = self._write(work)
+        except Exception as e:
+            print(f"FAQ 추가 중 오류 발생: {e}")
+            return False
+        if added:
+            self._notify_faq_change("add", faq.id, faq)
+        return added
+
+    def update_faq(self, faq_id: int, updated_faq: FAQItem) -> bool:
+        """FAQ 업데이트"""
+        def work(conn: sqlite3.Connection) -> bool:
+            # id가 바뀔 수 있으므로 키워드는 먼저 지우고 다시 기록
+            conn.execute("DELETE FROM faq_keywords WHERE faq_id = ?", (faq_id,))
+            cursor = conn.execute(
+                "UPDATE faqs SET id = ?, category = ?, question = ?, main_answer = ?, keywords = ?, "
+                "department = ?, link = ?, updated_at = ? WHERE id = ?",
+                (updated_faq.id, updated_faq.category, updated_faq.question, updated_faq.main_answer,
+                 json.dumps(updated_faq.keywords, ensure_ascii=False), updated_faq.department,
+                 updated_faq.link, updated_faq.updated_at, faq_id)
+            )
+            if cursor.rowcount == 0:
+                return False
+            self._save_keywords(conn, updated_faq)
+            return True
+
+        try:
+            updated = self._write(work)
+        except Exception as e:
+            print(f"FAQ 업데이트 중 오류 발생: {e}")
+            return False
+        if updated:
+            self._notify_faq_change("update", faq_id, updated_faq)
+        return updated
+
+    # ==================== 사용자 ====================
+
+    def get_all_users(self) -> List[User]:
+        """모든 사용자 조회"""
+        with self.pool.connection() as conn:
+            rows = conn.execute("SELECT * FROM users ORDER BY id").fetchall()
+        return [_user_from_row(row) for row in rows]
+
+    def get_user_by_employee_id(self, employee_id: str) -> Optional[User]:
+        """사번으로 사용자 조회"""
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT * FROM users WHERE employee_id = ?", (employee_id,)).fetchone()
+        return _user_from_row(row) if row else None
+
+    def add_user(self, user: User) -> bool:
+        """새로운 사용자 추가 (이미 있으면 False)"""
+        def work(conn: sqlite3.Connection) -> bool:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO users (employee_id, name, department, email, role, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (user.employee_id, user.name, user.department, user.email, user.role, user.created_at)
+            )
+            return cursor.rowcount > 0
+
+        try:
+            return self._write(work)
+        except Exception as e:
+            print(f"사용자 추가 중 오류 발생: {e}")
+            return False
+
+    # ==================== 피드백 ====================
+
+    def get_all_feedbacks(self) -> List[Feedback]:
+        """모든 피드백 조회"""
+        with self.pool.connection() as conn:
+            rows = conn.execute("SELECT * FROM feedbacks ORDER BY id").fetchall()
+        return [
+            Feedback(
+                question_id=row["question_id"],
+                user_question=row["user_question"],
+                is_helpful=bool(row["is_helpful"]),
+                user_id=row["user_id"],
+                timestamp=row["created_at"],
+                comment=row["comment"]
+            )
+            for row in rows
+        ]
+
+    def add_feedback(self, feedback: Feedback) -> bool:
+        """피드백 추가"""
+        def work(conn: sqlite3.Connection) -> bool:
+            conn.execute(
+                "INSERT INTO feedbacks (user_id, question_id, user_question, is_helpful, comment, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (feedback.user_id, feedback.question_id, feedback.user_question,
+                 int(feedback.is_helpful), feedback.comment, feedback.timestamp)
+            )
+            return True
+
+        try:
+            return self._write(work)
+        except Exception as e:
+            print(f"피드백 추가 중 오류 발생: {e}")
+            return False
+
+    def add_detailed_feedback(self, feedback) -> bool:
+        """상세 피드백 추가 (싫어요 + 이유 + 의견)"""
+        def work(conn: sqlite3.Connection) -> bool:
+            cursor = conn.execute(
+                "INSERT INTO detailed_feedbacks (user_id, user_name, question_id, user_question, is_helpful, "
+                "reasons, comment, matched_section, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (feedback.user_id, feedback.user_name, feedback.question_id, feedback.user_question,
+                 int(feedback.is_helpful), json.dumps(feedback.reasons, ensure_ascii=False),
+                 feedback.comment, feedback.matched_section, feedback.timestamp)
+            )
+            conn.executemany(
+                "INSERT INTO detailed_feedback_reasons (feedback_id, reason, created_at) VALUES (?, ?, ?)",
+                [(cursor.lastrowid, reason, feedback.timestamp) for reason in feedback.reasons]
+            )
+            return True
+
+        try:
+            self._write(work)
+            print(f"✅ 상세 피드백 저장: 질문='{feedback.user_question}', 이유={feedback.reasons}")
+            return True
+        except Exception as e:
+            print(f"❌ 상세 피드백 추가 중 오류 발생: {e}")
+            return False
+
+    def get_feedback_stats(self, window: Optional[str] = None, bucket: Optional[str] = None) -> Dict:
+        """
+        피드백 통계 조회 (트리거로 유지되는 feedback_aggregates에서 조회)
+
+        Args:
+            window: None(전체), "daily", "weekly"
+            bucket: 버킷 키 (기본: 현재 일/주, 예: 2024-05-01, 2024-W18)
+        """
+        if window is not None and window not in WINDOWS:
+            raise ValueError(f"지원하지 않는 window: {window}")
+
+        if window is None:
+            day_buckets = ["all"]
+        else:
+            key = bucket or bucket_key(window, datetime.now())
+            try:
+                start, end = bucket_range(window, key)
+            except ValueError:
+                raise ValueError(f"잘못된 bucket: {key}")
+            day_buckets = [(start + timedelta(days=i)).strftime("%Y-%m-%d") for i in range((end - start).days)]
+
+        counts: Dict[str, Dict[str, int]] = {}
+        available = []
+        try:
+            with self.pool.connection() as conn:
+                placeholders = ",".join("?" * len(day_buckets))
+                rows = conn.execute(
+                    f"SELECT metric, key, SUM(count) FROM feedback_aggregates "
+                    f"WHERE bucket IN ({placeholders}) GROUP BY metric, key",
+                    day_buckets
+                ).fetchall()
+                if window is not None:
+                    available = [row[0] for row in conn.execute(
+                        "SELECT DISTINCT bucket FROM feedback_aggregates WHERE bucket != 'all' ORDER BY bucket"
+                    )]
+            for metric, name, count in rows:
+                counts.setdefault(metric, {})[name] = count
+        except Exception as e:
+            print(f"❌ 통계 조회 중 오류 발생: {e}")
+
+        total = counts.get("total", {}).get("", 0)
+        positive = counts.get("positive", {}).get("", 0)
+        sections = sorted(counts.get("section", {}).items(), key=lambda x: x[1], reverse=True)
+
+        stats = {
+            "total": total,
+            "positive": positive,
+            "negative": total - positive,
+            "positive_rate": round(positive / total * 100, 1) if total > 0 else 0,
+            "detailed_feedbacks_count": counts.get("detailed", {}).get("", 0),
+            "negative_reasons": counts.get("reason", {}),
+            "sections_needing_improvement": [{"section": name, "count": count} for name, count in sections[:10]]
+        }
+        if window is not None:
+            if window == "weekly":
+                available = sorted({bucket_key("weekly", datetime.strptime(day, "%Y-%m-%d")) for day in available})
+            stats["available_buckets"] = available
+            stats["window"] = window
+            stats["bucket"] = key
+        return stats
+
+    def _read_detailed_page(self, cursor: int, limit: int, extra_where: str = "") -> Dict:
+        """키셋 페이지네이션 (id >= cursor)"""
+        if limit <= 0:
+            # SQLite는 LIMIT 음수를 '제한 없음'으로 처리하므로 미리 차단
+            return {"feedbacks": [], "next_cursor": None}
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM detailed_feedbacks WHERE id >= ?{extra_where} ORDER BY id LIMIT ?",
+                (cursor, limit + 1)
+            ).fetchall()
+
+        next_cursor = rows[limit]["id"] if len(rows) > limit else None
+        return {"feedbacks": [_detailed_from_row(row) for row in rows[:limit]], "next_cursor": next_cursor}
+
+    def get_detailed_feedbacks(self, limit: int = 100, cursor: int = 0) -> Dict:
+        """상세 피드백 조회 (커서 페이지네이션)"""
+        try:
+            return self._read_detailed_page(cursor, limit)
+        except Exception as e:
+            print(f"❌ 상세 피드백 조회 중 오류 발생: {e}")
+            return {"feedbacks": [], "next_cursor": None}
+
+    def get_negative_feedbacks(self, limit: int = 100, cursor: int = 0) -> Dict:
+        """부정 피드백만 조회 (커서 페이지네이션)"""
+        try:
+            return self._read_detailed_page(cursor, limit, " AND is_helpful = 0")
+        except Exception as e:
+            print(f"❌ 부정 피드백 조회 중 오류 발생: {e}")
+            return {"feedbacks": [], "next_cursor": None}
+
+    def close(self):
+        """연결 풀 종료"""
+        self.pool.close()
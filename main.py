@@ -5,13 +5,17 @@ Encar Copilot (Endy) - FastAPI 메인 애플리케이션
 from fastapi import FastAPI, HTTPException, Header, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, StreamingResponse, JSONResponse
+from fastapi.responses import HTMLResponse, StreamingResponse, JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
+from fastapi.concurrency import run_in_threadpool
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from typing import Optional
 from pathlib import Path
+import asyncio
+import re
 import time
+import uuid
 
 from models import QuestionRequest, AnswerResponse, Feedback, DetailedFeedback, LoginRequest, LoginResponse
 from database import db
@@ -19,14 +23,19 @@ from search_engine import search_engine
 from auth import auth_manager
 from config.settings import settings
 from services import AnswerService
+from services.answer_service import QUESTION_CATEGORIES
+from services.suggest_service import suggest_service, MAX_SUGGESTIONS
 from utils.exceptions import EncarCopilotException, RateLimitError, AuthorizationError
 from utils.logger import get_logger, log_error, log_api_request
 from utils.rate_limiter import get_rate_limiter
+from utils.spell import spell_corrector
 from utils.metrics import (
-    get_metrics, track_api_request, track_llm_request,
-    track_cache_operation, track_feedback, track_error
+    get_metrics, track_llm_request,
+    track_cache_operation, track_feedback, track_error, StreamTracker
 )
 from utils.auth import UserRole, check_permission
+from utils.middleware import SecurityHeadersMiddleware, TimingMiddleware, build_csp
+from utils import sse
 
 # 로거 초기화
 logger = get_logger()
@@ -65,28 +74,15 @@ app.add_middleware(
 )
 
 
-# 보안 헤더 미들웨어
-@app.middleware("http")
-async def add_security_headers(request: Request, call_next):
-    """보안 헤더 추가"""
-    response = await call_next(request)
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-    
-    # CSP (Content Security Policy)
-    if settings.ENVIRONMENT == "production":
-        response.headers["Content-Security-Policy"] = (
-            "default-src 'self'; "
-            "script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
-            "style-src 'self' 'unsafe-inline'; "
-            "img-src 'self' data: https:; "
-            "font-src 'self' data:; "
-            "connect-src 'self';"
-        )
-    
-    return response
+# 보안 헤더 미들웨어 (순수 ASGI: 스트리밍 응답을 버퍼링하지 않음)
+app.add_middleware(
+    SecurityHeadersMiddleware,
+    content_security_policy=build_csp() if settings.ENVIRONMENT == "production" else None
+)
+
+# 응답 시간 미들웨어 (가장 바깥: 라우트 템플릿별 지연 시간 + Server-Timing 헤더)
+if settings.ENABLE_METRICS:
+    app.add_middleware(TimingMiddleware)
 
 
 # 전역 예외 처리
@@ -177,6 +173,34 @@ def get_current_user(authorization: Optional[str] = Header(None)):
     return auth_manager.get_current_user(token)
 
 
+_ENTITY_TAG = re.compile(r'\s*(?:W/)?("[^"]*")\s*(?:,|$)')
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match 헤더에 ETag가 있는지 (RFC 9110 약한 비교: W/ 접두사 무시, *는 항상 일치)
+    
+    형식이 잘못된 헤더는 일치하지 않는 것으로 처리합니다.
+    """
+    if_none_match = (if_none_match or "").strip()
+    if not if_none_match:
+        return False
+    if if_none_match == "*":
+        return True
+    
+    tags = []
+    pos = 0
+    while pos < len(if_none_match):
+        match = _ENTITY_TAG.match(if_none_match, pos)
+        if not match:
+            return False
+        tags.append(match.group(1))
+        pos = match.end()
+    
+    etag = etag[2:] if etag.startswith("W/") else etag
+    return etag in tags
+
+
 # ==================== 라우트 ====================
 
 @app.get("/", response_class=HTMLResponse)
@@ -309,7 +333,7 @@ async def metrics():
 @app.post("/api/login", response_model=LoginResponse)
 async def login(login_request: LoginRequest):
     """로그인"""
-    return auth_manager.login(login_request)
+    return await run_in_threadpool(auth_manager.login, login_request)
 
 
 @app.post("/api/logout")
@@ -319,7 +343,8 @@ async def logout(authorization: Optional[str] = Header(None)):
         raise HTTPException(status_code=401, detail="인증 토큰이 없습니다")
     
     token = authorization.replace("Bearer ", "") if authorization.startswith("Bearer ") else authorization
-    success = auth_manager.logout(token)
+    # 서명 토큰 로그아웃은 파일 잠금 + 폐기 목록 저장 → 이벤트 루프 밖에서 실행
+    success = await run_in_threadpool(auth_manager.logout, token)
     
     return {
         "success": success, 
@@ -343,33 +368,52 @@ async def get_me(authorization: Optional[str] = Header(None)):
 @app.get("/api/category/{category}/questions")
 async def get_category_questions(
     category: str,
+    request: Request,
     limit: int = 10,
     authorization: Optional[str] = Header(None)
 ):
     """
     카테고리별 대표 질문 조회
     - 카테고리: HR, IT, 총무, 복리후생, 비즈니스, 기업 소개
+    - 시작 시(및 reload 시) 미리 직렬화한 응답을 그대로 반환, ETag 일치 시 304
     """
     # 인증 확인 (선택사항)
     user = get_current_user(authorization)
     
     # 카테고리 검증
-    valid_categories = ['HR', 'IT', '총무', '복리후생', '비즈니스', '기업 소개']
-    if category not in valid_categories:
-        raise HTTPException(status_code=400, detail=f"유효하지 않은 카테고리입니다. 가능한 카테고리: {', '.join(valid_categories)}")
+    if category not in QUESTION_CATEGORIES:
+        raise HTTPException(status_code=400, detail=f"유효하지 않은 카테고리입니다. 가능한 카테고리: {', '.join(QUESTION_CATEGORIES)}")
     
     # 대표 질문 조회
     try:
-        questions = answer_service.get_category_questions(category, limit)
-        return {
-            "success": True,
-            "category": category,
-            "questions": questions,
-            "count": len(questions)
-        }
+        body, etag = answer_service.get_category_questions_payload(category, limit)
     except Exception as e:
         print(f"⚠️  카테고리 질문 조회 오류: {e}")
         raise HTTPException(status_code=500, detail="카테고리 질문을 불러오는데 실패했습니다")
+    
+    # 브라우저 캐시: 매번 ETag로 재검증 (reload 후에는 바로 새 목록)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.get("/api/suggest")
+async def suggest_questions(
+    q: str = "",
+    limit: int = 5,
+    category: Optional[str] = None
+):
+    """
+    입력 중인 질문 자동완성
+    - FAQ 질문 → 섹션 대표 질문 → 섹션 제목 순
+    - 초성 검색 지원 (예: "ㅎㄱ" → "휴가 ...")
+    """
+    if len(q) > 100:
+        raise HTTPException(status_code=400, detail="질의가 너무 깁니다 (최대 100자)")
+    
+    limit = max(1, min(limit, MAX_SUGGESTIONS))
+    return {"query": q, "suggestions": suggest_service.suggest(q, limit, category)}
 
 
 @app.post("/api/ask", response_model=AnswerResponse)
@@ -386,7 +430,7 @@ async def ask_question(
     
     # 인증 확인 (선택사항)
     user = get_current_user(authorization)
-    user_id = user.get("employee_id") if user else "anonymous"
+    user_id = user.employee_id if user else "anonymous"
     
     # 레이트리밋 체크
     allowed, message = rate_limiter.is_allowed(
@@ -410,11 +454,11 @@ async def ask_question(
     
     # 답변 서비스로 처리
     try:
-        result = answer_service.process_question(question_request.question.strip())
+        # 동기 LLM/검색 호출은 스레드풀에서 실행 (이벤트 루프 블로킹 방지, 스팬 컨텍스트는 복사됨)
+        result = await run_in_threadpool(answer_service.process_question, question_request.question.strip())
         
-        # 메트릭 수집
+        # 메트릭 수집 (요청 수/응답 시간은 TimingMiddleware가 기록)
         duration_ms = (time.time() - start_time) * 1000
-        track_api_request("POST", "/api/ask", 200)
         
         # LLM 캐시 여부 추적
         if hasattr(result, 'source') and result.source == 'cache':
@@ -431,7 +475,6 @@ async def ask_question(
         return result
     except Exception as e:
         track_error("processing_error")
-        track_api_request("POST", "/api/ask", 500)
         log_error(f"답변 처리 오류: {e}", error=e, context={"user_id": user_id})
         raise HTTPException(status_code=500, detail="답변 처리 중 오류가 발생했습니다")
 
@@ -439,30 +482,105 @@ async def ask_question(
 @app.post("/api/ask/stream")
 async def ask_question_stream(
     question_request: QuestionRequest,
+    request: Request,
     authorization: Optional[str] = Header(None)
 ):
     """
     질문에 대한 답변 제공 (스트리밍 응답)
     - 답변을 실시간으로 스트리밍
     - 체감 속도 2배 향상
+    
+    SSE 이벤트:
+    - retrieval: {"category", "category_id", "section", "contact", "related_questions"} (라우팅 직후)
+    - token: {"text"} (답변 청크)
+    - done: {"trace_id", "duration_ms", "ttfb_ms", "ttft_ms", "max_gap_ms", "tokens", "chars"}
+    - error: {"message", "trace_id"}
     """
     # 인증 확인 (선택사항)
     user = get_current_user(authorization)
+    user_id = user.employee_id if user else "anonymous"
+    
+    # 레이트리밋 체크
+    allowed, message = rate_limiter.is_allowed(
+        user_id,
+        max_per_minute=settings.RATE_LIMIT_PER_MINUTE,
+        max_per_hour=settings.RATE_LIMIT_PER_HOUR
+    )
+    if not allowed:
+        track_error("rate_limit")
+        raise RateLimitError(message)
     
     # 질문 검증
     if not question_request.question.strip():
+        track_error("validation_error")
         raise HTTPException(status_code=400, detail="질문을 입력해주세요")
     
+    if len(question_request.question) > 500:
+        track_error("validation_error")
+        raise HTTPException(status_code=400, detail="질문이 너무 깁니다 (최대 500자)")
+    
+    trace_id = uuid.uuid4().hex[:16]
+    tracker = StreamTracker(trace_id)
+    
     # 스트리밍 응답 생성
     async def generate_stream():
+        """
+        답변 이벤트 → SSE (event: retrieval → token... → done | error)
+        - 생성은 별도 태스크에서 진행, 이벤트가 없으면 주기적으로 하트비트 전송
+        - 클라이언트 연결이 끊기면 생성 태스크를 취소 → OpenAI 스트림도 중단
+        """
+        status = "disconnected"  # 클라이언트가 끊으면 GeneratorExit/CancelledError로 종료됨
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        async def produce():
+            try:
+                async for item in answer_service.process_question_stream(question_request.question.strip()):
+                    await queue.put(item)
+                await queue.put(None)
+            except Exception as e:
+                await queue.put(e)
+        
+        producer = asyncio.create_task(produce())
         try:
-            # LLM 서비스를 통한 스트리밍
-            result = answer_service.process_question_stream(question_request.question.strip())
-            for chunk in result:
-                yield chunk
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=settings.SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield sse.heartbeat()
+                    continue
+                
+                if isinstance(item, Exception):
+                    raise item
+                if await request.is_disconnected():
+                    break
+                if item is None:
+                    status = "completed"
+                    yield sse.format_event(tracker.summary(), event="done")
+                    break
+                
+                event, data = item
+                tracker.on_bytes()
+                if event == "token":
+                    tracker.on_token(data)
+                    data = {"text": data}
+                yield sse.format_event(data, event=event)
         except Exception as e:
+            status = "error"
+            track_error("stream_error")
             print(f"❌ 스트리밍 처리 오류: {e}")
-            yield f"data: {{'error': '답변 처리 중 오류가 발생했습니다'}}\n\n"
+            yield sse.format_event(
+                {"message": "답변 처리 중 오류가 발생했습니다", "trace_id": trace_id},
+                event="error"
+            )
+        finally:
+            producer.cancel()
+            summary = tracker.finish(status)
+            logger.info(
+                f"스트리밍 종료: {question_request.question[:50]}... {summary}",
+                extra={"user_id": user_id, "trace_id": trace_id, "duration_ms": summary["duration_ms"]}
+            )
     
     return StreamingResponse(
         generate_stream(),
@@ -470,6 +588,8 @@ async def ask_question_stream(
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",  # 리버스 프록시(nginx) 버퍼링 비활성화
+            "X-Trace-Id": trace_id,
         }
     )
 
@@ -484,21 +604,34 @@ async def submit_feedback(
     """피드백 제출"""
     user = get_current_user(authorization)
     
-    if db.add_feedback(feedback):
+    # 파일 I/O는 이벤트 루프 밖(스레드풀)에서 수행
+    if await run_in_threadpool(db.add_feedback, feedback):
         return {"success": True, "message": "피드백이 저장되었습니다"}
     else:
         raise HTTPException(status_code=500, detail="피드백 저장 중 오류가 발생했습니다")
 
 
 @app.get("/api/feedback/stats")
-async def get_feedback_stats(authorization: Optional[str] = Header(None)):
-    """피드백 통계 조회 (관리자용)"""
+async def get_feedback_stats(
+    window: Optional[str] = None,
+    bucket: Optional[str] = None,
+    authorization: Optional[str] = Header(None)
+):
+    """
+    피드백 통계 조회 (관리자용)
+    
+    - window: 미지정(전체), daily, weekly
+    - bucket: 조회할 버킷 (예: 2024-05-01, 2024-W18, 기본: 현재)
+    """
     user = get_current_user(authorization)
     
     if not user:
         raise HTTPException(status_code=401, detail="인증이 필요합니다")
     
-    return db.get_feedback_stats()
+    try:
+        return await run_in_threadpool(db.get_feedback_stats, window, bucket)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.post("/api/feedback/detailed")
@@ -511,10 +644,10 @@ async def submit_detailed_feedback(
     
     # 사용자 정보 추가
     if user:
-        feedback.user_id = user.get("employee_id")
-        feedback.user_name = user.get("name")
+        feedback.user_id = user.employee_id
+        feedback.user_name = user.name
     
-    if db.add_detailed_feedback(feedback):
+    if await run_in_threadpool(db.add_detailed_feedback, feedback):
         return {"success": True, "message": "상세 피드백이 저장되었습니다"}
     else:
         raise HTTPException(status_code=500, detail="상세 피드백 저장 중 오류가 발생했습니다")
@@ -523,9 +656,10 @@ async def submit_detailed_feedback(
 @app.get("/api/feedback/detailed")
 async def get_detailed_feedbacks(
     limit: int = 100,
+    cursor: int = 0,
     authorization: Optional[str] = Header(None)
 ):
-    """상세 피드백 조회 (관리자 전용)"""
+    """상세 피드백 조회 (관리자 전용, next_cursor로 다음 페이지 조회)"""
     user = get_current_user(authorization)
     
     if not user:
@@ -535,12 +669,16 @@ async def get_detailed_feedbacks(
     if not check_permission(user, UserRole.ADMIN):
         raise AuthorizationError("관리자만 접근 가능합니다")
     
-    return {"feedbacks": db.get_detailed_feedbacks(limit)}
+    return await run_in_threadpool(db.get_detailed_feedbacks, limit, cursor)
 
 
 @app.get("/api/feedback/negative")
-async def get_negative_feedbacks(authorization: Optional[str] = Header(None)):
-    """부정적 피드백 조회 (관리자 전용)"""
+async def get_negative_feedbacks(
+    limit: int = 100,
+    cursor: int = 0,
+    authorization: Optional[str] = Header(None)
+):
+    """부정적 피드백 조회 (관리자 전용, next_cursor로 다음 페이지 조회)"""
     user = get_current_user(authorization)
     
     if not user:
@@ -550,7 +688,7 @@ async def get_negative_feedbacks(authorization: Optional[str] = Header(None)):
     if not check_permission(user, UserRole.ADMIN):
         raise AuthorizationError("관리자만 접근 가능합니다")
     
-    return {"feedbacks": db.get_negative_feedbacks()}
+    return await run_in_threadpool(db.get_negative_feedbacks, limit, cursor)
 
 
 # ==================== FAQ 관리 API ====================
@@ -559,9 +697,9 @@ async def get_negative_feedbacks(authorization: Optional[str] = Header(None)):
 async def get_faqs(category: Optional[str] = None):
     """FAQ 목록 조회"""
     if category and category != 'all':
-        faqs = db.get_faqs_by_category(category)
+        faqs = await run_in_threadpool(db.get_faqs_by_category, category)
     else:
-        faqs = db.get_all_faqs()
+        faqs = await run_in_threadpool(db.get_all_faqs)
     
     return {"faqs": [faq.dict() for faq in faqs]}
 
@@ -569,12 +707,46 @@ async def get_faqs(category: Optional[str] = None):
 @app.get("/api/categories")
 async def get_categories():
     """카테고리 목록 조회"""
-    categories = db.get_all_categories()
+    categories = await run_in_threadpool(db.get_all_categories)
     return {"categories": categories}
 
 
+@app.post("/api/admin/reload")
+async def reload_indexes(authorization: Optional[str] = Header(None)):
+    """
+    메타데이터/시맨틱 인덱스 다시 읽기 (관리자 전용)
+    - 대표 질문, 유사 질문, 자동완성, 오타 교정 사전을 다시 계산
+    """
+    user = get_current_user(authorization)
+    
+    if not user:
+        raise HTTPException(status_code=401, detail="인증이 필요합니다")
+    
+    if not check_permission(user, UserRole.ADMIN):
+        raise AuthorizationError("관리자만 접근 가능합니다")
+    
+    def rebuild():
+        answer_service.reload()
+        faqs = db.get_all_faqs()
+        _build_spell_dictionary(faqs)
+        suggest_service.rebuild(faqs, answer_service.get_section_questions())
+    
+    # 인덱스 로드/사전 구축은 CPU 작업 → 스레드풀에서 실행 (이벤트 루프 블로킹 방지)
+    await run_in_threadpool(rebuild)
+    return {"success": True, "suggestions": suggest_service.size, "spell_words": spell_corrector.size}
+
+
 # ==================== 서버 이벤트 ====================
 
+def _build_spell_dictionary(faqs):
+    """오타 교정 사전 구축 (메타데이터 키워드 + FAQ 키워드)"""
+    llm = answer_service.llm if answer_service else None
+    categories = llm.metadata.get("categories", {}) if llm else {}
+    vocabulary = [keyword for info in categories.values() for keyword in info.get("keywords", [])]
+    vocabulary += [keyword for faq in faqs for keyword in faq.keywords]
+    spell_corrector.build(vocabulary)
+
+
 @app.on_event("startup")
 async def startup_event():
     """서버 시작 시 실행"""
@@ -644,14 +816,30 @@ async def startup_event():
         llm_service=llm_service_instance  # LLM 서비스 추가
     )
     print("✅ 답변 서비스 초기화 완료!")
+    
+    # 키워드 검색 색인 구축 (이 프로세스의 FAQ 추가/수정은 증분 반영, 다른 프로세스의 수정은 데이터 버전으로 감지)
+    search_engine.attach(db)
+    faqs = db.get_all_faqs()
+    print(f"✅ 키워드 검색 색인 구축 완료 ({search_engine.index.size}개 FAQ)")
+    
+    # 오타 교정 사전 (메타데이터 키워드 + FAQ 키워드, FAQ 추가/수정 시 키워드 추가)
+    _build_spell_dictionary(faqs)
+    db.add_faq_listener(lambda action, faq_id, faq: spell_corrector.add_words(faq.keywords))
+    
+    # 자동완성 인덱스 구축 (FAQ 추가/수정 시 새 인덱스로 다시 구축해 교체, FAQ 수가 적어 전체 재구축으로 충분)
+    suggest_service.rebuild(faqs, answer_service.get_section_questions())
+    db.add_faq_listener(
+        lambda action, faq_id, faq: suggest_service.rebuild(db.get_all_faqs(), answer_service.get_section_questions())
+    )
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """서버 종료 시 실행"""
     print("👋 Encar Copilot (Endy) 서버 종료")
-    cleaned = auth_manager.cleanup_expired_sessions()
+    cleaned = auth_manager.shutdown()
     print(f"🧹 {cleaned}개의 만료된 세션 정리 완료")
+    db.close()
 
 
 # ==================== 메인 실행 ====================
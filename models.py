@@ -2,13 +2,15 @@
 데이터 모델 정의
 Encar Copilot의 모든 데이터 구조를 정의합니다.
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List
 from datetime import datetime
 
 
 class FAQItem(BaseModel):
-    """FAQ 항목 모델"""
+    """FAQ 항목 모델 (캐시에서 공유되므로 불변)"""
+    model_config = ConfigDict(frozen=True)
+    
     id: int
     category: str = Field(..., description="카테고리 (HR, IT, 총무, 경영지원 등)")
     question: str = Field(..., description="질문")
@@ -61,11 +63,14 @@ class DetailedFeedback(BaseModel):
 
 
 class User(BaseModel):
-    """사용자 모델 (MVP용 간단한 버전)"""
+    """사용자 모델 (MVP용 간단한 버전, 캐시에서 공유되므로 불변)"""
+    model_config = ConfigDict(frozen=True)
+    
     employee_id: str = Field(..., description="사번")
     name: str = Field(..., description="이름")
     department: str = Field(..., description="소속 부서")
     email: Optional[str] = Field(None, description="이메일")
+    role: str = Field("user", description="역할 (admin, user)")
     created_at: str = Field(default_factory=lambda: datetime.now().isoformat())
 
 
@@ -1,109 +1,110 @@
 """
 질문 매칭 엔진
-키워드 기반 검색 및 유사도 계산
+문자 n-gram BM25 색인 기반 FAQ 검색 (질문/키워드/답변)
 """
-import re
+import threading
 from typing import List, Tuple, Dict, Optional
 from models import FAQItem
-from difflib import SequenceMatcher
+from utils.metrics import track_spell_fallback_avoided
+from utils.ngram_index import NgramIndex
+from utils.spell import spell_corrector
+
+
+# 필드 가중치: 질문 > 키워드 > 답변
+FAQ_FIELD_WEIGHTS = {"question": 2.0, "keywords": 1.5, "answer": 0.5}
 
 
 class SearchEngine:
     """질문 매칭 엔진 클래스"""
     
     def __init__(self):
-        pass
+        self.index = NgramIndex(FAQ_FIELD_WEIGHTS)
+        self._faqs_by_id: Dict[int, FAQItem] = {}
+        self._lock = threading.Lock()
+        self._repository = None  # attach()로 연결된 저장소 (데이터 버전 확인용)
+        self._version = None     # 색인에 반영된 FAQ 데이터 버전
     
-    def extract_keywords(self, text: str) -> List[str]:
-        """
-        텍스트에서 키워드 추출
-        간단한 토큰화 방식 사용 (MVP)
-        """
-        # 특수문자 제거 및 공백 기준 분리
-        text = re.sub(r'[^\w\s]', ' ', text)
-        words = text.split()
-        
-        # 한 글자 단어 제외
-        keywords = [w for w in words if len(w) > 1]
-        
-        return keywords
+    @staticmethod
+    def _faq_fields(faq: FAQItem) -> Dict[str, str]:
+        """FAQ → 색인 필드"""
+        return {
+            "question": faq.question,
+            "keywords": " ".join(faq.keywords),
+            "answer": faq.main_answer,
+        }
     
-    def calculate_keyword_score(self, question: str, faq: FAQItem) -> float:
-        """
-        질문과 FAQ 간의 키워드 매칭 점수 계산
-        """
-        question_lower = question.lower()
-        
-        # FAQ의 키워드, 질문, 답변에서 검색
-        faq_keywords = set([k.lower() for k in faq.keywords])
-        faq_question_lower = faq.question.lower()
-        faq_answer_lower = faq.main_answer.lower()
-        
-        # 부분 문자열 매칭 (단어 검색 개선)
-        if question_lower in faq_question_lower or question_lower in faq_answer_lower:
-            return 1.0  # 정확히 포함되면 높은 점수
-        
-        # 키워드에 포함되어 있는지 확인
-        for keyword in faq_keywords:
-            if question_lower in keyword or keyword in question_lower:
-                return 0.8  # 키워드에 포함되면 높은 점수
-        
-        # 기존 방식 (Jaccard)
-        question_keywords = set(self.extract_keywords(question_lower))
-        faq_question_keywords = set(self.extract_keywords(faq_question_lower))
-        
-        all_faq_keywords = faq_keywords.union(faq_question_keywords)
-        
-        if not question_keywords or not all_faq_keywords:
-            return 0.0
-        
-        # 교집합 개수 / 합집합 개수 (Jaccard 유사도)
-        intersection = len(question_keywords.intersection(all_faq_keywords))
-        union = len(question_keywords.union(all_faq_keywords))
-        
-        return intersection / union if union > 0 else 0.0
+    def build_index(self, faqs: List[FAQItem], version: Optional[int] = None):
+        """FAQ 전체 색인 구축 (version: 이 FAQ 목록의 데이터 버전)"""
+        with self._lock:
+            self._faqs_by_id = {faq.id: faq for faq in faqs}
+            self.index.build({faq.id: self._faq_fields(faq) for faq in faqs})
+            self._version = version
     
-    def calculate_text_similarity(self, text1: str, text2: str) -> float:
+    def attach(self, repository):
         """
-        두 텍스트 간의 유사도 계산 (시퀀스 매칭)
+        저장소 연결: 전체 색인 구축 + 변경 리스너 등록
+        
+        이후 검색마다 repository.faq_version()을 확인해, 다른 프로세스가 FAQ를 수정했으면 다시 색인합니다.
         """
-        return SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
+        self._repository = repository
+        version = repository.faq_version()  # 목록보다 먼저 읽어야 사이에 생긴 변경을 놓치지 않음
+        self.build_index(repository.get_all_faqs(), version)
+        repository.add_faq_listener(self.on_faq_change)
     
-    def calculate_total_score(self, question: str, faq: FAQItem) -> float:
-        """
-        종합 점수 계산 (키워드 점수 + 텍스트 유사도)
+    def _sync(self):
+        """저장소 데이터 버전이 색인과 다르면 다시 색인"""
+        if self._repository is None:
+            return
+        version = self._repository.faq_version()
+        if version != self._version:
+            self.build_index(self._repository.get_all_faqs(), version)
+    
+    def on_faq_change(self, action: str, faq_id: int, faq: Optional[FAQItem]):
         """
-        keyword_score = self.calculate_keyword_score(question, faq)
-        text_similarity = self.calculate_text_similarity(question, faq.question)
-        
-        # 가중치: 키워드 70%, 텍스트 유사도 30%
-        total_score = (keyword_score * 0.7) + (text_similarity * 0.3)
+        FAQ 변경 리스너 (db.add_faq_listener로 등록) - 바뀐 FAQ만 증분 색인
         
-        return total_score
+        Args:
+            action: "add" 또는 "update"
+            faq_id: 대상 FAQ ID (update는 변경 전 ID)
+            faq: 새 FAQ 내용
+        """
+        with self._lock:
+            if action == "update" and faq_id != faq.id:
+                self.index.remove(faq_id)
+                self._faqs_by_id.pop(faq_id, None)
+            self.index.upsert(faq.id, self._faq_fields(faq))
+            self._faqs_by_id[faq.id] = faq
+        
+        # 이 프로세스의 변경은 증분 반영했으므로 현재 버전으로 기록 (검색 시 전체 재색인 방지)
+        if self._repository is not None:
+            self._version = self._repository.faq_version()
     
-    def search(self, question: str, faqs: List[FAQItem], top_k: int = 5) -> List[Tuple[FAQItem, float]]:
+    def search(self, question: str, faqs: Optional[List[FAQItem]] = None, top_k: int = 5) -> List[Tuple[FAQItem, float]]:
         """
         질문에 대한 최적의 FAQ 검색
         
+        색인은 저장소 데이터 버전으로 갱신합니다 (attach() 이후). faqs는 색인을 바꾸지 않습니다.
+        
         Args:
             question: 사용자 질문
-            faqs: FAQ 리스트
+            faqs: 검색 대상 FAQ 리스트 (색인과 개수가 다르면 이 FAQ들로 결과를 거름, None이면 전체)
             top_k: 상위 k개 결과 반환
             
         Returns:
-            (FAQ, 점수) 튜플 리스트
+            (FAQ, 점수) 튜플 리스트 (점수 0~1, 내림차순)
         """
-        results = []
-        
-        for faq in faqs:
-            score = self.calculate_total_score(question, faq)
-            results.append((faq, score))
-        
-        # 점수 기준 내림차순 정렬
-        results.sort(key=lambda x: x[1], reverse=True)
-        
-        # 상위 k개 반환
-        return results[:top_k]
+        self._sync()
+        if self._repository is None and not self.index.size and faqs:
+            self.build_index(faqs)  # 저장소 없이 쓰는 경우 (벤치마크 등) 첫 검색 때 구축
+        
+        with self._lock:
+            allowed = None
+            if faqs is not None and len(faqs) != self.index.size:
+                allowed = {faq.id for faq in faqs}
+            results = self.index.search(question, top_k if allowed is None else self.index.size)
+            if allowed is not None:
+                results = [(faq_id, score) for faq_id, score in results if faq_id in allowed][:top_k]
+            return [(self._faqs_by_id[faq_id], score) for faq_id, score in results]
     
     def get_best_match(self, question: str, faqs: List[FAQItem], threshold: float = 0.3) -> Optional[Tuple[FAQItem, float]]:
         """
@@ -122,6 +123,14 @@ class SearchEngine:
         if results and results[0][1] >= threshold:
             return results[0]
         
+        # 매칭 실패 시 오타 교정 후 한 번 더
+        corrected = spell_corrector.correct_text(question)
+        if corrected != question:
+            results = self.search(corrected, faqs, top_k=1)
+            if results and results[0][1] >= threshold:
+                track_spell_fallback_avoided("faq_keyword")
+                return results[0]
+        
         return None
     
     def get_related_questions(self, current_faq: FAQItem, all_faqs: List[FAQItem], max_count: int = 5) -> List[Dict]:
@@ -9,23 +9,49 @@ import os
 import json
 import pickle
 import re
-from typing import List, Dict, Tuple
+import contextvars
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 from sentence_transformers import SentenceTransformer
 import faiss
 import numpy as np
 
+from config.settings import settings
+from utils.metrics import stage
+from utils.ngram_index import NgramIndex
+
+
+# 어휘 색인 필드 가중치 (제목/질문 > 키워드 > 본문)
+LEXICAL_FIELD_WEIGHTS = {"title": 2.0, "question": 2.0, "keywords": 1.0, "content": 0.5}
+
 
 class SemanticSearchEngineRAG:
-    def __init__(self, model_name='jhgan/ko-sroberta-multitask'):
+    def __init__(self, model_name='jhgan/ko-sroberta-multitask', model=None, lexical_pool=None):
         """
         RAG 기반 한국어 시맨틱 검색 엔진 초기화
+        
+        Args:
+            model_name: 임베딩 모델 이름
+            model: 이미 로드된 모델 (reloaded()에서 공유, 있으면 다시 로드하지 않음)
+            lexical_pool: 어휘 검색 스레드 풀 (reloaded()에서 공유)
         """
-        print("🔄 시맨틱 검색 모델 로딩 중 (RAG 버전)...")
-        self.model = SentenceTransformer(model_name)
+        if model is None:
+            print("🔄 시맨틱 검색 모델 로딩 중 (RAG 버전)...")
+            model = SentenceTransformer(model_name)
+        self.model = model
         self.index = None
         self.documents = []
         self.metadata = []
-        print("✅ 모델 로딩 완료!")
+        # 같은 청크에 대한 문자 n-gram 어휘 색인 (VDI, IP, 시스템명 등 정확한 토큰 매칭 보완)
+        self.lexical = NgramIndex(LEXICAL_FIELD_WEIGHTS)
+        self._lexical_pool = lexical_pool or ThreadPoolExecutor(max_workers=2, thread_name_prefix="lexical-search")
+        # H2 파티션 (coarse-to-fine 검색): (H2 이름 목록, 중심 벡터, 파티션 경계, 파티션 순서 청크 번호, 파티션 순서 벡터)
+        self.partitions = None
+        # H2별 drill-down 트리: {H2: [{"h3": 섹션명, "children": [하위 제목, ...]}, ...]} (문서 순서)
+        self.drilldown: Dict[str, List[Dict]] = {}
+        if lexical_pool is None:
+            print("✅ 모델 로딩 완료!")
     
     def load_markdown_file(self, file_path: str) -> List[Dict]:
         """
@@ -274,8 +300,13 @@ class SemanticSearchEngineRAG:
         print(f"🎉 총 {len(all_chunks)}개 청크 로딩 완료 (RAG)!")
         return all_chunks
     
+    @staticmethod
+    def _hierarchy(doc: Dict) -> str:
+        """계층 경로 (H2 > H3 > H4 > H5)"""
+        return " > ".join(doc[level] for level in ('h2', 'h3', 'h4', 'h5') if doc.get(level))
+    
     def build_index(self, documents: List[Dict]):
-        """FAISS 인덱스 구축"""
+        """FAISS 인덱스 + 어휘 색인 구축"""
         print("🔨 벡터 인덱스 구축 중 (RAG)...")
         
         self.documents = documents
@@ -285,11 +316,7 @@ class SemanticSearchEngineRAG:
         texts = []
         for doc in documents:
             # 계층 정보를 포함하여 검색 정확도 향상
-            hierarchy = f"{doc['h2']} > {doc['h3']}"
-            if doc['h4']:
-                hierarchy += f" > {doc['h4']}"
-            if doc['h5']:
-                hierarchy += f" > {doc['h5']}"
+            hierarchy = self._hierarchy(doc)
             
             # FAQ 형식인 경우 질문 우선
             if doc['chunk_type'] == 'qa' and doc['question']:
@@ -311,27 +338,201 @@ class SemanticSearchEngineRAG:
         faiss.normalize_L2(embeddings)
         self.index.add(embeddings.astype('float32'))
         
+        self._build_lexical_index()
+        self._build_partitions()
+        self.drilldown = self._build_drilldown_trees(documents)
         print(f"✅ 인덱스 구축 완료! (총 {len(documents)}개 문서)")
     
-    def search(self, query: str, top_k: int = 5) -> List[Tuple[Dict, float]]:
-        """자연어 질문으로 검색"""
+    def _build_lexical_index(self):
+        """청크 메타데이터로 어휘 색인 구축 (슬롯 = FAISS 벡터 번호)"""
+        docs = {}
+        for idx, doc in enumerate(self.metadata):
+            keywords = doc.get('keywords', '')
+            docs[idx] = {
+                "title": f"{self._hierarchy(doc)} {doc.get('title', '')}",
+                "question": doc.get('question', ''),
+                "keywords": " ".join(keywords) if isinstance(keywords, list) else str(keywords),
+                "content": doc.get('content', ''),
+            }
+        self.lexical.build(docs)
+    
+    @staticmethod
+    def _build_drilldown_trees(documents: List[Dict]) -> Dict[str, List[Dict]]:
+        """
+        H2별 drill-down 트리 (H3 → H4/H5 제목) 구축
+        
+        애매한 질문의 마인드맵 답변에 사용 (검색 상위 결과가 아닌 문서 구조 기준)
+        """
+        trees: Dict[str, Dict[str, List[str]]] = {}
+        for doc in documents:
+            h2 = doc.get('h2') or doc.get('category') or '기타'
+            h3 = doc.get('h3') or doc.get('section') or '기타'
+            children = trees.setdefault(h2, {}).setdefault(h3, [])
+            title = doc.get('title', '')
+            if title and title != h3 and not title.startswith('[Page') and title not in children:
+                children.append(title)
+        return {
+            h2: [{"h3": h3, "children": children} for h3, children in sections.items()]
+            for h2, sections in trees.items()
+        }
+    
+    def _build_partitions(self):
+        """
+        H2별 파티션과 중심 벡터 구축
+        
+        청크 벡터를 H2 순서로 재배열해 파티션은 연속 구간(복사 없는 슬라이스)으로 두고,
+        중심 벡터는 np.add.at으로 한 번에 합산 후 정규화합니다.
+        """
+        vectors = self.index.reconstruct_n(0, self.index.ntotal)
+        names = [doc.get('h2') or doc.get('category') or '기타' for doc in self.metadata]
+        h2_names = list(dict.fromkeys(names))
+        position = {name: i for i, name in enumerate(h2_names)}
+        labels = np.array([position[name] for name in names], dtype=np.int64)
+        
+        centroids = np.zeros((len(h2_names), vectors.shape[1]), dtype='float32')
+        np.add.at(centroids, labels, vectors)
+        centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+        
+        order = np.argsort(labels, kind='stable')
+        bounds = np.searchsorted(labels[order], np.arange(len(h2_names) + 1))
+        self.partitions = (h2_names, centroids, bounds, order, vectors[order])
+        print(f"🗂️  H2 파티션 구축 완료 ({len(h2_names)}개)")
+    
+    def _start_lexical_search(self, query: str, k: int):
+        """어휘 검색을 스레드에서 시작 (요청 스팬 컨텍스트 유지) → Future"""
+        context = contextvars.copy_context()
+        return self._lexical_pool.submit(context.run, self._lexical_search, query, k)
+    
+    def _encode_query(self, query: str) -> np.ndarray:
+        """질문 임베딩 (정규화된 float32, shape=(1, dim))"""
+        with stage("semantic_encode"):
+            query_vector = self.model.encode([query])
+            faiss.normalize_L2(query_vector)
+        return query_vector.astype('float32')
+    
+    def _dense_search(self, query_vector: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        """벡터 검색 → (청크 번호, 코사인 유사도)"""
+        with stage("faiss_search"):
+            scores, indices = self.index.search(query_vector, k)
+        return [(int(idx), float(score)) for idx, score in zip(indices[0], scores[0]) if idx != -1]
+    
+    def _lexical_search(self, query: str, k: int) -> List[Tuple[int, float]]:
+        """어휘 검색 → (청크 번호, 정규화 BM25 점수 0~1)"""
+        with stage("lexical_search"):
+            return self.lexical.search(query, k)
+    
+    def search(self, query: str, top_k: int = 5, mode: Optional[str] = None) -> List[Tuple[Dict, float]]:
+        """
+        자연어 질문으로 검색
+        
+        Args:
+            query: 질문
+            top_k: 결과 개수
+            mode: "dense"(벡터만) 또는 "hybrid"(벡터 + 어휘), 기본값은 settings.SEMANTIC_SEARCH_MODE
+            
+        Returns:
+            (청크, 점수) 리스트 (점수 내림차순)
+        """
         if self.index is None:
             raise ValueError("인덱스가 구축되지 않았습니다.")
         
-        # 질문을 벡터로 변환
-        query_vector = self.model.encode([query])
-        faiss.normalize_L2(query_vector)
+        mode = mode or settings.SEMANTIC_SEARCH_MODE
+        if mode != "hybrid" or not self.lexical.size:
+            query_vector = self._encode_query(query)
+            return [(self.metadata[idx], score) for idx, score in self._dense_search(query_vector, top_k)]
+        
+        return [(self.metadata[idx], score) for idx, score in self._hybrid_search(query, top_k)]
+    
+    def _hybrid_search(self, query: str, top_k: int) -> List[Tuple[int, float]]:
+        """
+        벡터 + 어휘 검색 결합
         
-        # 검색
-        scores, indices = self.index.search(query_vector.astype('float32'), top_k)
+        - 어휘 검색은 질문 임베딩과 병렬로 실행 (스레드, 요청 스팬 컨텍스트 유지)
+        - 두 후보 집합의 합집합에 대해 점수 결합:
+          코사인 유사도 + SEMANTIC_LEXICAL_WEIGHT × 어휘 점수 (최대 1.0)
+          → 기존 임계값(SEMANTIC_THRESHOLD_MD 등)과 같은 척도를 유지하면서 정확한 토큰 일치만 가산
+        - 어휘 후보 중 벡터 후보에 없는 청크는 저장된 벡터로 코사인을 직접 계산
+        """
+        candidates = min(self.index.ntotal, max(top_k * 4, 50))
+        lexical_future = self._start_lexical_search(query, candidates)
+        
+        query_vector = self._encode_query(query)
+        dense = dict(self._dense_search(query_vector, candidates))
+        lexical = dict(lexical_future.result())
+        
+        missing = [idx for idx in lexical if idx not in dense]
+        if missing:
+            vectors = np.vstack([self.index.reconstruct(idx) for idx in missing])
+            dense.update(zip(missing, (vectors @ query_vector[0]).tolist()))
+        
+        weight = settings.SEMANTIC_LEXICAL_WEIGHT
+        fused = {
+            idx: min(1.0, score + weight * lexical.get(idx, 0.0))
+            for idx, score in dense.items()
+        }
+        return heapq.nlargest(top_k, fused.items(), key=lambda item: item[1])
+    
+    def search_hierarchical(
+        self,
+        query: str,
+        top_k: int = 20,
+        probes: Optional[int] = None,
+        mode: Optional[str] = None
+    ) -> Tuple[Optional[str], List[Tuple[Dict, float]]]:
+        """
+        계층 검색: H2 중심 벡터로 후보 카테고리 선택(coarse) → 해당 파티션 안에서만 검색(fine)
         
-        # 결과 반환
-        results = []
-        for idx, score in zip(indices[0], scores[0]):
-            if idx != -1:
-                results.append((self.metadata[idx], float(score)))
+        질문당 비용은 전체 청크 수가 아니라 (H2 수 + 후보 파티션 크기)에 비례합니다.
         
-        return results
+        Args:
+            query: 질문
+            top_k: 카테고리 내 결과 개수
+            probes: 세부 검색할 후보 H2 수 (기본값 settings.SEMANTIC_H2_PROBES)
+                    후보 중 최고 점수 청크가 속한 H2를 카테고리로 선택
+            mode: "dense" 또는 "hybrid" (기본값 settings.SEMANTIC_SEARCH_MODE)
+            
+        Returns:
+            (H2 이름, 해당 H2 청크의 (청크, 점수) 리스트 - 점수 내림차순)
+        """
+        if self.partitions is None:
+            raise ValueError("인덱스가 구축되지 않았습니다.")
+        h2_names, centroids, bounds, order, partition_vectors = self.partitions
+        
+        hybrid = (mode or settings.SEMANTIC_SEARCH_MODE) == "hybrid" and self.lexical.size
+        lexical_future = self._start_lexical_search(query, self.lexical.size) if hybrid else None
+        query_vector = self._encode_query(query)[0]
+        
+        with stage("h2_routing"):
+            probes = max(1, min(probes or settings.SEMANTIC_H2_PROBES, len(h2_names)))
+            centroid_scores = centroids @ query_vector
+            candidates = np.argpartition(-centroid_scores, probes - 1)[:probes]
+        
+        boost = None
+        if lexical_future is not None:
+            lexical = lexical_future.result()
+            boost = np.zeros(len(order), dtype='float32')
+            if lexical:
+                ids, scores = zip(*lexical)
+                boost[list(ids)] = scores
+            boost = boost[order] * settings.SEMANTIC_LEXICAL_WEIGHT  # 파티션 순서로 재배열
+        
+        with stage("partition_search"):
+            best = None
+            for partition in candidates.tolist():
+                start, end = bounds[partition], bounds[partition + 1]
+                scores = partition_vectors[start:end] @ query_vector
+                if boost is not None:
+                    scores = np.minimum(1.0, scores + boost[start:end])
+                k = min(top_k, len(scores))
+                top = np.argpartition(-scores, k - 1)[:k]
+                top = top[np.argsort(-scores[top], kind='stable')]
+                if best is None or scores[top[0]] > best[0]:
+                    best = (scores[top[0]], partition, order[start:end][top], scores[top])
+        
+        if best is None:
+            return None, []
+        _, partition, ids, scores = best
+        return h2_names[partition], [(self.metadata[idx], float(score)) for idx, score in zip(ids.tolist(), scores.tolist())]
     
     def save_index(self, path: str = 'data/semantic_index_rag'):
         """인덱스 저장"""
@@ -342,6 +543,9 @@ class SemanticSearchEngineRAG:
         with open(f'{path}/metadata.pkl', 'wb') as f:
             pickle.dump(self.metadata, f)
         
+        with open(f'{path}/drilldown.json', 'w', encoding='utf-8') as f:
+            json.dump(self.drilldown, f, ensure_ascii=False, indent=2)
+        
         print(f"💾 RAG 인덱스 저장 완료: {path}")
     
     def load_index(self, path: str = 'data/semantic_index_rag'):
@@ -352,7 +556,28 @@ class SemanticSearchEngineRAG:
             self.metadata = pickle.load(f)
         
         self.documents = self.metadata
+        self._build_lexical_index()
+        self._build_partitions()
+        
+        # drill-down 트리 (이전 버전 인덱스에는 없으므로 메타데이터로 구축)
+        drilldown_path = f'{path}/drilldown.json'
+        if os.path.exists(drilldown_path):
+            with open(drilldown_path, 'r', encoding='utf-8') as f:
+                self.drilldown = json.load(f)
+        else:
+            self.drilldown = self._build_drilldown_trees(self.metadata)
         print(f"📂 RAG 인덱스 로드 완료: {len(self.metadata)}개 문서")
+    
+    def reloaded(self, path: str = 'data/semantic_index_rag') -> "SemanticSearchEngineRAG":
+        """
+        같은 모델로 새 엔진을 만들어 저장된 인덱스 로드
+        
+        load_index()는 검색 중인 엔진의 인덱스/메타데이터/어휘 색인을 차례로 바꾸므로,
+        서비스 중 다시 읽을 때는 새 엔진을 완성한 뒤 참조 하나만 교체합니다.
+        """
+        engine = type(self)(model=self.model, lexical_pool=self._lexical_pool)
+        engine.load_index(path)
+        return engine
 
 
 def build_rag_index():
@@ -2,11 +2,24 @@
 답변 처리 서비스
 LLM, 시맨틱 검색 및 키워드 검색을 통합하여 최적의 답변 제공
 """
+import asyncio
+import hashlib
+import json
 import time
 import os
+from collections import Counter
 from typing import Optional, List, Tuple, Dict
 from models import AnswerResponse, FAQItem
 from config.settings import settings
+from utils.metrics import stage
+
+
+# 유사 질문 인접 리스트에 카테고리별로 저장할 최대 이웃 수
+MAX_RELATED_NEIGHBORS = 6
+
+# 대표 질문 API(/api/category/{category}/questions) 카테고리와 카테고리별 최대 질문 수
+QUESTION_CATEGORIES = ['HR', 'IT', '총무', '복리후생', '비즈니스', '기업 소개']
+MAX_CATEGORY_QUESTIONS = 50
 
 
 class AnswerService:
@@ -40,10 +53,67 @@ class AnswerService:
             '비교견적 서비스': '비즈니스',
             '기업 혁신': '비즈니스',
         }
+        
+        # 유사 질문 인접 리스트 (카테고리 ID → 대표 질문들)
+        self._related_graph: Dict[str, List[str]] = {}
+        # 카테고리별 대표 질문 목록, (카테고리, limit)별 직렬화된 응답 본문과 ETag
+        self._category_questions: Dict[str, List[str]] = {}
+        self._category_payloads: Dict[Tuple[str, int], Tuple[bytes, str]] = {}
+        self.refresh_caches()
+    
+    def refresh_caches(self):
+        """메타데이터/시맨틱 인덱스 기반 사전 계산 캐시 재구축 (초기화 및 reload 시)"""
+        self.build_related_graph()
+        self._category_questions = {
+            category: self._compute_category_questions(category, MAX_CATEGORY_QUESTIONS)
+            for category in QUESTION_CATEGORIES
+        }
+        self._category_payloads = {}
+    
+    def reload(self):
+        """
+        메타데이터와 시맨틱 인덱스를 다시 읽고 사전 계산 캐시 재구축
+        
+        시맨틱 엔진은 새로 로드한 뒤 한 번에 교체 (검색 중인 요청은 기존 엔진을 끝까지 사용)
+        """
+        if self.llm:
+            self.llm.reload_metadata()
+        if self.semantic:
+            self.semantic = self.semantic.reloaded()
+        self.refresh_caches()
+        print("🔄 답변 서비스 캐시 재구축 완료")
     
     def get_category_questions(self, category: str, limit: int = 10) -> List[str]:
+        """카테고리별 대표 질문 (사전 계산된 목록)"""
+        questions = self._category_questions.get(category)
+        if questions is None:
+            questions = self._compute_category_questions(category, MAX_CATEGORY_QUESTIONS)
+        return questions[:max(0, limit)]
+    
+    def get_category_questions_payload(self, category: str, limit: int = 10) -> Tuple[bytes, str]:
+        """
+        대표 질문 API 응답 본문(JSON 바이트)과 ETag
+        
+        (카테고리, limit)별로 한 번만 직렬화하고, refresh_caches() 시 초기화됩니다.
+        """
+        limit = max(0, min(limit, MAX_CATEGORY_QUESTIONS))
+        payloads = self._category_payloads  # reload 중 교체되어도 이전 캐시에만 기록
+        cached = payloads.get((category, limit))
+        if cached is None:
+            questions = self.get_category_questions(category, limit)
+            body = json.dumps({
+                "success": True,
+                "category": category,
+                "questions": questions,
+                "count": len(questions)
+            }, ensure_ascii=False).encode("utf-8")
+            cached = (body, f'"{hashlib.sha1(body).hexdigest()[:20]}"')
+            payloads[(category, limit)] = cached
+        return cached
+    
+    def _compute_category_questions(self, category: str, limit: int = 10) -> List[str]:
         """
-        카테고리별 대표 질문 반환 (메타데이터 기반)
+        카테고리별 대표 질문 생성 (메타데이터 기반)
         
         Args:
             category: 카테고리 이름 (HR, IT, 총무, 복리후생, 비즈니스, 기업 소개)
@@ -63,6 +133,28 @@ class AnswerService:
         # 둘 다 없으면 빈 배열
         return []
     
+    def get_section_questions(self) -> List[Dict]:
+        """
+        메타데이터의 모든 섹션 → 제목/대표 질문 목록 (자동완성 인덱스용)
+        
+        Returns:
+            [{"category": 표시 카테고리, "title": 섹션 제목, "question": 대표 질문}, ...]
+        """
+        if not (self.llm and hasattr(self.llm, 'metadata')):
+            return []
+        
+        sections = []
+        for section_data in self.llm.metadata.get("categories", {}).values():
+            title = (section_data.get("title") or "").strip()
+            if not title:
+                continue
+            sections.append({
+                "category": section_data.get("display_name", ""),
+                "title": title,
+                "question": self._convert_to_natural_question(title),
+            })
+        return sections
+    
     def _get_questions_from_metadata(self, category: str, limit: int = 10) -> List[str]:
         """메타데이터에서 카테고리별 대표 질문 생성 (자연스러운 질문 형태로)"""
         metadata = self.llm.metadata.get("categories", {})
@@ -230,153 +322,83 @@ class AnswerService:
         
         return questions
     
-    def _get_related_questions_from_llm(self, matched_category: str, current_question: str, limit: int = 3) -> List[str]:
+    def build_related_graph(self, limit: int = MAX_RELATED_NEIGHBORS):
         """
-        LLM 메타데이터에서 유사한 질문 추출 (3단계 폴백)
+        유사 질문 인접 리스트 사전 계산 (메타데이터 로드/재로드 시 1회)
+        
+        카테고리 ID마다 이웃 섹션의 대표 질문을 우선순위대로 저장:
+        1. 같은 H2 섹션 (메타데이터 순서)
+        2. 같은 표시 카테고리(display_name)
+        3. 공유 키워드가 많은 섹션 (키워드 역색인으로 집계)
         
         Args:
-            matched_category: 매칭된 카테고리 ID (예: "HR_5", "IT_0")
-            current_question: 현재 질문 (중복 제거용)
-            limit: 반환할 질문 수
-            
-        Returns:
-            유사한 질문 리스트
+            limit: 카테고리별 저장할 최대 이웃 수 (요청 시 현재 질문 제외 후 잘라 씀)
         """
-        if not self.llm or not self.llm.metadata:
-            print("   ⚠️ LLM 또는 메타데이터 없음")
-            return []
-        
-        try:
-            categories = self.llm.metadata.get("categories", self.llm.metadata)
-            related_questions = []
-            
-            # 매칭된 카테고리 정보 가져오기
-            matched_info = categories.get(matched_category)
-            if not matched_info:
-                print(f"   ⚠️ 매칭된 카테고리 정보 없음: {matched_category}")
-                return []
-            
-            matched_h2 = matched_info.get("h2") or matched_info.get("h2_section", "")
-            matched_display_name = matched_info.get("display_name", "")
-            matched_keywords = set(matched_info.get("keywords", []))
-            
-            print(f"   📍 매칭된 정보 - H2: '{matched_h2}', 카테고리: '{matched_display_name}'")
-            
-            # ========== 1단계: 같은 H2 섹션에서 찾기 ==========
-            if matched_h2:
-                print(f"   🔍 1단계: 같은 H2 섹션('{matched_h2}')에서 검색")
-                related_questions.extend(
-                    self._find_related_in_h2(categories, matched_category, matched_h2, current_question, limit)
-                )
-            
-            # ========== 2단계: 같은 카테고리(display_name)에서 찾기 ==========
-            if len(related_questions) < limit and matched_display_name:
-                print(f"   🔍 2단계: 같은 카테고리('{matched_display_name}')에서 검색")
-                related_questions.extend(
-                    self._find_related_in_category(categories, matched_category, matched_display_name, current_question, limit - len(related_questions))
-                )
-            
-            # ========== 3단계: 키워드 유사도로 찾기 ==========
-            if len(related_questions) < limit and matched_keywords:
-                print(f"   🔍 3단계: 키워드 유사도로 검색")
-                related_questions.extend(
-                    self._find_related_by_keywords(categories, matched_category, matched_keywords, current_question, limit - len(related_questions))
-                )
-            
-            print(f"   ✅ 최종 유사 질문 {len(related_questions)}개 추출됨: {related_questions}")
-            return related_questions[:limit]
-            
-        except Exception as e:
-            print(f"   ❌ 유사 질문 추출 오류: {e}")
-            import traceback
-            traceback.print_exc()
-            return []
-    
-    def _find_related_in_h2(self, categories: dict, matched_category: str, matched_h2: str, current_question: str, limit: int) -> List[str]:
-        """1단계: 같은 H2 섹션에서 유사한 질문 찾기"""
-        related_questions = []
+        categories = (self.llm.metadata.get("categories", self.llm.metadata)
+                      if self.llm and self.llm.metadata else {})
         
+        questions: Dict[str, str] = {}
+        by_h2: Dict[str, List[str]] = {}
+        by_display_name: Dict[str, List[str]] = {}
+        by_keyword: Dict[str, List[str]] = {}
         for category_id, info in categories.items():
-            if category_id == matched_category:
-                continue
-            
-            current_h2 = info.get("h2") or info.get("h2_section", "")
-            if current_h2 == matched_h2:
-                title = (info.get("h4") or info.get("h4_section") or 
-                        info.get("h3") or info.get("h3_section") or 
-                        info.get("title", ""))
-                
-                if title:
-                    natural_question = self._convert_to_natural_question(title)
-                    if natural_question != current_question and natural_question not in related_questions:
-                        related_questions.append(natural_question)
-                        if len(related_questions) >= limit:
-                            break
-        
-        print(f"      → H2에서 {len(related_questions)}개 발견")
-        return related_questions
-    
-    def _find_related_in_category(self, categories: dict, matched_category: str, matched_display_name: str, current_question: str, limit: int) -> List[str]:
-        """2단계: 같은 카테고리(display_name)에서 유사한 질문 찾기"""
-        related_questions = []
-        
-        for category_id, info in categories.items():
-            if category_id == matched_category:
-                continue
-            
-            if info.get("display_name") == matched_display_name:
-                title = (info.get("h4") or info.get("h4_section") or 
-                        info.get("h3") or info.get("h3_section") or 
-                        info.get("title", ""))
-                
-                if title:
-                    natural_question = self._convert_to_natural_question(title)
-                    if natural_question != current_question and natural_question not in related_questions:
-                        related_questions.append(natural_question)
-                        if len(related_questions) >= limit:
-                            break
-        
-        print(f"      → 카테고리에서 {len(related_questions)}개 발견")
-        return related_questions
-    
-    def _find_related_by_keywords(self, categories: dict, matched_category: str, matched_keywords: set, current_question: str, limit: int) -> List[str]:
-        """3단계: 키워드 유사도로 유사한 질문 찾기"""
-        related_questions = []
-        candidates = []
-        
+            title = (info.get("h4") or info.get("h4_section") or
+                     info.get("h3") or info.get("h3_section") or
+                     info.get("title", ""))
+            if title:
+                questions[category_id] = self._convert_to_natural_question(title)
+            by_h2.setdefault(info.get("h2") or info.get("h2_section", ""), []).append(category_id)
+            by_display_name.setdefault(info.get("display_name", ""), []).append(category_id)
+            for keyword in set(info.get("keywords", [])):
+                by_keyword.setdefault(keyword, []).append(category_id)
+        
+        graph: Dict[str, List[str]] = {}
         for category_id, info in categories.items():
-            if category_id == matched_category:
-                continue
+            shared = Counter(
+                other
+                for keyword in set(info.get("keywords", []))
+                for other in by_keyword.get(keyword, [])
+            )
+            ranked = [other for other, _ in sorted(shared.items(), key=lambda item: -item[1])]
             
-            category_keywords = set(info.get("keywords", []))
-            # 교집합 개수로 유사도 계산
-            similarity = len(matched_keywords & category_keywords)
+            h2 = info.get("h2") or info.get("h2_section", "")
+            display_name = info.get("display_name", "")
+            neighbors = (by_h2.get(h2, []) if h2 else []) + \
+                (by_display_name.get(display_name, []) if display_name else []) + ranked
             
-            if similarity > 0:
-                title = (info.get("h4") or info.get("h4_section") or 
-                        info.get("h3") or info.get("h3_section") or 
-                        info.get("title", ""))
-                
-                if title:
-                    natural_question = self._convert_to_natural_question(title)
-                    if natural_question != current_question:
-                        candidates.append((similarity, natural_question))
-        
-        # 유사도 높은 순으로 정렬
-        candidates.sort(key=lambda x: x[0], reverse=True)
+            related: List[str] = []
+            for other in neighbors:
+                question = questions.get(other)
+                if other == category_id or not question or question in related:
+                    continue
+                related.append(question)
+                if len(related) >= limit:
+                    break
+            graph[category_id] = related
         
-        for _, question in candidates[:limit]:
-            if question not in related_questions:
-                related_questions.append(question)
+        self._related_graph = graph
+    
+    def _get_related_questions_from_llm(self, matched_category: str, current_question: str, limit: int = 3) -> List[str]:
+        """
+        LLM 메타데이터 기준 유사 질문 (사전 계산된 인접 리스트 조회)
         
-        print(f"      → 키워드 유사도로 {len(related_questions)}개 발견")
-        return related_questions
+        Args:
+            matched_category: 매칭된 카테고리 ID (예: "HR_5", "IT_0")
+            current_question: 현재 질문 (중복 제거용)
+            limit: 반환할 질문 수
+            
+        Returns:
+            유사한 질문 리스트
+        """
+        neighbors = self._related_graph.get(matched_category, [])
+        return [question for question in neighbors if question != current_question][:limit]
     
     def process_question(self, question: str) -> AnswerResponse:
         """
         질문 처리 메인 로직 (LLM 우선)
         
         우선순위:
+        0. 사전 생성 답변 (대표 질문과 같은 질문, LLM 호출 없음)
         1. LLM 서비스 (OpenAI API) - API 키 있을 때
         2. 시맨틱 검색 (RAG)
         3. 키워드 검색 (폴백)
@@ -389,6 +411,13 @@ class AnswerService:
         """
         start_time = time.time()
         
+        # 0순위: 사전 생성 답변 (섹션 원문이 바뀌었으면 무시됨)
+        if self.llm:
+            result = self._pregenerated_search(question, start_time)
+            if result:
+                print("✅ 사전 생성 답변 사용")
+                return result
+        
         # 1순위: LLM 검색 시도 (API 키 있을 때)
         if self.llm and self.llm.enabled:
             try:
@@ -414,38 +443,126 @@ class AnswerService:
         print("ℹ️  검색 결과 없음 - 친절한 안내 제공")
         return self._enhanced_no_result_response(question, start_time)
     
-    def process_question_stream(self, question: str):
+    async def process_question_stream(self, question: str):
         """
-        질문 처리 (스트리밍 응답)
+        질문 처리 (비동기 스트리밍, 단계별 이벤트)
+        
+        이벤트 순서:
+        1. ("retrieval", {...}): 라우팅 직후 카테고리/섹션/담당자/유사 질문
+        2. ("token", 텍스트): 답변 청크
+        
+        retrieval 이벤트는 LLM 생성 요청을 시작한 직후 보냅니다 (첫 토큰 대기 시간과 겹침).
+        SSE 프레이밍과 done/error 이벤트는 호출 측에서 처리합니다.
         
         Args:
             question: 사용자 질문
             
         Yields:
-            답변 청크 (Server-Sent Events 형식)
+            (이벤트 타입, 데이터) 튜플
         """
+        # 사전 생성 답변이 있으면 LLM 호출 없이 한 번에 전송
+        pregenerated = self.llm.get_pregenerated_answer(question) if self.llm else None
+        if pregenerated:
+            category_info = pregenerated["category_info"]
+            related_questions = self._get_related_questions_from_llm(category_info["category_id"], question, 3)
+            yield "retrieval", self._retrieval_event(category_info, related_questions)
+            yield "token", pregenerated["answer"]
+            return
+        
         # LLM 서비스만 스트리밍 지원
         if not (self.llm and self.llm.enabled):
-            # 스트리밍 미지원 시 일반 응답
-            result = self.process_question(question)
-            yield f"data: {result.answer}\n\n"
-            yield "data: [DONE]\n\n"
+            # 스트리밍 미지원 시 일반 응답 (동기 처리 → 스레드에서 실행)
+            result = await asyncio.to_thread(self.process_question, question)
+            yield "retrieval", self._retrieval_event_from_answer(result)
+            yield "token", result.answer
             return
         
         try:
-            # LLM 스트리밍 검색
-            llm_result = self.llm.search_and_answer_stream(question)
-            for chunk in llm_result:
-                # Server-Sent Events 형식으로 전송
-                yield f"data: {chunk}\n\n"
-            yield "data: [DONE]\n\n"
-            
+            route = await self.llm.route_question(question)
         except Exception as e:
-            print(f"⚠️  스트리밍 오류: {e}")
-            # 폴백: 일반 응답
-            result = self.process_question(question)
-            yield f"data: {result.answer}\n\n"
-            yield "data: [DONE]\n\n"
+            print(f"⚠️  라우팅 오류: {e}, 일반 응답으로 폴백")
+            result = await asyncio.to_thread(self.process_question, question)
+            yield "retrieval", self._retrieval_event_from_answer(result)
+            yield "token", result.answer
+            return
+        
+        category_info = route["category_info"]
+        if route["message"]:
+            yield "retrieval", self._retrieval_event(category_info, [])
+            yield "token", route["message"]
+            return
+        
+        # 생성 요청을 먼저 시작하고, 첫 토큰을 기다리는 동안 retrieval 이벤트 전송
+        related_questions = self._get_related_questions_from_llm(category_info.get("category_id", ""), question, 3)
+        tokens = self.llm.generate_answer_stream(question, route["document_content"], category_info)
+        with stage("generation"):
+            first_token = asyncio.ensure_future(tokens.__anext__())
+            try:
+                yield "retrieval", self._retrieval_event(category_info, related_questions)
+                
+                try:
+                    yield "token", await first_token
+                except StopAsyncIteration:
+                    return
+                async for chunk in tokens:
+                    yield "token", chunk
+            finally:
+                # 소비 측 중단(연결 종료) 시 첫 토큰 대기도 취소 → OpenAI 스트림 종료
+                if not first_token.done():
+                    first_token.cancel()
+    
+    def _retrieval_event(self, category_info: Optional[Dict], related_questions: List[str]) -> Dict:
+        """라우팅 결과 → retrieval 이벤트 데이터"""
+        category_info = category_info or {}
+        return {
+            "category": category_info.get("display_name"),
+            "category_id": category_info.get("category_id"),
+            "section": category_info.get("title"),
+            "contact": category_info.get("contact"),
+            "related_questions": related_questions,
+        }
+    
+    def _retrieval_event_from_answer(self, result: AnswerResponse) -> Dict:
+        """일반 응답(AnswerResponse) → retrieval 이벤트 데이터"""
+        return {
+            "category": result.category,
+            "category_id": None,
+            "section": None,
+            "contact": None,
+            "related_questions": result.related_questions or [],
+        }
+    
+    def _pregenerated_search(self, question: str, start_time: float) -> Optional[AnswerResponse]:
+        """
+        사전 생성 답변 (tools/pregenerate_answers.py)
+        
+        Args:
+            question: 사용자 질문
+            start_time: 시작 시간
+            
+        Returns:
+            AnswerResponse 또는 None (대표 질문이 아니거나 섹션 원문이 바뀐 경우)
+        """
+        pregenerated = self.llm.get_pregenerated_answer(question)
+        if not pregenerated:
+            return None
+        
+        category_info = pregenerated["category_info"]
+        related_questions = self._get_related_questions_from_llm(
+            category_info["category_id"],
+            current_question=question,
+            limit=3
+        )
+        
+        return AnswerResponse(
+            answer=pregenerated["answer"],
+            department='엔디(Endy)',
+            link=None,
+            category=category_info.get("display_name") or "일반",
+            confidence_score=0.95,  # LLM 답변과 동일
+            related_questions=related_questions,
+            response_time=round(time.time() - start_time, 3)
+        )
     
     def _llm_search(self, question: str, start_time: float) -> Optional[AnswerResponse]:
         """
@@ -463,18 +580,13 @@ class AnswerService:
         if not result.get("success"):
             return None
         
-        # 유사한 질문 추출 (같은 H2 카테고리 내에서)
-        matched_cat = result.get("matched_category", "")
-        print(f"🔗 유사 질문 추출 시도: matched_category='{matched_cat}'")
-        
+        # 유사한 질문 (사전 계산된 인접 리스트)
         related_questions = self._get_related_questions_from_llm(
-            matched_cat,
+            result.get("matched_category", ""),
             current_question=question,
             limit=3
         )
         
-        print(f"✅ 유사 질문 {len(related_questions)}개 추출됨: {related_questions}")
-        
         return AnswerResponse(
             answer=result["answer"],
             department='엔디(Endy)',
@@ -498,8 +610,17 @@ class AnswerService:
         Returns:
             AnswerResponse 또는 None
         """
+        semantic = self.semantic  # reload로 교체되어도 이 요청은 같은 엔진 사용
+        
+        # 계층 인덱스가 있으면 H2 중심 벡터로 카테고리 선택 → 해당 파티션 안에서만 검색
+        if getattr(semantic, 'partitions', None):
+            category_name, category_docs = semantic.search_hierarchical(question, top_k=20)
+            if not category_docs:
+                return None
+            return self._answer_from_category(question, category_name, category_docs, start_time)
+        
         # Pass 1: 넓게 검색 (top_k=20)
-        results = self.semantic.search(question, top_k=20)
+        results = semantic.search(question, top_k=20)
         
         if not results:
             return None
@@ -548,10 +669,19 @@ class AnswerService:
         # 최고 점수 카테고리
         best_category = max(category_scores.items(), key=lambda x: x[1]['avg_score'])
         category_name, category_data = best_category
-        best_category_score = category_data['avg_score']
         
         # Pass 2: 최적 카테고리 내 세부 질문 매칭
         category_docs = sorted(category_data['docs'], key=lambda x: x[1], reverse=True)
+        return self._answer_from_category(question, category_name, category_docs, start_time)
+    
+    def _answer_from_category(
+        self,
+        question: str,
+        category_name: str,
+        category_docs: List[Tuple[Dict, float]],
+        start_time: float
+    ) -> AnswerResponse:
+        """선택된 카테고리의 검색 결과(점수 내림차순)로 직접 답변 또는 drill-down"""
         best_doc, best_score = category_docs[0]
         
         # 명확도 판단
@@ -649,14 +779,23 @@ class AnswerService:
         category_docs: List[Tuple[Dict, float]],
         start_time: float
     ) -> AnswerResponse:
-        """애매한 질문에 대한 drill-down 답변 (마인드맵)"""
-        # H3 섹션별로 그룹화
-        section_groups = {}
-        for doc, score in category_docs[:10]:
-            h3 = doc.get('h3', doc.get('section', '기타'))
-            if h3 not in section_groups:
-                section_groups[h3] = []
-            section_groups[h3].append((doc, score))
+        """
+        애매한 질문에 대한 drill-down 답변 (마인드맵)
+        
+        시맨틱 인덱스에 H2 drill-down 트리가 있으면 트리의 섹션/하위 제목을
+        현재 검색 점수로 정렬해 사용하고, 없으면 상위 검색 결과를 섹션별로 묶습니다.
+        """
+        tree = getattr(self.semantic, 'drilldown', {}).get(category_name)
+        if tree:
+            section_groups = self._rank_drilldown_tree(tree, category_docs)
+        else:
+            # H3 섹션별로 그룹화
+            section_groups = {}
+            for doc, score in category_docs[:10]:
+                h3 = doc.get('h3', doc.get('section', '기타'))
+                if h3 not in section_groups:
+                    section_groups[h3] = []
+                section_groups[h3].append(doc.get('title', ''))
         
         # 답변 구성
         answer = f"**'{question}'**과 관련된 질문들을 찾았습니다:\n\n"
@@ -666,14 +805,13 @@ class AnswerService:
         related_questions = []
         
         # 섹션별로 질문 제시 (섹션명과 질문이 같으면 질문만 표시)
-        for i, (section, docs) in enumerate(list(section_groups.items())[:4], 1):
+        for i, (section, titles) in enumerate(list(section_groups.items())[:4], 1):
             # 섹션명 추가
             shown_titles.add(section)
             related_questions.append(section)
             
             # 섹션명과 다른 하위 질문만 추가
-            for doc, score in docs[:2]:  # 섹션당 최대 2개 (섹션명 제외하고 하위 질문)
-                title = doc.get('title', '')
+            for title in titles[:2]:  # 섹션당 최대 2개 (섹션명 제외하고 하위 질문)
                 # 섹션명과 질문이 유사하면 스킵
                 if title and title not in shown_titles and not title.startswith('[Page') and title != section:
                     shown_titles.add(title)
@@ -693,6 +831,26 @@ class AnswerService:
             response_time=round(time.time() - start_time, 3)
         )
     
+    def _rank_drilldown_tree(self, tree: List[Dict], category_docs: List[Tuple[Dict, float]]) -> Dict[str, List[str]]:
+        """
+        drill-down 트리 정렬: 검색에 걸린 섹션/제목을 점수순으로 앞에, 나머지는 문서 순서
+        
+        Returns:
+            {섹션명: [하위 제목, ...]} (정렬 순서 유지)
+        """
+        scores: Dict[str, float] = {}
+        for doc, score in category_docs:
+            for key in (doc.get('h3'), doc.get('title')):
+                if key and score > scores.get(key, float('-inf')):
+                    scores[key] = score
+        
+        def rank(names: List[str]) -> List[str]:
+            return sorted(names, key=lambda name: -scores.get(name, float('-inf')))
+        
+        sections = rank([node["h3"] for node in tree])
+        children = {node["h3"]: node["children"] for node in tree}
+        return {section: rank(children[section]) for section in sections}
+    
     def _merge_search_results(
         self, 
         results1: List[Tuple[Dict, float]], 
@@ -2,11 +2,19 @@
 LLM 기반 검색 서비스
 OpenAI API를 사용한 메타데이터 기반 문서 검색 및 답변 생성
 """
+import asyncio
+import io
 import json
 import os
 from pathlib import Path
 from typing import Optional, Dict, List
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+
+from utils.metrics import (
+    llm_response_time, stage, track_cache_operation, track_spell_fallback_avoided, track_time
+)
+from utils.doc_store import DocumentStore
+from utils.spell import spell_corrector
 
 
 class LLMSearchService:
@@ -18,18 +26,28 @@ class LLMSearchService:
         self.api_key = os.getenv("OPENAI_API_KEY", "")
         if self.api_key:
             self.client = OpenAI(api_key=self.api_key)
+            self.async_client = AsyncOpenAI(api_key=self.api_key)  # 스트리밍용 (이벤트 루프 블로킹 없음)
             self.enabled = True
             print("✅ LLM 서비스 활성화 (OpenAI API)")
         else:
             self.client = None
+            self.async_client = None
             self.enabled = False
             print("⚠️  LLM 서비스 비활성화 (OPENAI_API_KEY 미설정)")
         
         # 메타데이터 로드
         self.metadata = self._load_metadata()
-        self.documents_cache = {}  # MD 파일 캐시
+        self.doc_store = DocumentStore("docs")  # MD 문서 (mmap, 섹션은 바이트 범위로 읽음)
+        self._stale_warned = set()  # 오래된 메타데이터 경고를 한 번만 출력한 섹션
+        self.section_digests = self._load_section_digests()  # 섹션 ID → 다이제스트 (프롬프트용 정리본)
+        self.pregenerated = self._load_pregenerated_answers()  # 질문 키 → 사전 생성 답변 (tools/pregenerate_answers.py)
         self.answer_cache = {}  # 답변 캐시 (질문 → 답변) - 프롬프트 변경 시 자동 초기화됨 (v20250117_10)
     
+    @track_time(llm_response_time)
+    def _create_completion(self, **kwargs):
+        """OpenAI Chat Completions 호출 (비스트리밍, llm_response_seconds 기록)"""
+        return self.client.chat.completions.create(**kwargs)
+    
     def _load_metadata(self) -> Dict:
         """메타데이터 JSON 로드"""
         metadata_path = Path("data/documents_metadata.json")
@@ -47,9 +65,132 @@ class LLMSearchService:
             print(f"❌ 메타데이터 로드 실패: {e}")
             return {"categories": {}}
     
+    def _load_section_digests(self) -> Dict:
+        """섹션 다이제스트 로드 (tools/generate_metadata.py가 생성, 없으면 원문 사용)"""
+        digest_path = Path("data/section_digests.json")
+        
+        if not digest_path.exists():
+            return {}
+        
+        try:
+            with open(digest_path, 'r', encoding='utf-8') as f:
+                sections = json.load(f).get("sections", {})
+            tokens_raw = sum(d.get("tokens_raw", 0) for d in sections.values())
+            tokens_digest = sum(d.get("tokens_digest", 0) for d in sections.values())
+            print(f"✅ 섹션 다이제스트 로드: {len(sections)}개 (토큰 {tokens_raw:,} → {tokens_digest:,})")
+            return sections
+        except Exception as e:
+            print(f"❌ 섹션 다이제스트 로드 실패: {e}")
+            return {}
+    
+    def _load_pregenerated_answers(self) -> Dict:
+        """사전 생성 답변 로드 (섹션 원문 해시가 바뀐 항목은 조회 시 무시)"""
+        answers_path = Path("data/pregenerated_answers.json")
+        
+        if not answers_path.exists():
+            return {}
+        
+        try:
+            with open(answers_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get("answers", {})
+            valid = sum(1 for entry in entries.values() if self._pregenerated_valid(entry))
+            print(f"✅ 사전 생성 답변 로드: {len(entries)}개 (유효 {valid}개)")
+            return entries
+        except Exception as e:
+            print(f"❌ 사전 생성 답변 로드 실패: {e}")
+            return {}
+    
+    def _pregenerated_valid(self, entry: Dict) -> bool:
+        """사전 생성 답변이 현재 메타데이터/문서 섹션과 같은 원문으로 만들어졌는지"""
+        info = self.metadata.get("categories", {}).get(entry.get("section_id"))
+        if not info or not entry.get("content_hash") or info.get("content_hash") != entry["content_hash"]:
+            return False
+        if info.get("start_byte") is None or info.get("end_byte") is None:
+            return False
+        try:
+            return self.doc_store.section_matches(
+                info.get("filename", ""), info["start_byte"], info["end_byte"], entry["content_hash"]
+            )
+        except Exception:
+            return False
+    
+    def get_pregenerated_answer(self, question: str) -> Optional[Dict]:
+        """
+        사전 생성 답변 조회 (LLM 호출 전 단계)
+        
+        질문 키(_get_cache_key)가 대표 질문과 같고, 답변 생성 후 섹션 원문이 바뀌지 않았을 때만 반환합니다.
+        
+        Returns:
+            {"category_info", "answer"} 또는 None
+        """
+        entry = self.pregenerated.get(self._get_cache_key(question))
+        if not entry or not self._pregenerated_valid(entry):
+            return None
+        
+        track_cache_operation("pregenerated")
+        section_id = entry["section_id"]
+        return {
+            "category_info": {"category_id": section_id, **self.metadata["categories"][section_id]},
+            "answer": entry["answer"]
+        }
+    
+    def reload_metadata(self):
+        """메타데이터 다시 읽기 (답변 캐시도 초기화)"""
+        self.metadata = self._load_metadata()
+        self.section_digests = self._load_section_digests()
+        self.pregenerated = self._load_pregenerated_answers()
+        self._stale_warned = set()
+        self.answer_cache = {}
+    
+    def _load_section(self, category_info: Dict, prefer_digest: bool = False) -> str:
+        """
+        메타데이터 섹션 내용 로드
+        
+        바이트 범위(start_byte/end_byte)가 있으면 mmap 슬라이스로 읽고 content_hash로 검증합니다.
+        해시가 맞지 않으면(메타데이터 생성 후 문서 수정) 경고 후 빈 문자열을 반환합니다.
+        줄 범위도 같은 시점에 만들어져 똑같이 어긋나 있으므로 다른 섹션을 LLM에 보내지 않도록
+        호출 측의 "문서를 찾을 수 없습니다" 경로로 넘깁니다.
+        
+        Args:
+            category_info: 메타데이터 섹션 정보
+            prefer_digest: 원문이 다이제스트 생성 시점과 같으면 다이제스트 반환 (LLM 프롬프트용)
+        """
+        filename = category_info.get("filename", "")
+        start_byte = category_info.get("start_byte")
+        end_byte = category_info.get("end_byte")
+        
+        if start_byte is not None and end_byte is not None:
+            digest = self.section_digests.get(category_info.get("category_id")) if prefer_digest else None
+            if digest and digest.get("content_hash") == category_info.get("content_hash"):
+                try:
+                    if self.doc_store.section_matches(filename, start_byte, end_byte, digest["content_hash"]):
+                        return digest["digest"]
+                except Exception as e:
+                    print(f"❌ 문서 로드 실패 ({filename}): {e}")
+                    return ""
+            
+            try:
+                content = self.doc_store.read_section(
+                    filename, start_byte, end_byte, category_info.get("content_hash")
+                )
+            except Exception as e:
+                print(f"❌ 문서 로드 실패 ({filename}): {e}")
+                return ""
+            if content is not None:
+                return content
+            
+            key = (filename, start_byte, end_byte)
+            if key not in self._stale_warned:
+                self._stale_warned.add(key)
+                print(f"⚠️  메타데이터가 문서와 맞지 않음 ({filename}, {category_info.get('title', '')}) - "
+                      f"tools/generate_metadata.py로 다시 생성하세요")
+            return ""
+        
+        return self._load_document(filename, category_info.get("start_line"), category_info.get("end_line"))
+    
     def _load_document(self, filename: str, start_line: int = None, end_line: int = None) -> str:
         """
-        MD 문서 로드 (캐시 사용)
+        MD 문서 로드 (줄 범위, 바이트 범위가 없는 이전 메타데이터용)
         
         Args:
             filename: 파일명
@@ -59,29 +200,22 @@ class LLMSearchService:
         Returns:
             문서 내용 (특정 범위 또는 전체)
         """
-        doc_path = Path("docs") / filename
-        
-        if not doc_path.exists():
-            return ""
-        
         try:
-            # 전체 파일을 캐시에 저장
-            if filename not in self.documents_cache:
-                with open(doc_path, 'r', encoding='utf-8') as f:
-                    self.documents_cache[filename] = f.readlines()
-            
-            lines = self.documents_cache[filename]
-            
-            # 특정 범위만 반환
-            if start_line is not None and end_line is not None:
-                # 인덱스는 0부터 시작하므로 -1
-                return ''.join(lines[start_line-1:end_line])
-            else:
-                return ''.join(lines)
-            
+            content = self.doc_store.read(filename)
         except Exception as e:
             print(f"❌ 문서 로드 실패 ({filename}): {e}")
             return ""
+        
+        if not content:
+            return ""
+        
+        # 특정 범위만 반환
+        if start_line is not None and end_line is not None:
+            # 인덱스는 0부터 시작하므로 -1
+            # generate_metadata.py(bytes.splitlines)와 같은 기준(\n, \r\n, \r)으로 분리
+            # (str.splitlines는 \x0c, \u2028 등에서도 나눠 메타데이터 줄 번호와 어긋남)
+            return ''.join(io.StringIO(content, newline='').readlines()[start_line-1:end_line])
+        return content
     
     def extract_keywords(self, question: str) -> List[str]:
         """
@@ -98,7 +232,7 @@ class LLMSearchService:
             return self._simple_tokenize(question)
         
         try:
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
                 model="gpt-3.5-turbo",
                 messages=[
                     {
@@ -309,6 +443,28 @@ class LLMSearchService:
             **best_data["info"]
         }
     
+    def _match_category(self, keywords: List[str]) -> Optional[Dict]:
+        """
+        키워드 카테고리 매칭 (실패 시 오타 교정 후 한 번 더)
+        
+        교정은 매칭에 실패했을 때만 시도하므로 정상 질문의 라우팅은 바뀌지 않습니다.
+        교정으로 매칭되면 LLM 섹션 추천 호출을 피한 것으로 집계합니다.
+        """
+        category_info = self.find_matching_category(keywords)
+        if category_info or not spell_corrector.size:
+            return category_info
+        
+        with stage("spell_correction"):
+            corrected = [spell_corrector.correct_text(keyword) for keyword in keywords]
+        if corrected == keywords:
+            return None
+        
+        print(f"✏️  오타 교정: {keywords} → {corrected}")
+        category_info = self.find_matching_category(corrected)
+        if category_info:
+            track_spell_fallback_avoided("category_router")
+        return category_info
+    
     def find_best_section_by_llm(self, question: str) -> Optional[Dict]:
         """
         LLM을 사용하여 질문에 가장 적합한 문서 섹션 찾기
@@ -343,7 +499,7 @@ class LLMSearchService:
             section_text = "\n".join(section_list[:100])
             
             # GPT에게 최적 섹션 선택 요청
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
                 model="gpt-3.5-turbo",
                 messages=[
                     {
@@ -397,9 +553,15 @@ class LLMSearchService:
             print(f"❌ LLM 섹션 추천 실패: {e}")
             return None
     
-    def generate_answer_stream(self, question: str, document_content: str, category_info: Dict):
+    async def generate_answer_stream(self, question: str, document_content: str, category_info: Dict):
         """
-        LLM을 사용하여 문서 기반 답변 생성 (스트리밍)
+        LLM을 사용하여 문서 기반 답변 생성 (비동기 스트리밍)
+        
+        소비 측이 중단(클라이언트 연결 종료 → 태스크 취소)하면
+        OpenAI 스트림 연결을 닫아 업스트림 생성도 중단됩니다.
+        
+        청크를 보내기 전에 실패하면 폴백 답변을 보내고, 일부를 보낸 뒤 실패하면
+        예외를 그대로 올립니다 (엔드포인트가 error 이벤트 전송, 반쯤 쓴 답변 뒤에 폴백을 붙이지 않음).
         
         Args:
             question: 사용자 질문
@@ -413,6 +575,7 @@ class LLMSearchService:
             yield self._generate_fallback_answer(question, document_content, category_info)
             return
         
+        sent = False
         try:
             # 문서가 너무 길면 잘라내기
             max_doc_length = 20000
@@ -430,7 +593,7 @@ class LLMSearchService:
             contact_name = contact.get('name', '담당자') if contact else '담당자'
             contact_phone = contact.get('phone', '연락처') if contact else '연락처'
             
-            stream = self.client.chat.completions.create(
+            stream = await self.async_client.chat.completions.create(
                 model="gpt-3.5-turbo-16k",
                 messages=[
                     {
@@ -505,11 +668,19 @@ class LLMSearchService:
                 stream=True  # 스트리밍 활성화
             )
             
-            for chunk in stream:
-                if chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
+            try:
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        sent = True
+                        yield chunk.choices[0].delta.content
+            finally:
+                # 정상 종료/취소 모두 HTTP 연결 반환 (취소 시 생성 중단)
+                await stream.close()
             
         except Exception as e:
+            if sent:
+                print(f"⚠️  LLM 스트리밍 중단: {e}")
+                raise
             print(f"⚠️  LLM 스트리밍 실패: {e}, 폴백 사용")
             yield self._generate_fallback_answer(question, document_content, category_info)
     
@@ -535,40 +706,52 @@ class LLMSearchService:
             print(f"   📝 관리자 확인 필요: MD 파일에 해당 섹션의 내용을 보완해주세요.")
         
         try:
-            # 문서가 너무 길면 잘라내기 (GPT-3.5 토큰 제한: ~16K 토큰)
-            # 한글 1자 = 약 2토큰, 여유있게 20,000자로 제한
-            max_doc_length = 20000
-            if len(document_content) > max_doc_length:
-                document_content = document_content[:max_doc_length] + "\n\n...(이하 생략)"
-            
-            # 담당자 정보 안전하게 추출
-            contact = {}
-            if isinstance(category_info, dict):
-                contact = category_info.get('contact', {})
-                if not isinstance(contact, dict):
-                    contact = {}
-            
-            contact_team = contact.get('team', '담당팀') if contact else '담당팀'
-            contact_name = contact.get('name', '담당자') if contact else '담당자'
-            contact_phone = contact.get('phone', '연락처') if contact else '연락처'
-            
-            # ✅ 질문 의도 분류
-            intent = self.classify_question_intent(question)
-            print(f"🎯 질문 의도: {intent}")
-            
-            # ✅ 의도별 최적화된 프롬프트 생성
-            system_prompt = self.get_prompt_by_intent(intent, contact_team, contact_name, contact_phone)
-            
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo-16k",  # 16K 토큰 모델 사용
-                messages=[
-                    {
-                        "role": "system",
-                        "content": system_prompt
-                    },
-                    {
-                        "role": "user",
-                        "content": f"""다음 문서를 읽고, 사용자 질문에 답변하세요.
+            return self._request_answer(question, document_content, category_info)
+        except Exception as e:
+            print(f"⚠️  LLM 답변 생성 실패: {e}, 폴백 사용")
+            return self._generate_fallback_answer(question, document_content, category_info)
+    
+    def _request_answer(self, question: str, document_content: str, category_info: Dict) -> str:
+        """
+        LLM 답변 생성 요청 (실패 시 예외 발생)
+        
+        generate_answer는 실패하면 폴백 답변을 반환하고,
+        사전 생성 배치(tools/pregenerate_answers.py)는 예외를 받아 재시도합니다.
+        """
+        # 문서가 너무 길면 잘라내기 (GPT-3.5 토큰 제한: ~16K 토큰)
+        # 한글 1자 = 약 2토큰, 여유있게 20,000자로 제한
+        max_doc_length = 20000
+        if len(document_content) > max_doc_length:
+            document_content = document_content[:max_doc_length] + "\n\n...(이하 생략)"
+        
+        # 담당자 정보 안전하게 추출
+        contact = {}
+        if isinstance(category_info, dict):
+            contact = category_info.get('contact', {})
+            if not isinstance(contact, dict):
+                contact = {}
+        
+        contact_team = contact.get('team', '담당팀') if contact else '담당팀'
+        contact_name = contact.get('name', '담당자') if contact else '담당자'
+        contact_phone = contact.get('phone', '연락처') if contact else '연락처'
+        
+        # ✅ 질문 의도 분류
+        intent = self.classify_question_intent(question)
+        print(f"🎯 질문 의도: {intent}")
+        
+        # ✅ 의도별 최적화된 프롬프트 생성
+        system_prompt = self.get_prompt_by_intent(intent, contact_team, contact_name, contact_phone)
+        
+        response = self._create_completion(
+            model="gpt-3.5-turbo-16k",  # 16K 토큰 모델 사용
+            messages=[
+                {
+                    "role": "system",
+                    "content": system_prompt
+                },
+                {
+                    "role": "user",
+                    "content": f"""다음 문서를 읽고, 사용자 질문에 답변하세요.
 원문을 그대로 복사하지 말고, 엔디의 친근한 톤으로 재구성하세요.
 
 [문서 내용]
@@ -587,20 +770,16 @@ class LLMSearchService:
 - 볼드(**텍스트**)는 섹션 제목에만 사용 (본문 절대 사용 금지)
 - 톤앤매너: 친근하고 자세하게
 - 질문 유형({intent})에 맞는 구조로 답변"""
-                    }
-                ],
-                temperature=0.1,  # 일관성을 위해 낮춤
-                max_tokens=1500
-            )
-            
-            answer = response.choices[0].message.content.strip()
-            print(f"💬 LLM 답변 생성 완료 ({len(answer)}자)")
-            
-            return answer
-            
-        except Exception as e:
-            print(f"⚠️  LLM 답변 생성 실패: {e}, 폴백 사용")
-            return self._generate_fallback_answer(question, document_content, category_info)
+                }
+            ],
+            temperature=0.1,  # 일관성을 위해 낮춤
+            max_tokens=1500
+        )
+        
+        answer = response.choices[0].message.content.strip()
+        print(f"💬 LLM 답변 생성 완료 ({len(answer)}자)")
+        
+        return answer
     
     def _generate_fallback_answer(self, question: str, document_content: str, category_info: Dict) -> str:
         """LLM 실패 시 폴백 답변 (문서 일부 + 담당자 정보)"""
@@ -645,41 +824,54 @@ class LLMSearchService:
         normalized = re.sub(r'\s+', '', question.lower())
         return normalized
     
-    def search_and_answer_stream(self, question: str):
+    async def route_question(self, question: str) -> Dict:
         """
-        질문에 대한 답변 생성 (스트리밍)
+        질문 → 문서 섹션 라우팅 (스트리밍 1단계, 비동기)
+        
+        동기 OpenAI 호출(키워드 추출, 섹션 추천)은 스레드에서 실행합니다.
         
         Args:
             question: 사용자 질문
             
-        Yields:
-            답변 청크 (실시간 스트리밍)
+        Returns:
+            {"category_info", "document_content", "message"}
+            - 성공: category_info와 document_content가 채워짐
+            - 실패: message에 사용자 안내 문구 (category_info는 찾았으면 포함)
         """
-        # 1단계: 키워드 추출
-        keywords = self.extract_keywords(question)
+        # 1단계: 키워드 추출 (동기 API 호출 → 스레드에서 실행)
+        with stage("keyword_extraction"):
+            keywords = await asyncio.to_thread(self.extract_keywords, question)
         
         # 2단계: 카테고리 매칭
-        category_info = self.find_matching_category(keywords)
+        with stage("category_matching"):
+            category_info = self._match_category(keywords)
         
+        # 3단계: 키워드 매칭 실패 시 LLM에게 직접 물어보기
         if not category_info:
-            yield "죄송합니다. 관련 정보를 찾지 못했습니다. 다른 키워드로 질문해주시겠어요?"
-            return
+            print("🤖 LLM 기반 섹션 추천 시도...")
+            with stage("llm_section_selection"):
+                category_info = await asyncio.to_thread(self.find_best_section_by_llm, question)
         
-        # 3단계: 문서 로드 (특정 섹션만)
-        filename = category_info.get("filename", "")
-        start_line = category_info.get("start_line")
-        end_line = category_info.get("end_line")
+        if not category_info:
+            return {
+                "category_info": None,
+                "document_content": "",
+                "message": "죄송해요, 관련 정보를 찾지 못했어요. 😢\n\n다른 방식으로 질문해주시거나, 담당 부서에 직접 문의해주세요!"
+            }
         
-        document_content = self._load_document(filename, start_line, end_line)
+        # 4단계: 문서 로드 (특정 섹션만)
+        with stage("document_load"):
+            document_content = self._load_section(category_info, prefer_digest=True)
         
         if not document_content:
             contact = category_info.get('contact', {})
-            yield f"문서를 찾을 수 없습니다. {contact.get('team', '담당팀')} {contact.get('name', '담당자')}({contact.get('phone', '연락처 미등록')})에게 문의해주세요."
-            return
+            return {
+                "category_info": category_info,
+                "document_content": "",
+                "message": f"문서를 찾을 수 없습니다. {contact.get('team', '담당팀')} {contact.get('name', '담당자')}({contact.get('phone', '연락처 미등록')})에게 문의해주세요."
+            }
         
-        # 4단계: LLM 답변 생성 (스트리밍)
-        for chunk in self.generate_answer_stream(question, document_content, category_info):
-            yield chunk
+        return {"category_info": category_info, "document_content": document_content, "message": None}
     
     def search_and_answer(self, question: str) -> Dict:
         """
@@ -706,15 +898,18 @@ class LLMSearchService:
             }
         
         # 1단계: 키워드 추출
-        keywords = self.extract_keywords(question)
+        with stage("keyword_extraction"):
+            keywords = self.extract_keywords(question)
         
         # 2단계: 키워드 매칭 (엄격)
-        category_info = self.find_matching_category(keywords)
+        with stage("category_matching"):
+            category_info = self._match_category(keywords)
         
         # ✅ 3단계: 키워드 매칭 실패 시 LLM에게 직접 물어보기
         if not category_info:
             print("🤖 LLM 기반 섹션 추천 시도...")
-            category_info = self.find_best_section_by_llm(question)
+            with stage("llm_section_selection"):
+                category_info = self.find_best_section_by_llm(question)
         
         if not category_info:
             return {
@@ -725,12 +920,12 @@ class LLMSearchService:
             }
         
         # 3단계: 문서 로드 (특정 섹션만)
-        filename = category_info.get("filename", "")
         start_line = category_info.get("start_line")
         end_line = category_info.get("end_line")
         
-        # 특정 섹션만 로드 (라인 범위가 있으면)
-        document_content = self._load_document(filename, start_line, end_line)
+        # 특정 섹션만 로드 (다이제스트 → 바이트 범위 → 줄 범위 순)
+        with stage("document_load"):
+            document_content = self._load_section(category_info, prefer_digest=True)
         
         if not document_content:
             contact = category_info.get('contact', {})
@@ -746,7 +941,8 @@ class LLMSearchService:
         print(f"📖 읽은 섹션: {section_info} (라인 {start_line}-{end_line}, {len(document_content)}자)")
         
         # 4단계: LLM 답변 생성
-        answer = self.generate_answer(question, document_content, category_info)
+        with stage("generation"):
+            answer = self.generate_answer(question, document_content, category_info)
         
         # 답변 캐시 저장
         result = {
@@ -0,0 +1,117 @@
+"""
+자동완성 서비스
+FAQ 질문, 섹션 대표 질문, 섹션 제목을 접두사 트라이로 색인하여
+입력 중인 질문에 대한 추천을 서버에서 바로 반환
+"""
+from typing import Dict, List, Optional
+
+from models import FAQItem
+from utils.hangul import chosung, has_chosung, normalize_key
+from utils.prefix_trie import PrefixTrie
+
+
+# 추천 우선순위 (작을수록 먼저)
+SOURCE_RANK = {"faq": 0, "question": 1, "section": 2}
+
+MAX_SUGGESTIONS = 10
+
+
+class SuggestService:
+    """접두사 트라이 기반 자동완성 (카테고리별 트라이 + 초성 트라이)"""
+
+    def __init__(self, top_k: int = MAX_SUGGESTIONS):
+        """
+        Args:
+            top_k: 트라이 노드별 보관 개수 (limit 상한)
+        """
+        self.top_k = top_k
+        # (항목 목록, 카테고리별 텍스트 트라이, 카테고리별 초성 트라이) - 한 번에 교체
+        self._index = ([], {}, {})
+
+    def rebuild(self, faqs: List[FAQItem], sections: List[Dict]):
+        """
+        인덱스 재구축 (새 트라이를 만든 뒤 교체 → 조회 중인 요청에 영향 없음)
+
+        Args:
+            faqs: FAQ 목록
+            sections: AnswerService.get_section_questions() 결과
+        """
+        # (출처, 문장, 카테고리, 추가 검색어)
+        candidates = [("faq", faq.question, faq.category, faq.keywords) for faq in faqs]
+        for section in sections:
+            candidates.append(("question", section["question"], section["category"], []))
+            candidates.append(("section", section["title"], section["category"], []))
+
+        # 같은 문장은 우선순위가 높은 쪽 하나만
+        entries: List[Dict] = []
+        extra_keys: List[List[str]] = []
+        seen = set()
+        for source, text, category, keywords in sorted(candidates, key=lambda c: (SOURCE_RANK[c[0]], len(c[1] or ""))):
+            text = (text or "").strip()
+            key = normalize_key(text)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            entries.append({"text": text, "category": category, "type": source})
+            extra_keys.append(keywords or [])
+
+        text_tries: Dict[str, PrefixTrie] = {"all": PrefixTrie(self.top_k)}
+        chosung_tries: Dict[str, PrefixTrie] = {"all": PrefixTrie(self.top_k)}
+        for item_id, entry in enumerate(entries):
+            category = entry["category"]
+            if category not in text_tries:
+                text_tries[category] = PrefixTrie(self.top_k)
+                chosung_tries[category] = PrefixTrie(self.top_k)
+
+            # 단어 시작 위치마다 접미사를 키로 등록 ("연차 신청" → "연차신청", "신청")
+            # FAQ 키워드("wifi" 등)도 해당 질문으로 연결
+            words = entry["text"].split()
+            keys = [" ".join(words[i:]) for i in range(len(words))] + extra_keys[item_id]
+            for suffix in keys:
+                text_key = normalize_key(suffix)
+                chosung_key = normalize_key(chosung(suffix))
+                for name in ("all", category):
+                    text_tries[name].insert(text_key, item_id)
+                    chosung_tries[name].insert(chosung_key, item_id)
+
+        self._index = (entries, text_tries, chosung_tries)
+        print(f"✅ 자동완성 인덱스 구축 완료 ({len(entries)}개 항목)")
+
+    @property
+    def size(self) -> int:
+        """색인된 항목 수"""
+        return len(self._index[0])
+
+    def suggest(self, query: str, limit: int = 5, category: Optional[str] = None) -> List[Dict]:
+        """
+        입력 중인 질의로 추천 목록 조회
+
+        - 자음만 입력된 글자가 있으면 초성으로 검색 ("ㅎㄱ" → "휴가 ...")
+        - 공백은 무시 ("휴가신" == "휴가 신")
+
+        Args:
+            query: 입력 중인 질의
+            limit: 최대 개수 (top_k 이하)
+            category: 카테고리 필터 (None 또는 "all"이면 전체)
+
+        Returns:
+            [{"text", "category", "type"}, ...] (FAQ → 대표 질문 → 섹션 제목, 짧은 순)
+        """
+        entries, text_tries, chosung_tries = self._index
+        limit = max(0, min(limit, self.top_k))
+        name = category if category and category != "all" else "all"
+
+        if has_chosung(query):
+            trie = chosung_tries.get(name)
+            key = normalize_key(chosung(query))
+        else:
+            trie = text_tries.get(name)
+            key = normalize_key(query)
+
+        if trie is None:
+            return []
+        return [entries[item_id] for item_id in trie.search(key, limit)]
+
+
+# 싱글톤 인스턴스 (startup_event에서 구축)
+suggest_service = SuggestService()
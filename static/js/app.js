@@ -6,7 +6,6 @@
 // 전역 변수
 let sessionToken = null;
 let currentUser = null;
-let allFAQs = []; // 전체 FAQ 목록 캐싱
 let questionHistory = []; // 질문 히스토리
 let historyIndex = -1; // 히스토리 네비게이션 인덱스
 let selectedCategory = 'all'; // 선택된 카테고리
@@ -23,9 +22,6 @@ document.addEventListener('DOMContentLoaded', () => {
         showLoginModal();
     }
     
-    // FAQ 목록 미리 로드
-    loadAllFAQs();
-    
     // 자동완성 초기화
     initAutocomplete();
     
@@ -322,35 +318,23 @@ async function handleQuestion(event) {
     try {
         const startTime = Date.now();
         
-        // ✅ 일반 응답 처리 (스트리밍 비활성화)
-        const response = await fetch('/api/ask', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-                'Authorization': sessionToken ? `Bearer ${sessionToken}` : ''
-            },
-            body: JSON.stringify({
-                question: savedQuestion,
-                user_id: currentUser ? currentUser.employee_id : null
-            })
-        });
-        
-        if (!response.ok) {
-            throw new Error(`HTTP ${response.status}`);
+        try {
+            // ✅ 스트리밍 응답 (첫 토큰부터 바로 표시)
+            await streamAnswer(savedQuestion, loadingId, startTime);
+        } catch (streamError) {
+            // 폴백: 일반 응답
+            console.warn('⚠️ 스트리밍 실패, 일반 응답으로 전환:', streamError);
+            const data = await fetchAnswer(savedQuestion);
+            const responseTime = ((Date.now() - startTime) / 1000).toFixed(2);
+            console.log(`⏱️ 응답 시간: ${responseTime}초`);
+            
+            // 로딩 제거
+            removeLoading(loadingId);
+            
+            // 봇 메시지 표시 (유사한 질문, 피드백 버튼 포함)
+            addBotMessage(data, responseTime);
         }
         
-        const data = await response.json();
-        const responseTime = ((Date.now() - startTime) / 1000).toFixed(2);
-        console.log(`⏱️ 응답 시간: ${responseTime}초`);
-        console.log('📦 API 응답 데이터:', data);
-        console.log('🔗 유사한 질문:', data.related_questions);
-        
-        // 로딩 제거
-        removeLoading(loadingId);
-        
-        // 봇 메시지 표시 (유사한 질문, 피드백 버튼 포함)
-        addBotMessage(data, responseTime);
-        
     } catch (error) {
         console.error('질문 처리 오류:', error);
         removeLoading(loadingId);
@@ -367,6 +351,205 @@ async function handleQuestion(event) {
     }
 }
 
+// ==================== 답변 요청 ====================
+
+function authHeaders() {
+    return {
+        'Content-Type': 'application/json',
+        'Authorization': sessionToken ? `Bearer ${sessionToken}` : ''
+    };
+}
+
+// 일반 응답 (/api/ask)
+async function fetchAnswer(question) {
+    const response = await fetch('/api/ask', {
+        method: 'POST',
+        headers: authHeaders(),
+        body: JSON.stringify({
+            question: question,
+            user_id: currentUser ? currentUser.employee_id : null
+        })
+    });
+    
+    if (!response.ok) {
+        throw new Error(`HTTP ${response.status}`);
+    }
+    
+    return response.json();
+}
+
+/**
+ * 스트리밍 응답 (/api/ask/stream, SSE)
+ * - retrieval: 카테고리/유사 질문 → 답변 말풍선 생성
+ * - token: 답변 청크 → 프레임당 1회 마크다운 렌더링
+ * - done: 최종 메시지(유사 질문, 피드백 버튼 포함)로 교체
+ * 첫 토큰 전에 실패하면 예외 → 호출 측에서 /api/ask로 폴백
+ * 토큰을 보여준 뒤 실패하면 부분 답변을 남기고 오류만 표시 (다시 묻지 않음 → LLM/레이트리밋 중복 방지)
+ */
+async function streamAnswer(question, loadingId, startTime) {
+    const response = await fetch('/api/ask/stream', {
+        method: 'POST',
+        headers: authHeaders(),
+        body: JSON.stringify({
+            question: question,
+            user_id: currentUser ? currentUser.employee_id : null
+        })
+    });
+    
+    if (!response.ok || !response.body) {
+        throw new Error(`HTTP ${response.status}`);
+    }
+    
+    const chatMessages = document.getElementById('chatMessages');
+    const userQuestion = window.lastUserQuestion || '';
+    let retrieval = { category: null, related_questions: [] };
+    let messageDiv = null;
+    let renderer = null;
+    let finished = false;
+    let tokenShown = false;
+    
+    function ensureMessage() {
+        if (messageDiv) return;
+        removeLoading(loadingId);
+        messageDiv = createBotMessage('', '엔디(Endy)', null, [], retrieval.category, null, null, false, userQuestion);
+        renderer = createStreamingRenderer(messageDiv.querySelector('.answer-text'));
+        chatMessages.appendChild(messageDiv);
+        scrollToBottom();
+    }
+    
+    try {
+        await readServerSentEvents(response, (event, data) => {
+            const payload = JSON.parse(data);
+            
+            if (event === 'retrieval') {
+                retrieval = payload;
+                ensureMessage();
+            } else if (event === 'token') {
+                ensureMessage();
+                renderer.append(payload.text);
+                tokenShown = true;
+            } else if (event === 'done') {
+                finished = true;
+                const answer = renderer ? renderer.flush() : '';
+                const responseTime = ((Date.now() - startTime) / 1000).toFixed(2);
+                console.log(`⏱️ 응답 시간: ${responseTime}초 (첫 토큰 ${payload.ttft_ms}ms, trace ${payload.trace_id})`);
+                
+                ensureMessage();
+                messageDiv.replaceWith(createBotMessage(
+                    answer,
+                    '엔디(Endy)',
+                    null,
+                    retrieval.related_questions,
+                    retrieval.category,
+                    responseTime,
+                    Date.now(),
+                    false, // 스트리밍으로 이미 읽은 답변은 접지 않음
+                    userQuestion
+                ));
+                scrollToBottom();
+            } else if (event === 'error') {
+                throw new Error(payload.message);
+            }
+        });
+        
+        if (!finished) {
+            throw new Error('스트림이 완료되지 않았습니다');
+        }
+    } catch (error) {
+        if (!tokenShown) {
+            // 아직 답변을 보여주지 않았으면 말풍선 제거 후 폴백
+            if (messageDiv) messageDiv.remove();
+            throw error;
+        }
+        // 이미 읽은 부분 답변은 유지하고 오류만 표시
+        console.error('스트리밍 중단:', error);
+        renderer.flush();
+        addErrorMessage('답변을 받는 중 연결이 끊겼어요. 다시 시도해주세요.');
+    }
+}
+
+// SSE 응답 본문 파싱 (fetch + ReadableStream, 주석 줄은 하트비트라 무시)
+async function readServerSentEvents(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    try {
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const rawEvent = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                
+                let event = 'message';
+                const dataLines = [];
+                rawEvent.split('\n').forEach(line => {
+                    if (line.startsWith('event:')) {
+                        event = line.slice(6).trim();
+                    } else if (line.startsWith('data:')) {
+                        dataLines.push(line.slice(5).replace(/^ /, ''));
+                    }
+                });
+                
+                if (dataLines.length > 0) {
+                    onEvent(event, dataLines.join('\n'));
+                }
+            }
+        }
+    } catch (error) {
+        // 처리 중 오류 → 연결을 닫아 서버가 생성을 멈추도록
+        reader.cancel().catch(() => {});
+        throw error;
+    }
+}
+
+/**
+ * 스트리밍 마크다운 렌더러
+ * - 빈 줄(\n\n)로 끝난 블록은 한 번만 파싱해서 고정
+ * - 작성 중인 마지막 블록만 requestAnimationFrame마다 다시 파싱
+ */
+function createStreamingRenderer(element) {
+    let text = '';
+    let committed = 0;
+    let frame = null;
+    
+    const committedDiv = document.createElement('div');
+    const tailDiv = document.createElement('div');
+    element.innerHTML = '';
+    element.append(committedDiv, tailDiv);
+    
+    function render() {
+        frame = null;
+        const boundary = text.lastIndexOf('\n\n');
+        if (boundary >= committed) {
+            committedDiv.insertAdjacentHTML('beforeend', marked.parse(text.slice(committed, boundary)));
+            committed = boundary + 2;
+        }
+        tailDiv.innerHTML = marked.parse(text.slice(committed));
+        scrollToBottom();
+    }
+    
+    return {
+        append(chunk) {
+            text += chunk;
+            if (frame === null) {
+                frame = requestAnimationFrame(render);
+            }
+        },
+        flush() {
+            if (frame !== null) {
+                cancelAnimationFrame(frame);
+            }
+            render();
+            return text;
+        }
+    };
+}
+
 function askSampleQuestion(question) {
     const input = document.getElementById('questionInput');
     input.value = question;
@@ -414,7 +597,7 @@ async function addBotMessage(data, responseTime) {
         data.category,
         responseTime,
         data.question_id || Date.now(),
-        false, // 타이핑 효과 비활성화 (속도 최적화)
+        true, // 긴 답변은 접기
         userQuestion // 검색어 전달
     );
     
@@ -422,7 +605,7 @@ async function addBotMessage(data, responseTime) {
     scrollToBottom();
 }
 
-function createBotMessage(answer, department, link, relatedQuestions, category, responseTime, questionId, enableTyping = false, userQuestion = '') {
+function createBotMessage(answer, department, link, relatedQuestions, category, responseTime, questionId, collapsible = true, userQuestion = '') {
     const messageDiv = document.createElement('div');
     messageDiv.className = 'flex justify-start mb-3';
     
@@ -447,7 +630,7 @@ function createBotMessage(answer, department, link, relatedQuestions, category,
                 ${category ? `<span class="text-xs text-gray-500">·</span><span class="text-xs text-gray-500">${escapeHtml(category)}</span>` : ''}
             </div>
             
-            <div class="text-gray-800 text-[13px] leading-relaxed answer-text markdown-content" data-full-answer="${escapeHtml(renderedAnswer)}">${enableTyping ? '' : createCollapsibleAnswer(renderedAnswer)}</div>
+            <div class="text-gray-800 text-[13px] leading-relaxed answer-text markdown-content" data-full-answer="${escapeHtml(renderedAnswer)}">${collapsible ? createCollapsibleAnswer(renderedAnswer) : renderedAnswer}</div>
     `;
     
     if (link) {
@@ -832,58 +1015,8 @@ function escapeHtml(text) {
     return div.innerHTML;
 }
 
-// 타이핑 효과 (마크다운 지원)
-function typeWriter(element, text, speed = 5) {
-    return new Promise((resolve) => {
-        // 공백 최소화된 텍스트 변환
-        const cleanText = text
-            .replace(/\*\*(.*?)\*\*/g, '<strong>$1</strong>')
-            .replace(/\*(.*?)\*/g, '<em>$1</em>')
-            .replace(/^#{1,6}\s+/gm, '')
-            .replace(/\n\n+/g, '\n')  // 연속된 줄바꿈을 하나로
-            .replace(/\n/g, '<br>');
-        const renderedHTML = cleanText;
-        
-        // HTML에서 순수 텍스트 추출
-        const tempDiv = document.createElement('div');
-        tempDiv.innerHTML = renderedHTML;
-        const plainText = tempDiv.textContent || tempDiv.innerText;
-        
-        let i = 0;
-        element.textContent = '';
-        
-        function type() {
-            if (i < plainText.length) {
-                element.textContent += plainText.charAt(i);
-                i++;
-                scrollToBottom();
-                setTimeout(type, speed);
-            } else {
-                // 타이핑 완료 후 마크다운 렌더링 HTML 적용
-                element.innerHTML = renderedHTML;
-                scrollToBottom();
-                resolve();
-            }
-        }
-        
-        type();
-    });
-}
-
 // ==================== 자동완성 ====================
 
-async function loadAllFAQs() {
-    try {
-        const response = await fetch('/api/questions');
-        const data = await response.json();
-        if (data.success) {
-            allFAQs = data.questions;
-        }
-    } catch (error) {
-        console.error('FAQ 로드 오류:', error);
-    }
-}
-
 function initAutocomplete() {
     const input = document.getElementById('questionInput');
     const autocompleteList = document.getElementById('autocompleteList');
@@ -898,21 +1031,27 @@ function initAutocomplete() {
         };
     }
     
-    // 자동완성 검색
+    let latestRequest = 0;
+    
+    // 자동완성 검색 (서버 트라이, 초성 검색 지원)
     const searchAutocomplete = debounce(async (query) => {
-        if (query.length < 2) {
+        if (query.trim().length < 1) {
             autocompleteList.classList.add('hidden');
             return;
         }
         
-        // 매칭되는 질문 찾기 (카테고리 필터 적용)
-        const matches = allFAQs.filter(faq => {
-            const questionLower = faq.question.toLowerCase();
-            const queryLower = query.toLowerCase();
-            const matchesQuery = questionLower.includes(queryLower);
-            const matchesCategory = selectedCategory === 'all' || faq.category === selectedCategory;
-            return matchesQuery && matchesCategory;
-        }).slice(0, 5); // 최대 5개
+        // 늦게 도착한 이전 응답은 무시
+        const requestId = ++latestRequest;
+        let matches = [];
+        try {
+            const params = new URLSearchParams({ q: query, limit: 5, category: selectedCategory });
+            const response = await fetch(`/api/suggest?${params}`);
+            if (!response.ok) throw new Error(`HTTP ${response.status}`);
+            matches = (await response.json()).suggestions;
+        } catch (error) {
+            console.error('자동완성 조회 오류:', error);
+        }
+        if (requestId !== latestRequest) return;
         
         if (matches.length === 0) {
             autocompleteList.classList.add('hidden');
@@ -920,14 +1059,14 @@ function initAutocomplete() {
         }
         
         // 자동완성 목록 생성
-        autocompleteList.innerHTML = matches.map((faq, index) => `
+        autocompleteList.innerHTML = matches.map((item, index) => `
             <div class="autocomplete-item px-4 py-3 hover:bg-gray-50 cursor-pointer border-b last:border-b-0 transition"
                  data-index="${index}"
-                 data-question="${escapeHtml(faq.question)}">
+                 data-question="${escapeHtml(item.text)}">
                 <div class="flex items-center justify-between">
                     <div class="flex-1">
-                        <span class="text-sm text-gray-800">${highlightMatch(faq.question, query)}</span>
-                        <span class="text-xs text-gray-500 ml-2">· ${escapeHtml(faq.category)}</span>
+                        <span class="text-sm text-gray-800">${highlightMatch(item.text, query)}</span>
+                        <span class="text-xs text-gray-500 ml-2">· ${escapeHtml(item.category)}</span>
                     </div>
                     <svg class="w-4 h-4 text-gray-400" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                         <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M13 7l5 5m0 0l-5 5m5-5H6"></path>
@@ -946,7 +1085,7 @@ function initAutocomplete() {
                 input.focus();
             });
         });
-    }, 300);
+    }, 120);
     
     // 입력 이벤트
     input.addEventListener('input', (e) => {
@@ -1000,7 +1139,9 @@ function initAutocomplete() {
 }
 
 function highlightMatch(text, query) {
-    const regex = new RegExp(`(${query})`, 'gi');
+    const escaped = escapeHtml(query.trim()).replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+    if (!escaped) return escapeHtml(text);
+    const regex = new RegExp(`(${escaped})`, 'gi');
     return escapeHtml(text).replace(regex, '<mark class="bg-yellow-200 font-medium">$1</mark>');
 }
 
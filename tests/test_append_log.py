@@ -0,0 +1,47 @@
+"""
+세그먼트 로그 희소 인덱스 회귀 테스트
+인덱스 파일은 fsync 없이 추가되므로 잘린 마지막 줄을 유효한 오프셋으로 받아들이면 안 됨
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.append_log import INDEX_SUFFIX, SegmentedLog  # noqa: E402
+
+
+def _index_file(directory):
+    return next(p for p in directory.iterdir() if p.name.endswith(INDEX_SUFFIX))
+
+
+def test_torn_index_line_is_rebuilt(tmp_path):
+    log = SegmentedLog(str(tmp_path), index_interval=4)
+    log.append_batch([{"i": i} for i in range(10)])
+
+    index_file = _index_file(tmp_path)
+    lines = index_file.read_text().splitlines()
+    seq, offset = lines[-1].split()
+    index_file.write_text("\n".join(lines[:-1] + [f"{seq} {offset[:1]}"]))  # "8 232" → "8 2" (줄바꿈 없음)
+
+    reopened = SegmentedLog(str(tmp_path), index_interval=4)
+    assert reopened.next_seq == 10
+    assert [record["i"] for _, record in reopened.read(8, 10)] == [8, 9]
+
+    assert reopened.append_batch([{"i": 10}]) == [10]
+    assert [seq for seq, _ in reopened.read(0, 100)] == list(range(11))
+    assert SegmentedLog(str(tmp_path), index_interval=4).next_seq == 11
+
+
+def test_index_offset_must_point_at_its_record(tmp_path):
+    log = SegmentedLog(str(tmp_path), index_interval=4)
+    log.append_batch([{"i": i} for i in range(10)])
+
+    index_file = _index_file(tmp_path)
+    lines = index_file.read_text().splitlines()
+    seq, _ = lines[-1].split()
+    _, wrong_offset = lines[-2].split()
+    index_file.write_text("\n".join(lines[:-1] + [f"{seq} {int(wrong_offset) + 1}"]) + "\n")
+
+    reopened = SegmentedLog(str(tmp_path), index_interval=4)
+    assert reopened.next_seq == 10
+    assert [seq for seq, _ in reopened.read(4, 100)] == list(range(4, 10))
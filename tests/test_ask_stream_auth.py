@@ -0,0 +1,60 @@
+"""
+로그인 사용자의 질문 API 회귀 테스트
+get_current_user는 User 모델(딕셔너리 아님)을 반환 → 엔드포인트가 속성으로 읽어야 함
+"""
+import asyncio
+import os
+import sys
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from models import AnswerResponse, User  # noqa: E402
+
+
+USER = User(employee_id="E1001", name="홍길동", department="IT팀")
+
+
+class StubAnswerService:
+    """검색/LLM 없이 고정 답변을 주는 답변 서비스"""
+
+    def process_question(self, question):
+        return AnswerResponse(
+            answer="답변", department="엔디(Endy)", category="HR",
+            confidence_score=0.9, response_time=0.0
+        )
+
+    async def process_question_stream(self, question):
+        yield "retrieval", {"category": "HR", "category_id": None, "section": None,
+                            "contact": None, "related_questions": []}
+        yield "token", "답변"
+
+
+def _post(path, payload, headers):
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(path, json=payload, headers=headers)
+    return asyncio.run(run())
+
+
+def _login(monkeypatch):
+    monkeypatch.setattr(main, "answer_service", StubAnswerService())
+    monkeypatch.setattr(main.auth_manager, "get_current_user", lambda token: USER if token else None)
+
+
+def test_stream_with_logged_in_user(monkeypatch):
+    _login(monkeypatch)
+    response = _post("/api/ask/stream", {"question": "연차 신청"}, {"Authorization": "Bearer token"})
+    assert response.status_code == 200
+    assert "event: retrieval" in response.text
+    assert "event: done" in response.text
+
+
+def test_ask_with_logged_in_user(monkeypatch):
+    _login(monkeypatch)
+    response = _post("/api/ask", {"question": "연차 신청"}, {"Authorization": "Bearer token"})
+    assert response.status_code == 200
+    assert response.json()["answer"] == "답변"
@@ -0,0 +1,27 @@
+"""
+If-None-Match 비교 테스트 (부분 문자열이 아닌 엔티티 태그 단위 비교)
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import etag_matches  # noqa: E402
+
+ETAG = '"0123456789abcdef0123"'
+
+
+def test_exact_and_list_match():
+    assert etag_matches(ETAG, ETAG)
+    assert etag_matches(f'"other", {ETAG}', ETAG)
+    assert etag_matches(f'W/{ETAG}', ETAG)
+    assert etag_matches("*", ETAG)
+
+
+def test_substring_does_not_match():
+    assert not etag_matches(None, ETAG)
+    assert not etag_matches("", ETAG)
+    assert not etag_matches('"x0123456789abcdef0123x"', ETAG)
+    assert not etag_matches(f'"prefix {ETAG[1:-1]}"', ETAG)
+    assert not etag_matches(ETAG[1:-1], ETAG)  # 따옴표 없는 잘못된 형식
+    assert not etag_matches(f'{ETAG}*', ETAG)
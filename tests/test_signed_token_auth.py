@@ -0,0 +1,54 @@
+"""
+서명 토큰 인증 회귀 테스트
+- stateful 모드에서는 서명 토큰을 받지 않음
+- 토큰의 관리자 역할은 저장소의 현재 역할로 다시 확인
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import auth  # noqa: E402
+from auth import AuthManager, auth_manager  # noqa: E402
+from config.settings import DEFAULT_SECRET_KEY  # noqa: E402
+from models import User  # noqa: E402
+from utils.auth import UserRole, check_permission  # noqa: E402
+
+
+def _forged_admin_token(employee_id="E1001"):
+    token, _ = auth_manager.token_codec.issue(
+        {"sub": employee_id, "name": "홍길동", "dept": "IT팀", "email": None, "role": "admin"},
+        ttl_seconds=3600
+    )
+    return token
+
+
+def test_stateful_mode_rejects_signed_tokens(monkeypatch):
+    monkeypatch.setattr(auth_manager, "token_mode", "stateful")
+    token = _forged_admin_token()
+    assert auth_manager.get_current_user(token) is None
+    assert auth_manager.logout(token) is False
+
+
+def test_admin_claim_is_checked_against_repository(monkeypatch):
+    monkeypatch.setattr(auth_manager, "token_mode", "signed")
+    stored = {"E1001": User(employee_id="E1001", name="홍길동", department="IT팀", role="user")}
+    monkeypatch.setattr(auth.db, "get_user_by_employee_id", lambda employee_id: stored.get(employee_id))
+
+    user = auth_manager.get_current_user(_forged_admin_token("E1001"))
+    assert user.role == "user"
+    assert not check_permission(user, UserRole.ADMIN)
+
+    assert auth_manager.get_current_user(_forged_admin_token("E9999")).role == "user"
+
+    stored["E1001"] = User(employee_id="E1001", name="홍길동", department="IT팀", role="admin")
+    assert check_permission(auth_manager.get_current_user(_forged_admin_token("E1001")), UserRole.ADMIN)
+
+
+def test_signed_mode_requires_secret_key(monkeypatch):
+    monkeypatch.setattr(auth.settings, "SESSION_TOKEN_MODE", "signed")
+    monkeypatch.setattr(auth.settings, "SECRET_KEY", DEFAULT_SECRET_KEY)
+    with pytest.raises(RuntimeError):
+        AuthManager()
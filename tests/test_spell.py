@@ -0,0 +1,46 @@
+"""
+오타 교정 회귀 테스트
+사전 단어는 끝 글자가 조사처럼 보여도 그대로 유지되어야 함 (하계휴가 → 하계휴가가 X)
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.spell import SpellCorrector  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _startup_vocabulary():
+    """startup_event와 같은 재료 (메타데이터 키워드 + FAQ 키워드)"""
+    vocabulary = ["하계휴가", "유급휴가", "와이파이", "시간외근로"]
+    with open(os.path.join(ROOT, "data", "faq_data.json"), encoding="utf-8") as f:
+        vocabulary += [keyword for faq in json.load(f)["faqs"] for keyword in faq.get("keywords", [])]
+    try:
+        with open(os.path.join(ROOT, "data", "documents_metadata.json"), encoding="utf-8") as f:
+            categories = json.load(f).get("categories", {})
+        vocabulary += [keyword for info in categories.values() for keyword in info.get("keywords", [])]
+    except (OSError, ValueError):
+        pass
+    return vocabulary
+
+
+def test_dictionary_words_round_trip():
+    corrector = SpellCorrector()
+    corrector.build(_startup_vocabulary())
+    changed = {
+        original: corrector.correct_token(original)
+        for original, _ in corrector._words.values()
+        if corrector.correct_token(original) != original
+    }
+    assert changed == {}
+
+
+def test_josa_handling():
+    corrector = SpellCorrector()
+    corrector.build(["연차", "하계휴가", "네트워크"])
+    assert corrector.correct_token("연챠를") == "연차를"
+    assert corrector.correct_token("네트워크가") == "네트워크가"
+    assert corrector.correct_text("하계휴가 신청") == "하계휴가 신청"
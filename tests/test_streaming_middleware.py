@@ -0,0 +1,81 @@
+"""
+스트리밍 전달 테스트 (SSE)
+실제 미들웨어 스택(main.app)으로 /api/ask/stream을 호출해
+보안 헤더가 붙는지, 토큰 청크가 생성 즉시 send까지 전달되는지(버퍼링 없음) 확인
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+CHUNKS = 4
+INTERVAL = 0.2
+
+
+class SlowStreamAnswerService:
+    """토큰을 INTERVAL 간격으로 내보내는 답변 서비스"""
+
+    async def process_question_stream(self, question):
+        yield "retrieval", {"category": "HR", "category_id": None, "section": None,
+                            "contact": None, "related_questions": []}
+        for i in range(CHUNKS):
+            await asyncio.sleep(INTERVAL)
+            yield "token", f"청크{i}"
+
+
+async def _call_stream(app):
+    """ASGI 앱 직접 호출 → (응답 헤더, [(도착 시각, 본문)])"""
+    body = json.dumps({"question": "연차 신청"}).encode("utf-8")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": "/api/ask/stream", "raw_path": b"/api/ask/stream", "root_path": "",
+        "query_string": b"", "headers": [(b"host", b"test"), (b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 12345), "server": ("127.0.0.1", 8000),
+    }
+    disconnect = asyncio.Event()
+    headers = {}
+    arrivals = []
+    started = time.perf_counter()
+    request_sent = False
+
+    async def receive():
+        # 실제 서버처럼 본문 이후의 receive는 연결 종료까지 대기
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            headers.update({k.decode(): v.decode() for k, v in message["headers"]})
+        elif message["type"] == "http.response.body":
+            if message.get("body"):
+                arrivals.append((time.perf_counter() - started, message["body"].decode("utf-8")))
+            if not message.get("more_body", False):
+                disconnect.set()
+
+    await app(scope, receive, send)
+    return headers, arrivals
+
+
+def test_stream_has_security_headers_and_is_not_buffered(monkeypatch):
+    monkeypatch.setattr(main, "answer_service", SlowStreamAnswerService())
+    headers, arrivals = asyncio.run(_call_stream(main.app))
+
+    assert headers["content-type"].startswith("text/event-stream")
+    assert headers["x-content-type-options"] == "nosniff"
+    assert headers["x-frame-options"] == "DENY"
+
+    # i번째 토큰은 약 (i + 1) * INTERVAL 시점에 도착해야 함 (한꺼번에 도착하면 버퍼링된 것)
+    token_times = [t for t, chunk in arrivals if "event: token" in chunk]
+    assert len(token_times) == CHUNKS
+    for i, t in enumerate(token_times):
+        assert abs(t - (i + 1) * INTERVAL) < INTERVAL / 2
+    assert any("event: done" in chunk for _, chunk in arrivals)
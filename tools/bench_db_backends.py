@@ -0,0 +1,192 @@
+"""
+저장소 백엔드 벤치마크 (JSON 로그 vs SQLite)
+피드백 행 수별로 연산당 지연 시간(중앙값/p95)을 측정합니다.
+
+측정 연산:
+- add_feedback / add_detailed_feedback (쓰기 1건, 커밋 포함)
+- get_detailed_feedbacks (중간 커서에서 50건 페이지)
+- get_feedback_stats (전체, daily)
+- get_user_by_employee_id / get_faq_by_id
+
+사용법:
+    python tools/bench_db_backends.py --sizes 10000,100000,1000000 --ops 200
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config.settings import settings  # noqa: E402
+from models import FAQItem, User, Feedback, DetailedFeedback  # noqa: E402
+
+REASONS = ["정확하지 않음", "도움이 안됨", "너무 김", "최신 정보 아님"]
+SECTIONS = [f"섹션 {i}" for i in range(50)]
+
+
+def make_rows(count: int):
+    """피드백/상세 피드백 레코드 생성 (최근 60일에 분산)"""
+    now = datetime.now()
+    rng = random.Random(42)
+    feedbacks, detailed = [], []
+    for i in range(count):
+        timestamp = (now - timedelta(minutes=rng.randrange(60 * 24 * 60))).isoformat()
+        feedbacks.append({
+            "question_id": i,
+            "user_question": f"테스트 질문 {i}",
+            "is_helpful": rng.random() < 0.7,
+            "user_id": f"2024{i % 500:03d}",
+            "timestamp": timestamp,
+            "comment": None
+        })
+        detailed.append({
+            "question_id": i,
+            "user_question": f"테스트 질문 {i}",
+            "is_helpful": False,
+            "reasons": rng.sample(REASONS, rng.randint(1, 2)),
+            "comment": None,
+            "user_id": f"2024{i % 500:03d}",
+            "user_name": "테스트",
+            "matched_section": rng.choice(SECTIONS),
+            "timestamp": timestamp,
+            "id": f"fb_{i}"
+        })
+    return feedbacks, detailed
+
+
+def seed_json(feedbacks, detailed):
+    """JSON 백엔드 로그에 직접 적재"""
+    from utils.append_log import SegmentedLog
+
+    batch = 10000
+    for name, rows in (("feedbacks", feedbacks), ("detailed_feedbacks", detailed)):
+        log = SegmentedLog(os.path.join(settings.FEEDBACK_LOG_DIR, name),
+                           segment_max_bytes=settings.FEEDBACK_LOG_SEGMENT_BYTES)
+        for i in range(0, len(rows), batch):
+            log.append_batch(rows[i:i + batch])
+
+
+def seed_sqlite(repo, feedbacks, detailed):
+    """SQLite 테이블에 직접 적재"""
+    import json
+
+    with repo.pool.connection() as conn:
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT INTO feedbacks (user_id, question_id, user_question, is_helpful, comment, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(f["user_id"], f["question_id"], f["user_question"], int(f["is_helpful"]), f["comment"], f["timestamp"])
+             for f in feedbacks]
+        )
+        conn.executemany(
+            "INSERT INTO detailed_feedbacks (id, user_id, user_name, question_id, user_question, is_helpful, "
+            "reasons, comment, matched_section, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(i + 1, d["user_id"], d["user_name"], d["question_id"], d["user_question"], 0,
+              json.dumps(d["reasons"], ensure_ascii=False), d["comment"], d["matched_section"], d["timestamp"])
+             for i, d in enumerate(detailed)]
+        )
+        conn.executemany(
+            "INSERT INTO detailed_feedback_reasons (feedback_id, reason, created_at) VALUES (?, ?, ?)",
+            [(i + 1, reason, d["timestamp"]) for i, d in enumerate(detailed) for reason in d["reasons"]]
+        )
+        conn.commit()
+
+
+def seed_reference(repo):
+    """사용자/FAQ 소량 적재"""
+    for i in range(500):
+        repo.add_user(User(employee_id=f"2024{i:03d}", name=f"사용자{i}", department="개발팀"))
+    for i in range(200):
+        repo.add_faq(FAQItem(id=i, category=["HR", "IT"][i % 2], question=f"질문 {i}",
+                             main_answer="답변", keywords=["테스트"], department="P&C팀"))
+
+
+def measure(fn, ops: int):
+    """연산 ops회 실행 → (중앙값 ms, p95 ms)"""
+    samples = []
+    for i in range(ops):
+        t0 = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def bench_backend(backend: str, size: int, ops: int, rows):
+    feedbacks, detailed = rows
+    t0 = time.perf_counter()
+
+    if backend == "json":
+        seed_json(feedbacks, detailed)
+        from database import Database
+        repo = Database()
+        seed_reference(repo)
+    else:
+        from database_sqlite import SQLiteDatabase
+        repo = SQLiteDatabase(settings.SQLITE_PATH)
+        seed_sqlite(repo, feedbacks, detailed)
+        seed_reference(repo)
+    open_seconds = time.perf_counter() - t0
+
+    # 첫 통계 조회는 집계 재구축/캐시 워밍을 포함하므로 별도 기록
+    t0 = time.perf_counter()
+    repo.get_feedback_stats()
+    first_stats_ms = (time.perf_counter() - t0) * 1000
+
+    middle = size // 2
+    results = {
+        "add_feedback": measure(lambda i: repo.add_feedback(
+            Feedback(question_id=i, user_question="벤치 질문", is_helpful=i % 2 == 0)), ops),
+        "add_detailed_feedback": measure(lambda i: repo.add_detailed_feedback(
+            DetailedFeedback(question_id=i, user_question="벤치 질문", reasons=[REASONS[i % 4]],
+                             matched_section=SECTIONS[i % 50])), ops),
+        "get_detailed_page": measure(lambda i: repo.get_detailed_feedbacks(50, middle + i), ops),
+        "get_feedback_stats": measure(lambda i: repo.get_feedback_stats(), ops),
+        "get_feedback_stats_daily": measure(lambda i: repo.get_feedback_stats("daily"), ops),
+        "get_user": measure(lambda i: repo.get_user_by_employee_id(f"2024{i % 500:03d}"), ops),
+        "get_faq": measure(lambda i: repo.get_faq_by_id(i % 200), ops),
+    }
+    repo.close()
+    return open_seconds, first_stats_ms, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="저장소 백엔드 벤치마크")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="피드백 행 수 (쉼표 구분, 각 테이블)")
+    parser.add_argument("--ops", type=int, default=200, help="연산당 반복 횟수")
+    parser.add_argument("--backends", default="json,sqlite")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    backends = args.backends.split(",")
+
+    print("=" * 80)
+    print(f"🗄️  저장소 백엔드 벤치마크: sizes={sizes}, ops={args.ops}")
+    print("=" * 80)
+
+    original_cwd = os.getcwd()
+    for size in sizes:
+        rows = make_rows(size)
+        for backend in backends:
+            with tempfile.TemporaryDirectory() as directory:
+                # 기본 상대 경로(data/...)가 임시 디렉토리를 가리키도록 이동
+                os.chdir(directory)
+                os.makedirs("data", exist_ok=True)
+                try:
+                    open_seconds, first_stats_ms, results = bench_backend(backend, size, args.ops, rows)
+                finally:
+                    os.chdir(original_cwd)
+
+            print(f"\n[{backend:6}] rows={size:,}  적재+열기={open_seconds:.1f}s  첫 통계={first_stats_ms:.1f}ms")
+            for name, (median, p95) in results.items():
+                print(f"   {name:26} median={median:8.3f}ms  p95={p95:8.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+파일 잠금 경합 벤치마크
+동시 쓰기 프로세스가 있을 때 읽기 처리량을 측정합니다.
+
+- legacy: 기존 O_CREAT|O_EXCL 잠금 파일 + 10ms 스핀 대기 (읽기도 배타 잠금)
+- flock: utils.file_lock (읽기 공유 잠금, 쓰기 배타 잠금 + 원자적 교체)
+
+사용법:
+    python tools/bench_db_locking.py --readers 4 --writers 2 --seconds 5 --write-rate 20
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.file_lock import FileLock, atomic_write_json  # noqa: E402
+
+
+# ==================== 기존 방식 (비교용) ====================
+
+def legacy_acquire(file_path: str, timeout: float = 5.0) -> bool:
+    lock_file = f"{file_path}.lock"
+    start_time = time.time()
+    while True:
+        try:
+            fd = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            os.write(fd, str(os.getpid()).encode())
+            os.close(fd)
+            return True
+        except FileExistsError:
+            if time.time() - start_time > timeout:
+                return False
+            time.sleep(0.01)
+
+
+def legacy_release(file_path: str):
+    try:
+        os.remove(f"{file_path}.lock")
+    except FileNotFoundError:
+        pass
+
+
+def legacy_read(file_path: str) -> bool:
+    if not legacy_acquire(file_path):
+        return False
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            json.load(f)
+        return True
+    finally:
+        legacy_release(file_path)
+
+
+def legacy_update(file_path: str) -> bool:
+    if not legacy_acquire(file_path):
+        return False
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        data["counter"] = data.get("counter", 0) + 1
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        return True
+    finally:
+        legacy_release(file_path)
+
+
+# ==================== 새 방식 ====================
+
+def flock_read(file_path: str) -> bool:
+    lock = FileLock(file_path, shared=True)
+    if not lock.acquire():
+        return False
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            json.load(f)
+        return True
+    finally:
+        lock.release()
+
+
+def flock_update(file_path: str) -> bool:
+    lock = FileLock(file_path)
+    if not lock.acquire():
+        return False
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        data["counter"] = data.get("counter", 0) + 1
+        atomic_write_json(file_path, data)
+        return True
+    finally:
+        lock.release()
+
+
+MODES = {
+    "legacy": (legacy_read, legacy_update),
+    "flock": (flock_read, flock_update),
+}
+
+
+# ==================== 워커 ====================
+
+def reader_worker(mode: str, file_path: str, seconds: float, start_event, results):
+    read_fn, _ = MODES[mode]
+    start_event.wait()
+    deadline = time.perf_counter() + seconds
+    ok = failed = 0
+    worst = 0.0
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        if read_fn(file_path):
+            ok += 1
+        else:
+            failed += 1
+        worst = max(worst, time.perf_counter() - t0)
+    results.put(("read", ok, failed, worst))
+
+
+def writer_worker(mode: str, file_path: str, seconds: float, write_rate: float, start_event, results):
+    _, update_fn = MODES[mode]
+    interval = 1.0 / write_rate if write_rate > 0 else 0.0
+    start_event.wait()
+    deadline = time.perf_counter() + seconds
+    ok = failed = 0
+    worst = 0.0
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        if update_fn(file_path):
+            ok += 1
+        else:
+            failed += 1
+        elapsed = time.perf_counter() - t0
+        worst = max(worst, elapsed)
+        # 같은 쓰기 부하에서 비교하도록 쓰기 속도 제한
+        if interval > elapsed:
+            time.sleep(interval - elapsed)
+    results.put(("write", ok, failed, worst))
+
+
+def make_dataset(directory: str, faq_count: int) -> str:
+    """벤치마크용 FAQ 파일 생성"""
+    file_path = os.path.join(directory, "faq_data.json")
+    faqs = [
+        {
+            "id": i,
+            "category": ["HR", "IT", "총무", "복리후생"][i % 4],
+            "question": f"테스트 질문 {i}번은 무엇인가요?",
+            "main_answer": "테스트 답변입니다. " * 20,
+            "keywords": ["테스트", "질문", str(i)],
+            "department": "P&C팀",
+            "link": None
+        }
+        for i in range(faq_count)
+    ]
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump({"faqs": faqs}, f, ensure_ascii=False, indent=2)
+    return file_path
+
+
+def run(mode: str, readers: int, writers: int, seconds: float, faq_count: int, write_rate: float) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = make_dataset(directory, faq_count)
+        start_event = mp.Event()
+        results = mp.Queue()
+
+        procs = [mp.Process(target=reader_worker, args=(mode, file_path, seconds, start_event, results))
+                 for _ in range(readers)]
+        procs += [mp.Process(target=writer_worker, args=(mode, file_path, seconds, write_rate, start_event, results))
+                  for _ in range(writers)]
+        for p in procs:
+            p.start()
+        start_event.set()
+
+        collected = [results.get() for _ in procs]
+        for p in procs:
+            p.join()
+
+    summary = {"reads": 0, "read_failures": 0, "read_worst_ms": 0.0,
+               "writes": 0, "write_failures": 0, "write_worst_ms": 0.0}
+    for kind, ok, failed, worst in collected:
+        summary[f"{kind}s"] += ok
+        summary[f"{kind}_failures"] += failed
+        summary[f"{kind}_worst_ms"] = max(summary[f"{kind}_worst_ms"], worst * 1000)
+    summary["reads_per_sec"] = summary["reads"] / seconds
+    summary["writes_per_sec"] = summary["writes"] / seconds
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="파일 잠금 경합 벤치마크")
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--faqs", type=int, default=200, help="FAQ 항목 수 (파일 크기)")
+    parser.add_argument("--write-rate", type=float, default=20.0, help="쓰기 프로세스당 초당 쓰기 수 (0이면 제한 없음)")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"🔒 파일 잠금 벤치마크: 읽기 {args.readers}개, 쓰기 {args.writers}개 프로세스 "
+          f"(프로세스당 {args.write_rate}회/초), {args.seconds}초")
+    print("=" * 80)
+
+    for mode in MODES:
+        for writers in (0, args.writers):
+            r = run(mode, args.readers, writers, args.seconds, args.faqs, args.write_rate)
+            print(
+                f"[{mode:6}] writers={writers}  "
+                f"reads/s={r['reads_per_sec']:9.1f}  read_fail={r['read_failures']:4d}  "
+                f"read_worst={r['read_worst_ms']:7.1f}ms  "
+                f"writes/s={r['writes_per_sec']:7.1f}  write_fail={r['write_failures']:4d}"
+            )
+
+
+if __name__ == "__main__":
+    main()
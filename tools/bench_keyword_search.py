@@ -0,0 +1,85 @@
+"""
+키워드 검색(SearchEngine) 지연 벤치마크
+기존 방식(FAQ마다 SequenceMatcher + Jaccard 계산)과 n-gram BM25 색인을 FAQ 수를 늘려가며 비교합니다.
+
+--scale N: FAQ를 N배로 복제(번호 부여)
+
+사용법:
+    python tools/bench_keyword_search.py --scale 100
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from difflib import SequenceMatcher
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from config.settings import settings  # noqa: E402
+from models import FAQItem  # noqa: E402
+from search_engine import SearchEngine  # noqa: E402
+
+
+def legacy_search(question, faqs, top_k=5):
+    """기존 전수 비교 방식 (키워드 점수 70% + 텍스트 유사도 30%) - 비교용"""
+    question_lower = question.lower()
+    question_words = {w for w in question_lower.split() if len(w) > 1}
+    results = []
+    for faq in faqs:
+        keywords = {k.lower() for k in faq.keywords}
+        if question_lower in faq.question.lower() or question_lower in faq.main_answer.lower():
+            keyword_score = 1.0
+        elif any(question_lower in k or k in question_lower for k in keywords):
+            keyword_score = 0.8
+        else:
+            union = question_words | keywords | {w for w in faq.question.lower().split() if len(w) > 1}
+            keyword_score = len(question_words & keywords) / len(union) if union else 0.0
+        similarity = SequenceMatcher(None, question_lower, faq.question.lower()).ratio()
+        results.append((faq, keyword_score * 0.7 + similarity * 0.3))
+    results.sort(key=lambda x: x[1], reverse=True)
+    return results[:top_k]
+
+
+def measure(search, queries, faqs):
+    timings = []
+    for query in queries:
+        started = time.perf_counter()
+        search(query, faqs)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.99)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="키워드 검색 지연 벤치마크")
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    with open(settings.FAQ_FILE, "r", encoding="utf-8") as f:
+        base = [FAQItem(**faq) for faq in json.load(f)["faqs"]]
+    faqs = [
+        faq.model_copy(update={"id": i * 100000 + faq.id, "question": f"{faq.question} {i}" if i else faq.question})
+        for i in range(args.scale) for faq in base
+    ]
+    queries = [faq.question[:max(2, len(faq.question) // 2)] for faq in base] + \
+              [keyword for faq in base for keyword in faq.keywords[:2]]
+
+    engine = SearchEngine()
+    started = time.perf_counter()
+    engine.build_index(faqs)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    print("=" * 80)
+    print(f"🔎 키워드 검색 벤치마크: FAQ {len(faqs):,}개, 질의 {len(queries)}건, 색인 구축 {build_ms:.1f}ms")
+    print("=" * 80)
+    for name, search in (("기존(SequenceMatcher)", legacy_search), ("n-gram BM25 색인", engine.search)):
+        p50, p99 = measure(search, queries, faqs)
+        print(f"{name:<22} p50={p50:.3f}ms  p99={p99:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
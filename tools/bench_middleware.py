@@ -0,0 +1,137 @@
+"""
+미들웨어 오버헤드 벤치마크 (/liveness)
+ASGI 앱을 프로세스 안에서 직접 호출해 네트워크/서버 비용 없이 미들웨어 비용만 비교합니다.
+
+- none: 보안 헤더 미들웨어 없음 (CORS만)
+- http: 기존 @app.middleware("http") (BaseHTTPMiddleware)
+- asgi: utils.middleware.SecurityHeadersMiddleware
+
+사용법:
+    python tools/bench_middleware.py --requests 20000 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
+
+from utils.middleware import SecurityHeadersMiddleware  # noqa: E402
+
+
+def make_app(mode: str) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost:8000"],
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "DELETE"],
+        allow_headers=["Authorization", "Content-Type"],
+    )
+
+    if mode == "http":
+        @app.middleware("http")
+        async def add_security_headers(request: Request, call_next):
+            response = await call_next(request)
+            response.headers["X-Content-Type-Options"] = "nosniff"
+            response.headers["X-Frame-Options"] = "DENY"
+            response.headers["X-XSS-Protection"] = "1; mode=block"
+            response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+            return response
+    elif mode == "asgi":
+        app.add_middleware(SecurityHeadersMiddleware)
+
+    @app.get("/liveness")
+    async def liveness_check():
+        return {"alive": True}
+
+    return app
+
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/liveness",
+    "raw_path": b"/liveness",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [(b"host", b"localhost")],
+    "client": ("127.0.0.1", 12345),
+    "server": ("127.0.0.1", 8000),
+}
+
+
+async def call(app) -> int:
+    """요청 1건 → 상태 코드"""
+    status = 0
+    request_sent = False
+    response_done = asyncio.Event()
+
+    async def receive():
+        # 실제 서버처럼 본문 이후의 receive는 연결 종료까지 대기
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await response_done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body" and not message.get("more_body", False):
+            response_done.set()
+
+    await app(dict(SCOPE), receive, send)
+    return status
+
+
+async def run(app, total: int, concurrency: int) -> float:
+    """total건을 concurrency개 워커로 처리 → 초당 요청 수"""
+    # 라우터/미들웨어 스택 초기화
+    assert await call(app) == 200
+    remaining = total
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await call(app)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return total / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="미들웨어 오버헤드 벤치마크")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"🛡️  /liveness 미들웨어 벤치마크: {args.requests}건, 동시 {args.concurrency}, {args.rounds}회 중 최고")
+    print("=" * 80)
+
+    results = {}
+    for mode in ("none", "http", "asgi"):
+        app = make_app(mode)
+        results[mode] = max(asyncio.run(run(app, args.requests, args.concurrency)) for _ in range(args.rounds))
+        print(f"[{mode:4}] {results[mode]:10,.0f} req/s  (요청당 {1e6 / results[mode]:7.1f}µs)")
+
+    overhead_http = 1e6 / results["http"] - 1e6 / results["none"]
+    overhead_asgi = 1e6 / results["asgi"] - 1e6 / results["none"]
+    print(f"\n보안 헤더 미들웨어 요청당 추가 비용: http={overhead_http:.1f}µs, asgi={overhead_asgi:.1f}µs")
+
+
+if __name__ == "__main__":
+    main()
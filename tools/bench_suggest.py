@@ -0,0 +1,78 @@
+"""
+자동완성(/api/suggest) 조회 지연 벤치마크
+실제 FAQ/섹션 데이터로 인덱스를 만들고, 항목마다 한 글자씩 입력하는 상황(접두사, 초성)을 재현합니다.
+
+--scale N: 섹션 데이터를 N배로 복제(번호 부여)해 큰 인덱스에서도 지연이 일정한지 확인
+
+사용법:
+    python tools/bench_suggest.py --scale 100
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from config.settings import settings  # noqa: E402
+from models import FAQItem  # noqa: E402
+from services import AnswerService  # noqa: E402
+from services.llm_service import llm_service  # noqa: E402
+from services.suggest_service import SuggestService  # noqa: E402
+from utils.hangul import chosung  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="자동완성 조회 지연 벤치마크")
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args()
+
+    with open(settings.FAQ_FILE, "r", encoding="utf-8") as f:
+        faqs = [FAQItem(**faq) for faq in json.load(f)["faqs"]]
+    sections = AnswerService(llm_service=llm_service).get_section_questions()
+    if args.scale > 1:
+        sections = [
+            {**section, "title": f"{section['title']} {i}", "question": f"{section['question']} {i}"}
+            for i in range(args.scale) for section in sections
+        ] or [
+            {"category": faq.category, "title": f"{faq.question} {i}", "question": f"{faq.question} 질문 {i}"}
+            for i in range(args.scale) for faq in faqs
+        ]
+
+    service = SuggestService()
+    started = time.perf_counter()
+    service.rebuild(faqs, sections)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    # 키 입력마다 조회: 모든 항목의 접두사(글자 단위) + 초성 접두사
+    queries = []
+    for entry in service._index[0][:500]:
+        text = entry["text"]
+        queries.extend(text[:n] for n in range(1, len(text) + 1))
+        initials = chosung(text)
+        queries.extend(initials[:n] for n in range(1, min(len(initials), 6) + 1))
+
+    timings = []
+    hits = 0
+    for query in queries:
+        started = time.perf_counter()
+        result = service.suggest(query, args.limit)
+        timings.append((time.perf_counter() - started) * 1e6)
+        hits += bool(result)
+
+    timings.sort()
+    print("=" * 80)
+    print(f"🔎 자동완성 벤치마크: 항목 {service.size:,}개, 구축 {build_ms:.1f}ms")
+    print("=" * 80)
+    print(f"조회 {len(queries):,}건 (결과 있음 {hits / len(queries):.0%})")
+    print(f"p50={statistics.median(timings):.1f}µs  p99={timings[int(len(timings) * 0.99)]:.1f}µs  "
+          f"max={timings[-1]:.1f}µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+시맨틱 검색 모드별 정확도/상위 단계 전환율 평가 (dense vs hybrid vs hierarchical)
+저장된 RAG 인덱스(data/semantic_index_rag)의 청크로 평가 질의를 만들어 검색 방식을 비교합니다.
+
+평가 질의 (정답 = 해당 청크)
+- 질문형: 청크의 **질문:** 문장
+- 용어형: 청크 제목 (VDI, 프린터 IP처럼 정확한 토큰으로 묻는 경우)
+
+상위 단계 전환(escalation): 1위가 정답이 아니거나, AnswerService._is_clear_match 기준으로
+명확하지 않아 바로 답하지 못하는 경우 (drill-down/LLM 섹션 선택으로 넘어감)
+
+hierarchical: H2 중심 벡터로 카테고리를 고른 뒤 파티션 안에서만 검색 (search_hierarchical)
+
+사용법:
+    python tools/eval_hybrid_search.py
+    python tools/eval_hybrid_search.py --weight 0.5
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from config.settings import settings  # noqa: E402
+from semantic_search import SemanticSearchEngineRAG  # noqa: E402
+from services import AnswerService  # noqa: E402
+
+
+def build_queries(metadata):
+    """(질의 종류, 질의, 정답 청크 번호) 목록"""
+    queries = []
+    for idx, doc in enumerate(metadata):
+        if doc.get('question'):
+            queries.append(("질문형", doc['question'], idx))
+        if doc.get('title'):
+            queries.append(("용어형", doc['title'], idx))
+    return queries
+
+
+def evaluate(engine, queries, mode, answer_service):
+    """질의 종류별 (건수, 1위 정답 수, 전환 수)"""
+    stats = {}
+    for kind, query, expected in queries:
+        if mode == "hierarchical":
+            _, results = engine.search_hierarchical(query, top_k=20)
+        else:
+            results = engine.search(query, top_k=20, mode=mode)
+        hit = bool(results) and results[0][0] is engine.metadata[expected]
+        clear = bool(results) and answer_service._is_clear_match(results[0][1], results)
+        total, hits, escalations = stats.get(kind, (0, 0, 0))
+        stats[kind] = (total + 1, hits + hit, escalations + (not (hit and clear)))
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시맨틱 검색 dense/hybrid/hierarchical 비교")
+    parser.add_argument("--weight", type=float, default=settings.SEMANTIC_LEXICAL_WEIGHT,
+                        help="hybrid 어휘 점수 가중치")
+    args = parser.parse_args()
+    settings.SEMANTIC_LEXICAL_WEIGHT = args.weight
+
+    engine = SemanticSearchEngineRAG(settings.SEMANTIC_MODEL)
+    engine.load_index()
+    queries = build_queries(engine.metadata)
+    answer_service = AnswerService()
+
+    print("=" * 80)
+    print(f"📊 시맨틱 검색 평가: 청크 {len(engine.metadata)}개, 질의 {len(queries)}건, 어휘 가중치 {args.weight}")
+    print("=" * 80)
+    for mode in ("dense", "hybrid", "hierarchical"):
+        stats = evaluate(engine, queries, mode, answer_service)
+        total = sum(s[0] for s in stats.values())
+        hits = sum(s[1] for s in stats.values())
+        escalations = sum(s[2] for s in stats.values())
+        print(f"[{mode}] top-1 정확도 {hits / total:.1%}, 전환율 {escalations / total:.1%}")
+        for kind, (count, kind_hits, kind_escalations) in stats.items():
+            print(f"    {kind}: top-1 {kind_hits / count:.1%}, 전환율 {kind_escalations / count:.1%} ({count}건)")
+
+
+if __name__ == "__main__":
+    main()
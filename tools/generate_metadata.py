@@ -1,12 +1,22 @@
 """
 메타데이터 자동 생성 도구
 MD 파일의 H2/H3/H4 구조를 분석하여 세분화된 메타데이터 생성
+섹션별 다이제스트(노이즈/반복 제거, 토큰 수 포함)도 함께 생성해 data/section_digests.json에 저장
 """
+import os
 import re
+import sys
 import json
 from pathlib import Path
 from typing import List, Dict
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.doc_store import section_hash  # noqa: E402
+from utils.section_digest import (  # noqa: E402
+    count_tokens, digest_section, find_boilerplate, token_counter_name
+)
+
 # 카테고리별 담당자 정보
 CONTACT_INFO = {
     "근태 및 휴가": {
@@ -53,9 +63,20 @@ CATEGORY_MAPPING = {
 
 
 def parse_markdown_structure(file_path: Path) -> List[Dict]:
-    """MD 파일의 계층 구조 파싱"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
+    """
+    MD 파일의 계층 구조 파싱
+    
+    섹션마다 줄 범위와 함께 바이트 범위(start_byte/end_byte)와 content_hash를 기록합니다.
+    (런타임은 바이트 범위로 mmap 슬라이스를 읽고 해시로 문서 수정 여부를 확인)
+    """
+    raw = file_path.read_bytes()
+    raw_lines = raw.splitlines(keepends=True)
+    lines = [line.decode('utf-8') for line in raw_lines]
+    
+    # line_offsets[n] = n+1번째 줄의 시작 바이트 (마지막은 파일 크기)
+    line_offsets = [0]
+    for line in raw_lines:
+        line_offsets.append(line_offsets[-1] + len(line))
     
     sections = []
     current_h2 = None
@@ -133,6 +154,11 @@ def parse_markdown_structure(file_path: Path) -> List[Dict]:
             "end_line": len(lines)
         })
     
+    for section in sections:
+        section["start_byte"] = line_offsets[section["start_line"] - 1]
+        section["end_byte"] = line_offsets[section["end_line"]]
+        section["content_hash"] = section_hash(raw[section["start_byte"]:section["end_byte"]])
+    
     return sections
 
 
@@ -207,6 +233,9 @@ def generate_metadata() -> Dict:
                 "title": title,
                 "start_line": section.get("start_line"),
                 "end_line": section.get("end_line"),
+                "start_byte": section.get("start_byte"),
+                "end_byte": section.get("end_byte"),
+                "content_hash": section.get("content_hash"),
                 "keywords": keywords,
                 "contact": contact
             }
@@ -241,6 +270,9 @@ def generate_metadata() -> Dict:
                 "title": title,
                 "start_line": section.get("start_line"),
                 "end_line": section.get("end_line"),
+                "start_byte": section.get("start_byte"),
+                "end_byte": section.get("end_byte"),
+                "content_hash": section.get("content_hash"),
                 "keywords": keywords,
                 "contact": {
                     "team": "P&C팀",
@@ -255,6 +287,39 @@ def generate_metadata() -> Dict:
     return metadata
 
 
+def build_section_digests(metadata: Dict) -> Dict:
+    """
+    섹션별 다이제스트 생성
+    
+    원문은 메타데이터의 바이트 범위로 읽고, 상투 문구는 문서(파일)별로 찾습니다.
+    각 항목에 원문 content_hash를 기록해 문서가 바뀌면 런타임이 다이제스트를 쓰지 않습니다.
+    """
+    raw_sections = {}
+    for section_id, info in metadata["categories"].items():
+        raw = Path("docs", info["filename"]).read_bytes()
+        raw_sections[section_id] = raw[info["start_byte"]:info["end_byte"]].decode('utf-8')
+    
+    boilerplate = {}
+    for filename in {info["filename"] for info in metadata["categories"].values()}:
+        boilerplate[filename] = find_boilerplate(
+            text for section_id, text in raw_sections.items()
+            if metadata["categories"][section_id]["filename"] == filename
+        )
+    
+    sections = {}
+    for section_id, text in raw_sections.items():
+        info = metadata["categories"][section_id]
+        digest = digest_section(text, boilerplate[info["filename"]])
+        sections[section_id] = {
+            "content_hash": info["content_hash"],
+            "digest": digest,
+            "tokens_raw": count_tokens(text),
+            "tokens_digest": count_tokens(digest)
+        }
+    
+    return {"token_counter": token_counter_name(), "sections": sections}
+
+
 if __name__ == "__main__":
     print("="*80)
     print("🔧 메타데이터 자동 생성 시작")
@@ -281,6 +346,19 @@ if __name__ == "__main__":
     for cat, count in category_stats.items():
         print(f"  - {cat}: {count}개")
     
+    # 섹션 다이제스트 (LLM 프롬프트용)
+    digests = build_section_digests(metadata)
+    digest_path = Path("data/section_digests.json")
+    with open(digest_path, 'w', encoding='utf-8') as f:
+        json.dump(digests, f, ensure_ascii=False, indent=2)
+    
+    tokens_raw = sum(d["tokens_raw"] for d in digests["sections"].values())
+    tokens_digest = sum(d["tokens_digest"] for d in digests["sections"].values())
+    saved = (1 - tokens_digest / tokens_raw) if tokens_raw else 0.0
+    print(f"\n✅ 섹션 다이제스트 저장 완료: {digest_path}")
+    print(f"📉 프롬프트 토큰 합계 ({digests['token_counter']}): "
+          f"원문 {tokens_raw:,} → 다이제스트 {tokens_digest:,} ({saved:.1%} 감소)")
+    
     print("\n" + "="*80)
 
 
@@ -0,0 +1,149 @@
+"""
+대표 질문 답변 사전 생성 (배치)
+메타데이터 섹션마다 대표 질문(AnswerService._convert_to_natural_question)의 답변을 미리 만들어
+data/pregenerated_answers.json에 저장합니다. 서버는 시작 시 읽어 LLM 호출 전에 조회합니다.
+
+- 동시 요청 수 제한 (--concurrency)
+- 실패하면 지수 백오프로 재시도 (--retries)
+- 답변 하나가 끝날 때마다 원자적으로 저장 → 중단 후 다시 실행하면 남은 섹션만 생성
+- 답변마다 섹션 원문 content_hash 기록 → 문서가 바뀐 섹션은 서버가 무시하고 다음 실행 때 다시 생성
+
+사용법:
+    python tools/pregenerate_answers.py
+    python tools/pregenerate_answers.py --concurrency 8 --retries 5
+    python tools/pregenerate_answers.py --force   # 전체 다시 생성
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from services import AnswerService  # noqa: E402
+from services.llm_service import llm_service as llm  # noqa: E402
+from utils.file_lock import atomic_write_json  # noqa: E402
+
+OUTPUT_FILE = "data/pregenerated_answers.json"
+
+
+def load_progress(path):
+    """이전 실행 결과 (없으면 빈 딕셔너리)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("answers", {})
+
+
+def collect_jobs(llm, answer_service):
+    """질문 키 → (섹션 ID, 섹션 정보, 대표 질문) (같은 질문이 나오는 섹션은 먼저 나온 것만)"""
+    jobs = {}
+    skipped = 0
+    for section_id, info in llm.metadata.get("categories", {}).items():
+        title = (info.get("title") or "").strip()
+        if not title:
+            continue
+        if not info.get("content_hash") or info.get("start_byte") is None or info.get("end_byte") is None:
+            skipped += 1
+            continue
+        if not llm.doc_store.section_matches(info["filename"], info["start_byte"], info["end_byte"], info["content_hash"]):
+            print(f"⚠️  문서가 메타데이터와 맞지 않아 건너뜀: {section_id} ({title})")
+            continue
+
+        question = answer_service._convert_to_natural_question(title)
+        key = llm._get_cache_key(question)
+        if key in jobs:
+            print(f"⚠️  대표 질문 중복, 건너뜀: {section_id} → '{question}' ({jobs[key][0]}와 같음)")
+            continue
+        jobs[key] = (section_id, info, question)
+
+    if skipped:
+        print(f"⚠️  바이트 범위/해시가 없는 섹션 {skipped}개 건너뜀 - tools/generate_metadata.py로 다시 생성하세요")
+    return jobs
+
+
+def generate(llm, section_id, info, question, retries, backoff):
+    """답변 생성 (실패 시 지수 백오프 재시도, 모두 실패하면 마지막 예외 발생)"""
+    category_info = {"category_id": section_id, **info}
+    content = llm._load_section(category_info, prefer_digest=True)
+    for attempt in range(retries + 1):
+        try:
+            return llm._request_answer(question, content, category_info)
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = backoff * (2 ** attempt)
+            print(f"🔁 재시도 {attempt + 1}/{retries} ({section_id}, {delay:.1f}초 후): {e}")
+            time.sleep(delay)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대표 질문 답변 사전 생성")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 LLM 요청 수")
+    parser.add_argument("--retries", type=int, default=3, help="답변당 재시도 횟수")
+    parser.add_argument("--backoff", type=float, default=2.0, help="첫 재시도 대기 시간(초), 이후 2배씩")
+    parser.add_argument("--force", action="store_true", help="기존 답변을 무시하고 전체 다시 생성")
+    args = parser.parse_args()
+
+    if not llm.enabled:
+        print("❌ OPENAI_API_KEY가 필요합니다")
+        sys.exit(1)
+    answer_service = AnswerService(llm_service=llm)
+    jobs = collect_jobs(llm, answer_service)
+
+    # 이어하기: 질문/섹션/원문 해시가 그대로인 답변만 유지 (나머지는 다시 생성)
+    answers = {} if args.force else {
+        key: entry for key, entry in load_progress(OUTPUT_FILE).items()
+        if key in jobs
+        and entry.get("section_id") == jobs[key][0]
+        and entry.get("content_hash") == jobs[key][1]["content_hash"]
+    }
+    pending = [(key, job) for key, job in jobs.items() if key not in answers]
+
+    print("=" * 80)
+    print(f"🧾 대표 질문 {len(jobs)}개: 완료 {len(answers)}개, 생성 대상 {len(pending)}개 (동시 {args.concurrency}개)")
+    print("=" * 80)
+
+    started = time.perf_counter()
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as executor:
+        futures = {
+            executor.submit(generate, llm, section_id, info, question, args.retries, args.backoff): (key, section_id, info, question)
+            for key, (section_id, info, question) in pending
+        }
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                key, section_id, info, question = futures[future]
+                try:
+                    answer = future.result()
+                except Exception as e:
+                    failed += 1
+                    print(f"❌ [{done}/{len(pending)}] {section_id} 실패: {e}")
+                    continue
+                answers[key] = {
+                    "question": question,
+                    "section_id": section_id,
+                    "content_hash": info["content_hash"],
+                    "answer": answer,
+                    "generated_at": datetime.now().isoformat(timespec="seconds")
+                }
+                atomic_write_json(OUTPUT_FILE, {"answers": answers})
+                print(f"✅ [{done}/{len(pending)}] {section_id}: {question}")
+        except KeyboardInterrupt:
+            executor.shutdown(wait=False, cancel_futures=True)
+            print("\n⏸️  중단됨 - 다시 실행하면 남은 섹션부터 이어서 생성합니다")
+            raise
+
+    # 생성할 것이 없었어도 더 이상 유효하지 않은 항목은 정리
+    atomic_write_json(OUTPUT_FILE, {"answers": answers})
+    print("=" * 80)
+    print(f"💾 저장 완료: {OUTPUT_FILE} (답변 {len(answers)}개, 실패 {failed}개, {time.perf_counter() - started:.1f}초)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+"""
+추가 전용(append-only) 세그먼트 로그
+- JSONL 세그먼트 파일 (파일명 = 세그먼트 첫 seq), 크기 초과 시 새 세그먼트로 교체
+- 희소 오프셋 인덱스 (.idx): index_interval마다 (seq, 바이트 오프셋) 기록
+  → 임의 seq부터 읽기 비용이 전체 이력 크기와 무관
+- 그룹 커밋 writer: 백그라운드 스레드가 대기 중인 기록을 모아 한 번에 쓰고 fsync 1회
+"""
+import bisect
+import json
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from utils.file_lock import FileLock
+
+
+SEGMENT_SUFFIX = ".jsonl"
+INDEX_SUFFIX = ".idx"
+
+
+class _Segment:
+    """세그먼트 1개 (파일 경로, 첫 seq, 희소 인덱스)"""
+
+    def __init__(self, directory: Path, base_seq: int):
+        self.base_seq = base_seq
+        self.path = directory / f"{base_seq:020d}{SEGMENT_SUFFIX}"
+        self.index_path = directory / f"{base_seq:020d}{INDEX_SUFFIX}"
+        self.index_seqs: List[int] = []
+        self.index_offsets: List[int] = []
+        self.size = 0  # 커밋된(완전한 줄로 끝나는) 바이트 수
+        self.index_stale = False  # 인덱스 파일이 깨져 메모리에서 재구축함 (다음 추가 때 파일 다시 씀)
+
+    def add_index(self, seq: int, offset: int):
+        self.index_seqs.append(seq)
+        self.index_offsets.append(offset)
+
+    def seek(self, seq: int) -> Tuple[int, int]:
+        """seq 이하에서 가장 가까운 인덱스 항목 (seq, 오프셋)"""
+        pos = bisect.bisect_right(self.index_seqs, seq) - 1
+        if pos < 0:
+            return self.base_seq, 0
+        return self.index_seqs[pos], self.index_offsets[pos]
+
+
+class SegmentedLog:
+    """세그먼트 로그 (프로세스 간 추가는 디렉토리 잠금으로 직렬화)"""
+
+    def __init__(self, directory: str, segment_max_bytes: int = 8 * 1024 * 1024, index_interval: int = 64):
+        """
+        Args:
+            directory: 로그 디렉토리
+            segment_max_bytes: 세그먼트 최대 크기 (넘으면 새 세그먼트)
+            index_interval: 희소 인덱스 간격 (레코드 수)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes = segment_max_bytes
+        self.index_interval = index_interval
+
+        self._segments: List[_Segment] = []
+        self._next_seq = 0
+        self._lock = threading.RLock()
+        self._dir_lock_path = str(self.directory / "append")
+
+        with self._lock:
+            self._refresh()
+
+    # ==================== 상태 ====================
+
+    @property
+    def next_seq(self) -> int:
+        """다음에 부여될 seq (= 전체 레코드 수)"""
+        self._refresh_if_changed()
+        return self._next_seq
+
+    def __len__(self) -> int:
+        return self.next_seq
+
+    def _refresh_if_changed(self):
+        """다른 프로세스가 추가한 내용이 있으면 tail 재동기화"""
+        with self._lock:
+            if not self._segments:
+                self._refresh()
+                return
+            active = self._segments[-1]
+            try:
+                size = os.path.getsize(active.path)
+            except FileNotFoundError:
+                size = -1
+            if size != active.size:
+                self._refresh()
+
+    def _refresh(self):
+        """세그먼트 목록 + 인덱스 로드, 마지막 세그먼트 tail 스캔 (잠금 보유 상태)"""
+        known = {segment.base_seq: segment for segment in self._segments}
+        base_seqs = sorted(
+            int(p.name[:-len(SEGMENT_SUFFIX)])
+            for p in self.directory.glob(f"*{SEGMENT_SUFFIX}")
+            if p.name[:-len(SEGMENT_SUFFIX)].isdigit()
+        )
+
+        segments = []
+        for base_seq in base_seqs:
+            segment = known.get(base_seq)
+            if segment is None:
+                segment = _Segment(self.directory, base_seq)
+                self._load_index(segment)
+            segments.append(segment)
+        self._segments = segments
+
+        if not segments:
+            self._next_seq = 0
+            return
+
+        # 마지막 세그먼트만 tail 스캔 (마지막 인덱스 지점부터)
+        active = segments[-1]
+        if active.index_seqs:
+            seq, offset = active.index_seqs[-1], active.index_offsets[-1]
+        else:
+            seq, offset = active.base_seq, 0
+
+        with open(active.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # 쓰는 중이거나 비정상 종료로 잘린 줄
+                if seq % self.index_interval == 0 and (not active.index_seqs or seq > active.index_seqs[-1]):
+                    active.add_index(seq, offset)
+                offset += len(line)
+                seq += 1
+
+        active.size = offset
+        self._next_seq = seq
+
+    def _load_index(self, segment: _Segment):
+        """희소 인덱스 파일 로드 (없거나 깨졌으면 세그먼트 스캔으로 재구축)"""
+        try:
+            entries = self._read_index(segment)
+        except (OSError, ValueError):
+            entries = None
+        if entries is not None:
+            for seq, offset in entries:
+                segment.add_index(seq, offset)
+            segment.size = os.path.getsize(segment.path)
+            return
+
+        segment.index_seqs, segment.index_offsets = [], []
+        segment.index_stale = True
+        seq, offset = segment.base_seq, 0
+        with open(segment.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                if seq % self.index_interval == 0:
+                    segment.add_index(seq, offset)
+                offset += len(line)
+                seq += 1
+        segment.size = offset
+
+    def _read_index(self, segment: _Segment) -> Optional[List[Tuple[int, int]]]:
+        """
+        인덱스 파일 검증 후 (seq, 오프셋) 목록 반환
+
+        인덱스는 fsync 없이 추가되므로 비정상 종료 시 마지막 줄이 잘릴 수 있음 ("8 232" → "8 2").
+        모든 줄이 줄바꿈으로 끝나고, seq/오프셋이 증가하며, 오프셋이 해당 seq 레코드의
+        줄 시작을 가리킬 때만 사용합니다 (하나라도 어긋나면 None → 재구축).
+        """
+        with open(segment.index_path, "rb") as f:
+            raw = f.read()
+        if raw and not raw.endswith(b"\n"):
+            return None
+
+        size = os.path.getsize(segment.path)
+        entries: List[Tuple[int, int]] = []
+        with open(segment.path, "rb") as f:
+            for line in raw.splitlines():
+                parts = line.split()
+                if len(parts) != 2:
+                    return None
+                seq, offset = int(parts[0]), int(parts[1])
+                if seq < segment.base_seq or not 0 <= offset < size:
+                    return None
+                if entries and (seq <= entries[-1][0] or offset <= entries[-1][1]):
+                    return None
+                if offset > 0:
+                    f.seek(offset - 1)
+                    if f.read(1) != b"\n":
+                        return None
+                record = f.readline()
+                if not record.endswith(b"\n") or json.loads(record).get("seq") != seq:
+                    return None
+                entries.append((seq, offset))
+        return entries
+
+    # ==================== 쓰기 ====================
+
+    def append_batch(self, records: List[Dict]) -> List[int]:
+        """
+        레코드 일괄 추가 (쓰기 1회 + fsync 1회)
+
+        Returns:
+            부여된 seq 리스트
+        """
+        if not records:
+            return []
+
+        with self._lock, FileLock(self._dir_lock_path):
+            self._refresh()
+
+            if not self._segments or self._segments[-1].size >= self.segment_max_bytes:
+                self._segments.append(_Segment(self.directory, self._next_seq))
+
+            active = self._segments[-1]
+            seqs = []
+            chunks = []
+            new_index = []
+            offset = active.size
+
+            for record in records:
+                seq = self._next_seq + len(seqs)
+                line = (json.dumps({"seq": seq, "data": record}, ensure_ascii=False) + "\n").encode("utf-8")
+                if seq % self.index_interval == 0:
+                    new_index.append((seq, offset))
+                chunks.append(line)
+                seqs.append(seq)
+                offset += len(line)
+
+            with open(active.path, "ab") as f:
+                # 잘린 줄 뒤에 이어 쓰지 않도록 커밋 지점으로 맞춤
+                f.truncate(active.size)
+                f.write(b"".join(chunks))
+                f.flush()
+                os.fsync(f.fileno())
+
+            if active.index_stale:
+                # 깨진 인덱스 파일 뒤에 이어 쓰지 않도록 재구축한 인덱스로 교체
+                tmp_path = active.index_path.with_suffix(INDEX_SUFFIX + ".tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write("".join(f"{seq} {off}\n" for seq, off in zip(active.index_seqs, active.index_offsets)))
+                os.replace(tmp_path, active.index_path)
+                active.index_stale = False
+
+            if new_index:
+                with open(active.index_path, "a", encoding="utf-8") as f:
+                    f.write("".join(f"{seq} {off}\n" for seq, off in new_index))
+                for seq, off in new_index:
+                    active.add_index(seq, off)
+
+            active.size = offset
+            self._next_seq += len(seqs)
+            return seqs
+
+    # ==================== 읽기 ====================
+
+    def read(self, start_seq: int = 0, limit: int = 100) -> List[Tuple[int, Dict]]:
+        """
+        start_seq부터 최대 limit개 읽기 (희소 인덱스로 바로 이동)
+
+        Returns:
+            [(seq, record), ...] (limit <= 0이면 빈 리스트)
+        """
+        results = []
+        if limit <= 0:
+            return results
+        for seq, record in self.iter_from(max(start_seq, 0)):
+            results.append((seq, record))
+            if len(results) >= limit:
+                break
+        return results
+
+    def iter_from(self, start_seq: int = 0) -> Iterator[Tuple[int, Dict]]:
+        """start_seq부터 끝까지 순회"""
+        self._refresh_if_changed()
+        with self._lock:
+            if start_seq >= self._next_seq:
+                return
+            segments = [(s, s.size) for s in self._segments]
+
+        base_seqs = [segment.base_seq for segment, _ in segments]
+        first = max(bisect.bisect_right(base_seqs, start_seq) - 1, 0)
+
+        for segment, size in segments[first:]:
+            seq, offset = segment.seek(start_seq)
+            with open(segment.path, "rb") as f:
+                f.seek(offset)
+                for line in f:
+                    offset += len(line)
+                    if offset > size or not line.endswith(b"\n"):
+                        break
+                    # 인덱스 지점부터 start_seq 전까지는 파싱 없이 건너뜀
+                    if seq >= start_seq:
+                        entry = json.loads(line)
+                        yield entry["seq"], entry["data"]
+                    seq += 1
+
+
+class GroupCommitWriter:
+    """
+    그룹 커밋 writer
+
+    append()는 기록을 큐에 넣고 커밋(fsync) 완료까지 기다립니다.
+    백그라운드 스레드가 대기 중인 기록을 최대 max_batch개까지 모아 한 번에 씁니다.
+    """
+
+    def __init__(self, log: SegmentedLog, max_batch: int = 256, linger: float = 0.002):
+        """
+        Args:
+            log: 대상 로그
+            max_batch: 한 번에 커밋할 최대 기록 수
+            linger: 첫 기록 이후 추가 기록을 기다리는 시간 (초)
+        """
+        self.log = log
+        self.max_batch = max_batch
+        self.linger = linger
+        self._queue: "queue.Queue[Optional[Tuple[Dict, Future]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=f"group-commit-{log.directory.name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, record: Dict) -> Future:
+        """기록 제출 (Future 결과 = seq)"""
+        future: Future = Future()
+        self._queue.put((record, future))
+        return future
+
+    def append(self, record: Dict, timeout: float = 5.0) -> int:
+        """기록 추가 후 커밋 완료까지 대기"""
+        return self.submit(record).result(timeout=timeout)
+
+    def close(self):
+        """남은 기록을 모두 커밋하고 스레드 종료"""
+        self._queue.put(None)
+        self._thread.join(timeout=10)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+
+            # 잠깐 기다리며 동시에 들어온 기록을 모음
+            try:
+                while len(batch) < self.max_batch:
+                    next_item = self._queue.get(timeout=self.linger)
+                    if next_item is None:
+                        stopping = True
+                        break
+                    batch.append(next_item)
+            except queue.Empty:
+                pass
+
+            try:
+                seqs = self.log.append_batch([record for record, _ in batch])
+                for (_, future), seq in zip(batch, seqs):
+                    future.set_result(seq)
+            except Exception as e:
+                print(f"❌ 로그 커밋 실패 ({self.log.directory}): {e}")
+                for _, future in batch:
+                    future.set_exception(e)
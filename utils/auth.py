@@ -14,14 +14,16 @@ class UserRole:
     USER = "user"    # 일반 사용자: 기본 권한
 
 
-def get_user_role(user: Optional[dict]) -> str:
-    """사용자 역할 조회"""
+def get_user_role(user) -> str:
+    """사용자 역할 조회 (User 모델 또는 딕셔너리)"""
     if not user:
         return None
     
-    # user 딕셔너리에서 role 추출
+    # role 추출 (auth_manager는 User 모델, 레거시 호출은 딕셔너리)
     # 기본값은 'user'
-    return user.get("role", UserRole.USER)
+    if isinstance(user, dict):
+        return user.get("role", UserRole.USER)
+    return getattr(user, "role", None) or UserRole.USER
 
 
 def require_auth(allow_anonymous: bool = False):
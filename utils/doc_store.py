@@ -0,0 +1,134 @@
+"""
+MD 문서 저장소 (mmap)
+- 문서를 메모리 매핑으로 열어 워커 간에 페이지 캐시를 공유 (프로세스별 readlines 사본 없음)
+- 섹션은 메타데이터의 바이트 범위(start_byte/end_byte)로 memoryview를 잘라 그때 디코딩 (join 없음)
+- 메타데이터의 content_hash와 비교해 문서가 수정되어 범위가 어긋났는지 감지
+
+문서는 원자적으로 교체해야 합니다 (임시 파일에 쓴 뒤 rename/os.replace → 새 inode).
+매핑된 파일을 제자리에서 줄이면(truncate) 그 범위를 읽는 순간 SIGBUS로 워커가 죽을 수 있으므로,
+같은 inode가 수정된 것을 감지하면 그 파일은 이후 mmap 대신 일반 읽기(바이트 사본)로 전환합니다.
+"""
+import hashlib
+import mmap
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+
+def section_hash(data) -> str:
+    """섹션 바이트의 해시 (tools/generate_metadata.py와 동일한 방식)"""
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+class DocumentStore:
+    """mmap 기반 MD 문서 저장소"""
+
+    def __init__(self, root: str = "docs"):
+        """
+        Args:
+            root: 문서 디렉터리
+        """
+        self.root = Path(root)
+        # 파일명 → ((inode, mtime_ns, size), memoryview) - 파일이 바뀌면 다시 매핑
+        self._views: Dict[str, Tuple[Tuple[int, int, int], memoryview]] = {}
+        self._maps: Dict[str, mmap.mmap] = {}
+        self._retired: List[mmap.mmap] = []  # 교체된 매핑 중 아직 사용 중이라 닫지 못한 것
+        self._in_place: Set[str] = set()     # 제자리 수정이 감지된 파일 (일반 읽기)
+        self._lock = threading.Lock()
+
+    def _view(self, filename: str) -> Optional[memoryview]:
+        """파일 전체 memoryview (없으면 None)"""
+        path = self.root / filename
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+        cached = self._views.get(filename)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        with self._lock:
+            cached = self._views.get(filename)
+            if cached and cached[0] == signature:
+                return cached[1]
+            if cached and cached[0][0] == stat.st_ino and filename not in self._in_place:
+                self._in_place.add(filename)
+                print(f"⚠️  문서가 제자리에서 수정됨 ({filename}) - 이후 mmap 대신 일반 읽기 "
+                      f"(문서는 임시 파일 + rename으로 교체하세요)")
+
+            mapped = None
+            if stat.st_size == 0:
+                view = memoryview(b"")
+            elif filename in self._in_place:
+                with open(path, "rb") as f:
+                    view = memoryview(f.read())
+            else:
+                with open(path, "rb") as f:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                view = memoryview(mapped)
+
+            self._views[filename] = (signature, view)
+            previous = self._maps.pop(filename, None)
+            if mapped is not None:
+                self._maps[filename] = mapped
+            if previous is not None:
+                self._retired.append(previous)
+            cached = None  # 이전 memoryview 참조를 놓아야 매핑을 닫을 수 있음
+            self._close_retired()
+            return view
+
+    def _close_retired(self):
+        """
+        교체된 매핑 닫기 (잠금 보유 상태에서 호출)
+
+        다른 스레드가 아직 이전 memoryview/슬라이스를 쓰는 중이면 BufferError → 다음 교체 때 재시도
+        """
+        still_open = []
+        for mapped in self._retired:
+            try:
+                mapped.close()
+            except BufferError:
+                still_open.append(mapped)
+        self._retired = still_open
+
+    def close(self):
+        """모든 매핑 해제 (사용 중인 매핑은 참조가 사라진 뒤 다음 호출에서 닫힘)"""
+        with self._lock:
+            self._views = {}
+            self._retired.extend(self._maps.values())
+            self._maps = {}
+            self._close_retired()
+
+    def read(self, filename: str) -> Optional[str]:
+        """문서 전체 (없으면 None)"""
+        view = self._view(filename)
+        return None if view is None else str(view, "utf-8")
+
+    def read_section(
+        self,
+        filename: str,
+        start_byte: int,
+        end_byte: int,
+        content_hash: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        바이트 범위의 섹션 내용
+
+        Returns:
+            섹션 문자열, 파일이 없거나 content_hash가 맞지 않으면(메타데이터가 오래됨) None
+        """
+        view = self._view(filename)
+        if view is None:
+            return None
+        chunk = view[start_byte:end_byte]
+        if content_hash and section_hash(chunk) != content_hash:
+            return None
+        return str(chunk, "utf-8")
+
+    def section_matches(self, filename: str, start_byte: int, end_byte: int, content_hash: str) -> bool:
+        """바이트 범위의 현재 내용이 content_hash와 같은지 (디코딩 없이 해시만 비교)"""
+        view = self._view(filename)
+        return view is not None and section_hash(view[start_byte:end_byte]) == content_hash
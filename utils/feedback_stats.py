@@ -0,0 +1,324 @@
+"""
+피드백 통계 (증분 유지되는 집계)
+- 전체/일별/주별 버킷마다 총계, 긍정 수, 이유별/섹션별 카운터, 상위 k 섹션 유지
+- 피드백 로그에서 마지막으로 반영한 seq 이후만 읽어 반영 (다른 워커의 기록도 반영됨)
+- 체크포인트 파일에 저장, 없거나 로그와 맞지 않으면 로그 전체에서 재구축
+"""
+import json
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from utils.append_log import SegmentedLog
+from utils.file_lock import atomic_write_json
+
+
+CHECKPOINT_VERSION = 1
+WINDOWS = ("daily", "weekly")
+
+
+class TopK:
+    """
+    증가 전용 카운터의 상위 k (정확)
+
+    카운트가 줄지 않으므로 상위 k 밖의 항목은 증가 직후 최솟값과만 비교하면 됩니다.
+    """
+
+    def __init__(self, k: int, items: Optional[Dict[str, int]] = None):
+        self.k = k
+        self.items: Dict[str, int] = dict(items or {})
+
+    def update(self, key: str, count: int):
+        if key in self.items or len(self.items) < self.k:
+            self.items[key] = count
+            return
+
+        min_key = min(self.items, key=self.items.get)
+        if count > self.items[min_key]:
+            del self.items[min_key]
+            self.items[key] = count
+
+    def ranked(self):
+        return sorted(
+            [{"section": k, "count": v} for k, v in self.items.items()],
+            key=lambda x: x["count"],
+            reverse=True
+        )
+
+
+class FeedbackAggregate:
+    """집계 1개 (전체 또는 시간 버킷)"""
+
+    def __init__(self, top_k: int):
+        self.total = 0
+        self.positive = 0
+        self.detailed_count = 0
+        self.reasons: Dict[str, int] = {}
+        self.sections: Dict[str, int] = {}
+        self.top_sections = TopK(top_k)
+
+    def add_feedback(self, record: Dict):
+        self.total += 1
+        if record.get("is_helpful", False):
+            self.positive += 1
+
+    def add_detailed(self, record: Dict):
+        self.detailed_count += 1
+        for reason in record.get("reasons", []):
+            self.reasons[reason] = self.reasons.get(reason, 0) + 1
+
+        section = record.get("matched_section") or "알 수 없음"
+        count = self.sections.get(section, 0) + 1
+        self.sections[section] = count
+        self.top_sections.update(section, count)
+
+    def to_stats(self) -> Dict:
+        """기존 /api/feedback/stats 응답 형식"""
+        return {
+            "total": self.total,
+            "positive": self.positive,
+            "negative": self.total - self.positive,
+            "positive_rate": round(self.positive / self.total * 100, 1) if self.total > 0 else 0,
+            "detailed_feedbacks_count": self.detailed_count,
+            "negative_reasons": dict(self.reasons),
+            "sections_needing_improvement": self.top_sections.ranked()
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            "total": self.total,
+            "positive": self.positive,
+            "detailed_count": self.detailed_count,
+            "reasons": self.reasons,
+            "sections": self.sections,
+            "top_sections": self.top_sections.items
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, top_k: int) -> "FeedbackAggregate":
+        aggregate = cls(top_k)
+        aggregate.total = data["total"]
+        aggregate.positive = data["positive"]
+        aggregate.detailed_count = data["detailed_count"]
+        aggregate.reasons = dict(data["reasons"])
+        aggregate.sections = dict(data["sections"])
+        aggregate.top_sections = TopK(top_k, data["top_sections"])
+        return aggregate
+
+
+def bucket_key(window: str, when: datetime) -> str:
+    """버킷 키 (daily: 2024-05-01, weekly: 2024-W18)"""
+    if window == "daily":
+        return when.strftime("%Y-%m-%d")
+    year, week, _ = when.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def bucket_range(window: str, key: str) -> Tuple[datetime, datetime]:
+    """버킷 키 → [시작, 끝) 시각"""
+    if window == "daily":
+        start = datetime.strptime(key, "%Y-%m-%d")
+        return start, start + timedelta(days=1)
+    if window == "weekly":
+        year, week = key.split("-W")
+        start = datetime.fromisocalendar(int(year), int(week), 1)
+        return start, start + timedelta(weeks=1)
+    raise ValueError(f"지원하지 않는 window: {window}")
+
+
+def _parse_timestamp(value) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return datetime.now()
+
+
+class FeedbackStats:
+    """피드백 로그 위에 유지되는 증분 집계"""
+
+    def __init__(
+        self,
+        feedback_log: SegmentedLog,
+        detailed_log: SegmentedLog,
+        checkpoint_file: str,
+        top_k: int = 10,
+        checkpoint_every: int = 100,
+        daily_retention: int = 90,
+        weekly_retention: int = 52
+    ):
+        """
+        Args:
+            feedback_log: 일반 피드백 로그
+            detailed_log: 상세 피드백 로그
+            checkpoint_file: 체크포인트 파일 경로
+            top_k: 유지할 상위 섹션 수
+            checkpoint_every: 이 수만큼 새로 반영하면 체크포인트 저장
+            daily_retention: 유지할 일별 버킷 수
+            weekly_retention: 유지할 주별 버킷 수
+        """
+        self.feedback_log = feedback_log
+        self.detailed_log = detailed_log
+        self.checkpoint_file = Path(checkpoint_file)
+        self.top_k = top_k
+        self.checkpoint_every = checkpoint_every
+        self.retention = {"daily": daily_retention, "weekly": weekly_retention}
+
+        self._lock = threading.Lock()
+        self._reset()
+
+        if not self._load_checkpoint():
+            self.rebuild()
+
+    def _reset(self):
+        self.feedback_seq = 0   # 다음에 반영할 일반 피드백 seq
+        self.detailed_seq = 0   # 다음에 반영할 상세 피드백 seq
+        self.overall = FeedbackAggregate(self.top_k)
+        self.buckets: Dict[str, Dict[str, FeedbackAggregate]] = {window: {} for window in WINDOWS}
+        self._since_checkpoint = 0
+
+    # ==================== 반영 ====================
+
+    def catch_up(self) -> int:
+        """로그에서 아직 반영하지 않은 기록만 반영 (반영한 건수 반환)"""
+        with self._lock:
+            applied = 0
+
+            for seq, record in self.feedback_log.iter_from(self.feedback_seq):
+                for aggregate in self._targets(record):
+                    aggregate.add_feedback(record)
+                self.feedback_seq = seq + 1
+                applied += 1
+
+            for seq, record in self.detailed_log.iter_from(self.detailed_seq):
+                for aggregate in self._targets(record):
+                    aggregate.add_detailed(record)
+                self.detailed_seq = seq + 1
+                applied += 1
+
+            if applied:
+                self._prune_buckets()
+                self._since_checkpoint += applied
+                if self._since_checkpoint >= self.checkpoint_every:
+                    self._save_checkpoint()
+            return applied
+
+    def _targets(self, record: Dict):
+        """기록이 반영될 집계 (전체 + 해당 일/주 버킷)"""
+        when = _parse_timestamp(record.get("timestamp"))
+        targets = [self.overall]
+        for window in WINDOWS:
+            buckets = self.buckets[window]
+            key = bucket_key(window, when)
+            if key not in buckets:
+                buckets[key] = FeedbackAggregate(self.top_k)
+            targets.append(buckets[key])
+        return targets
+
+    def _prune_buckets(self):
+        """보존 개수를 넘는 오래된 버킷 제거"""
+        for window, buckets in self.buckets.items():
+            excess = len(buckets) - self.retention[window]
+            if excess > 0:
+                for key in sorted(buckets)[:excess]:
+                    del buckets[key]
+
+    def rebuild(self):
+        """로그 전체에서 집계 재구축"""
+        with self._lock:
+            self._reset()
+        applied = self.catch_up()
+        with self._lock:
+            self._save_checkpoint()
+        print(f"✅ 피드백 통계 재구축 완료: {applied}건")
+
+    # ==================== 조회 ====================
+
+    def get_stats(self, window: Optional[str] = None, bucket: Optional[str] = None) -> Dict:
+        """
+        통계 조회
+
+        Args:
+            window: None(전체), "daily", "weekly"
+            bucket: 버킷 키 (기본: 현재 일/주)
+        """
+        self.catch_up()
+
+        if window is None:
+            with self._lock:
+                return self.overall.to_stats()
+
+        if window not in WINDOWS:
+            raise ValueError(f"지원하지 않는 window: {window}")
+
+        key = bucket or bucket_key(window, datetime.now())
+        with self._lock:
+            aggregate = self.buckets[window].get(key) or FeedbackAggregate(self.top_k)
+            stats = aggregate.to_stats()
+            stats["available_buckets"] = sorted(self.buckets[window])
+
+        stats["window"] = window
+        stats["bucket"] = key
+        return stats
+
+    # ==================== 체크포인트 ====================
+
+    def checkpoint(self):
+        """체크포인트 저장"""
+        with self._lock:
+            self._save_checkpoint()
+
+    def _save_checkpoint(self):
+        """잠금 보유 상태에서 호출"""
+        data = {
+            "version": CHECKPOINT_VERSION,
+            "top_k": self.top_k,
+            "feedback_seq": self.feedback_seq,
+            "detailed_seq": self.detailed_seq,
+            "overall": self.overall.to_dict(),
+            "buckets": {
+                window: {key: aggregate.to_dict() for key, aggregate in buckets.items()}
+                for window, buckets in self.buckets.items()
+            }
+        }
+        try:
+            self.checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_json(str(self.checkpoint_file), data, indent=None)
+            self._since_checkpoint = 0
+        except OSError as e:
+            print(f"⚠️  피드백 통계 체크포인트 저장 실패: {e}")
+
+    def _load_checkpoint(self) -> bool:
+        """체크포인트 로드 (로그보다 앞서 있거나 형식이 다르면 False → 재구축)"""
+        try:
+            with open(self.checkpoint_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            print(f"⚠️  피드백 통계 체크포인트 로드 실패: {e}")
+            return False
+
+        if data.get("version") != CHECKPOINT_VERSION or data.get("top_k") != self.top_k:
+            return False
+        if data["feedback_seq"] > self.feedback_log.next_seq or data["detailed_seq"] > self.detailed_log.next_seq:
+            print("⚠️  피드백 통계 체크포인트가 로그보다 앞서 있어 재구축합니다")
+            return False
+
+        try:
+            self.overall = FeedbackAggregate.from_dict(data["overall"], self.top_k)
+            self.buckets = {
+                window: {
+                    key: FeedbackAggregate.from_dict(value, self.top_k)
+                    for key, value in data["buckets"].get(window, {}).items()
+                }
+                for window in WINDOWS
+            }
+        except (KeyError, TypeError) as e:
+            print(f"⚠️  피드백 통계 체크포인트 형식 오류: {e}")
+            self._reset()
+            return False
+
+        self.feedback_seq = data["feedback_seq"]
+        self.detailed_seq = data["detailed_seq"]
+        return True
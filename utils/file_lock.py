@@ -0,0 +1,183 @@
+"""
+파일 잠금 및 원자적 쓰기 유틸리티
+- POSIX: fcntl.flock 공유(읽기)/배타(쓰기) 잠금, 프로세스가 죽으면 OS가 자동 해제
+- Windows 등 fcntl 미지원: 잠금 파일 방식 폴백 (죽은 프로세스의 잠금 파일 자동 회수)
+- 임시 파일 + os.replace 원자적 교체
+"""
+import json
+import os
+import tempfile
+import time
+from typing import Any, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+class FileLock:
+    """
+    파일 잠금 (컨텍스트 매니저)
+
+    사용 예:
+        with FileLock("data/faq_data.json", shared=True):
+            ...  # 읽기
+    """
+
+    def __init__(self, file_path: str, shared: bool = False, timeout: float = 5.0, stale_after: float = 30.0):
+        """
+        Args:
+            file_path: 보호할 파일 경로 (잠금은 '<file_path>.lock'에 걸림)
+            shared: True면 공유 잠금 (읽기끼리는 서로 막지 않음)
+            timeout: 최대 대기 시간 (초, 잠금 파일 폴백 모드에서 사용)
+            stale_after: 폴백 모드에서 잠금 파일을 오래된 것으로 보는 시간 (초)
+        """
+        self.lock_file = f"{file_path}.lock"
+        self.gate_file = f"{file_path}.lock.gate"
+        self.shared = shared
+        self.timeout = timeout
+        self.stale_after = stale_after
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> bool:
+        """잠금 획득 (타임아웃 시 False)"""
+        if fcntl is not None:
+            return self._acquire_flock()
+        return self._acquire_lockfile()
+
+    def release(self):
+        """잠금 해제"""
+        if self._fd is None:
+            return
+
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            finally:
+                os.close(self._fd)
+        else:
+            os.close(self._fd)
+            try:
+                os.remove(self.lock_file)
+            except FileNotFoundError:
+                pass
+        self._fd = None
+
+    def __enter__(self):
+        if not self.acquire():
+            raise TimeoutError(f"파일 잠금 타임아웃: {self.lock_file}")
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+    def _acquire_flock(self) -> bool:
+        """
+        fcntl.flock 잠금 (잠금 파일은 삭제하지 않고 재사용)
+
+        '<lock>.gate' 회전문으로 쓰기 우선권을 줍니다: 쓰기는 gate를 쥔 채로
+        기존 읽기가 끝나기를 기다리므로, 뒤이어 오는 읽기가 쓰기를 굶기지 못합니다.
+        대기는 커널 블로킹 호출이며 (스레드풀에서 실행), 잠금 보유 프로세스가
+        죽으면 OS가 잠금을 해제하므로 오래된 잠금이 남지 않습니다.
+        """
+        gate_fd = os.open(self.gate_file, os.O_CREAT | os.O_RDWR, 0o644)
+        fd = os.open(self.lock_file, os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            fcntl.flock(gate_fd, fcntl.LOCK_EX)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX)
+            finally:
+                fcntl.flock(gate_fd, fcntl.LOCK_UN)
+        except OSError as e:
+            os.close(fd)
+            print(f"⚠️  파일 잠금 실패: {self.lock_file} ({e})")
+            return False
+        finally:
+            os.close(gate_fd)
+
+        self._fd = fd
+        return True
+
+    def _acquire_lockfile(self) -> bool:
+        """잠금 파일 방식 (fcntl 미지원 환경, 공유 잠금도 배타로 동작)"""
+        deadline = time.monotonic() + self.timeout
+        delay = 0.001
+
+        while True:
+            try:
+                fd = os.open(self.lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(fd, str(os.getpid()).encode())
+                self._fd = fd
+                return True
+            except FileExistsError:
+                if self._is_stale():
+                    print(f"🧹 오래된 잠금 파일 회수: {self.lock_file}")
+                    try:
+                        os.remove(self.lock_file)
+                    except FileNotFoundError:
+                        pass
+                    continue
+
+                if time.monotonic() >= deadline:
+                    print(f"⚠️  파일 잠금 타임아웃: {self.lock_file}")
+                    return False
+                time.sleep(delay)
+                delay = min(delay * 2, 0.05)
+
+    def _is_stale(self) -> bool:
+        """잠금 파일 소유 프로세스가 없거나 너무 오래된 경우"""
+        try:
+            age = time.time() - os.path.getmtime(self.lock_file)
+            with open(self.lock_file, "r") as f:
+                pid_text = f.read().strip()
+        except (FileNotFoundError, OSError):
+            return False
+
+        if age > self.stale_after:
+            return True
+
+        if not pid_text.isdigit():
+            # 생성 직후 pid 기록 전일 수 있으므로 나이로만 판단
+            return False
+
+        return not _pid_alive(int(pid_text))
+
+
+def _pid_alive(pid: int) -> bool:
+    """프로세스 생존 여부"""
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":
+        # Windows의 os.kill(pid, 0)은 프로세스를 종료시키므로 사용 불가 → 나이로만 판단
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        # 권한 없음 = 프로세스는 존재
+        return True
+    return True
+
+
+def atomic_write_json(file_path: str, data: Any, indent: Optional[int] = 2):
+    """
+    JSON 원자적 쓰기 (같은 디렉토리 임시 파일에 쓰고 fsync 후 os.replace)
+
+    쓰기 도중 프로세스가 죽어도 기존 파일은 온전히 남습니다.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
@@ -0,0 +1,71 @@
+"""
+한글 처리 유틸리티
+- 초성 추출 (ㅎㄱ → 휴가)
+- 자모 분해 (연차 → ㅇㅕㄴㅊㅏ, 오타 교정용)
+- 검색 키 정규화
+"""
+import re
+
+
+HANGUL_BASE = 0xAC00
+HANGUL_END = 0xD7A3
+JUNGSEONG_COUNT = 21
+JONGSEONG_COUNT = 28
+
+CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+             "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+
+# 호환용 자음 (키보드로 입력한 초성: ㄱ ~ ㅎ)
+_COMPAT_CONSONANTS = set("ㄱㄲㄳㄴㄵㄶㄷㄸㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅃㅄㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def is_hangul_syllable(char: str) -> bool:
+    """완성형 한글 음절 여부 (가 ~ 힣)"""
+    return HANGUL_BASE <= ord(char) <= HANGUL_END
+
+
+def chosung(text: str) -> str:
+    """
+    한글 음절을 초성으로 변환 (그 외 문자는 그대로)
+
+    예: "휴가 신청" → "ㅎㄱ ㅅㅊ"
+    """
+    result = []
+    for char in text:
+        if is_hangul_syllable(char):
+            result.append(CHOSUNG[(ord(char) - HANGUL_BASE) // (JUNGSEONG_COUNT * JONGSEONG_COUNT)])
+        else:
+            result.append(char)
+    return "".join(result)
+
+
+def decompose(text: str) -> str:
+    """
+    한글 음절을 자모(초성 + 중성 + 종성)로 분해 (그 외 문자는 그대로)
+
+    예: "연차" → "ㅇㅕㄴㅊㅏ", "연챠" → "ㅇㅕㄴㅊㅑ" (자모 1개 차이)
+    """
+    result = []
+    for char in text:
+        if is_hangul_syllable(char):
+            offset = ord(char) - HANGUL_BASE
+            result.append(CHOSUNG[offset // (JUNGSEONG_COUNT * JONGSEONG_COUNT)])
+            result.append(JUNGSEONG[offset % (JUNGSEONG_COUNT * JONGSEONG_COUNT) // JONGSEONG_COUNT])
+            result.append(JONGSEONG[offset % JONGSEONG_COUNT])
+        else:
+            result.append(char)
+    return "".join(result)
+
+
+def has_chosung(text: str) -> bool:
+    """초성(자음만 입력된 글자) 포함 여부"""
+    return any(char in _COMPAT_CONSONANTS for char in text)
+
+
+def normalize_key(text: str) -> str:
+    """검색 키 정규화: 소문자 + 공백 제거 ("휴가 신청" == "휴가신청")"""
+    return _WHITESPACE.sub("", text.lower())
@@ -2,9 +2,11 @@
 Prometheus 메트릭 수집
 """
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
+from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import wraps
 import time
-from typing import Optional
+from typing import List, Optional, Tuple
 
 
 # ====================  메트릭 정의 ====================
@@ -36,11 +38,63 @@ llm_response_time = Histogram(
     'LLM response time in seconds'
 )
 
+# 답변 파이프라인 단계별 소요 시간
+pipeline_stage_seconds = Histogram(
+    'pipeline_stage_seconds',
+    'Answer pipeline stage duration in seconds',
+    ['stage'],  # keyword_extraction, category_matching, llm_section_selection, spell_correction, document_load, generation, semantic_encode, faiss_search, lexical_search, h2_routing, partition_search
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
+# 스트리밍 (/api/ask/stream)
+STREAM_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 8.0, 13.0, 20.0, 30.0)
+
+stream_ttfb_seconds = Histogram(
+    'stream_ttfb_seconds',
+    'Time to first streamed byte in seconds',
+    buckets=STREAM_LATENCY_BUCKETS
+)
+
+stream_ttft_seconds = Histogram(
+    'stream_ttft_seconds',
+    'Time to first LLM token in seconds',
+    buckets=STREAM_LATENCY_BUCKETS
+)
+
+stream_chunk_gap_seconds = Histogram(
+    'stream_chunk_gap_seconds',
+    'Gap between consecutive streamed token chunks in seconds',
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+stream_tokens_total = Counter(
+    'stream_tokens_total',
+    'Total LLM token chunks streamed'
+)
+
+stream_chars_total = Counter(
+    'stream_chars_total',
+    'Total characters streamed'
+)
+
+stream_requests_total = Counter(
+    'stream_requests_total',
+    'Streaming requests by completion status',
+    ['status']  # completed, disconnected, error
+)
+
+# 오타 교정으로 매칭에 성공한 건수 (교정 없이는 LLM 섹션 추천/안내 응답으로 넘어갔을 요청)
+spell_fallbacks_avoided_total = Counter(
+    'spell_fallbacks_avoided_total',
+    'Lookups rescued by spelling correction',
+    ['path']  # category_router, faq_keyword
+)
+
 # 캐시 히트/미스
 cache_operations_total = Counter(
     'cache_operations_total',
     'Cache operations',
-    ['operation']  # hit, miss
+    ['operation']  # hit, miss, pregenerated (사전 생성 답변 사용)
 )
 
 # 동시 사용자 수
@@ -92,11 +146,130 @@ def track_error(error_type: str):
     errors_total.labels(error_type=error_type).inc()
 
 
+def track_spell_fallback_avoided(path: str):
+    """오타 교정으로 폴백을 피한 건수 추적"""
+    spell_fallbacks_avoided_total.labels(path=path).inc()
+
+
 def get_metrics() -> tuple[bytes, str]:
     """Prometheus 메트릭 반환"""
     return generate_latest(), CONTENT_TYPE_LATEST
 
 
+# ==================== 단계별 스팬 ====================
+
+# 요청별 스팬 목록 (TimingMiddleware가 요청 시작 시 설정 → Server-Timing 헤더로 출력)
+_request_spans: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_spans", default=None)
+
+
+def start_request_spans() -> List[Tuple[str, float]]:
+    """
+    현재 컨텍스트에 요청별 스팬 목록 설정
+
+    같은 리스트 객체를 공유하므로 run_in_threadpool(컨텍스트 복사)에서 기록한 스팬도 모임
+    """
+    spans: List[Tuple[str, float]] = []
+    _request_spans.set(spans)
+    return spans
+
+
+@contextmanager
+def stage(name: str):
+    """
+    파이프라인 단계 시간 측정
+
+    - pipeline_stage_seconds{stage=name}에 기록
+    - 요청 컨텍스트 안이면 Server-Timing 헤더용 스팬에도 추가
+    """
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start_time
+        pipeline_stage_seconds.labels(stage=name).observe(duration)
+        spans = _request_spans.get()
+        if spans is not None:
+            spans.append((name, duration))
+
+
+def format_server_timing(spans: List[Tuple[str, float]], total: Optional[float] = None) -> str:
+    """
+    스팬 목록 → Server-Timing 헤더 값 (같은 단계는 합산, 밀리초)
+
+    예: "keyword_extraction;dur=412.3, generation;dur=2310.8, total;dur=2790.1"
+    """
+    durations = {}
+    for name, duration in spans:
+        durations[name] = durations.get(name, 0.0) + duration
+    if total is not None:
+        durations["total"] = total
+    return ", ".join(f"{name};dur={duration * 1000:.1f}" for name, duration in durations.items())
+
+
+# ==================== 스트리밍 추적 ====================
+
+class StreamTracker:
+    """
+    스트리밍 요청 1건의 체감 지연 지표 수집
+
+    - TTFB: 요청 시작 → 첫 본문 청크 전송
+    - TTFT: 요청 시작 → 첫 LLM 토큰 청크 (OpenAI 스트림의 delta 1개 ≈ 토큰 1개)
+    - 토큰 청크 간 간격, 토큰/글자 수, 완료 상태(completed/disconnected/error)
+    """
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.start_time = time.perf_counter()
+        self.ttfb: Optional[float] = None
+        self.ttft: Optional[float] = None
+        self.tokens = 0
+        self.chars = 0
+        self.max_gap = 0.0
+        self._last_token_time: Optional[float] = None
+
+    def on_bytes(self):
+        """본문 청크 전송"""
+        if self.ttfb is None:
+            self.ttfb = time.perf_counter() - self.start_time
+            stream_ttfb_seconds.observe(self.ttfb)
+
+    def on_token(self, text: str):
+        """LLM 토큰 청크 전송"""
+        now = time.perf_counter()
+        if self.ttft is None:
+            self.ttft = now - self.start_time
+            stream_ttft_seconds.observe(self.ttft)
+        else:
+            gap = now - self._last_token_time
+            stream_chunk_gap_seconds.observe(gap)
+            self.max_gap = max(self.max_gap, gap)
+        self._last_token_time = now
+        self.tokens += 1
+        self.chars += len(text)
+        stream_tokens_total.inc()
+        stream_chars_total.inc(len(text))
+
+    def summary(self) -> dict:
+        """현재까지의 지표 요약 (밀리초)"""
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            "trace_id": self.trace_id,
+            "duration_ms": ms(time.perf_counter() - self.start_time),
+            "ttfb_ms": ms(self.ttfb),
+            "ttft_ms": ms(self.ttft),
+            "max_gap_ms": ms(self.max_gap),
+            "tokens": self.tokens,
+            "chars": self.chars,
+        }
+
+    def finish(self, status: str) -> dict:
+        """완료 상태 기록 → 로그용 요약"""
+        stream_requests_total.labels(status=status).inc()
+        return {**self.summary(), "status": status}
+
+
 # ==================== 데코레이터 ====================
 
 def track_time(metric: Histogram):
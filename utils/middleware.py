@@ -0,0 +1,133 @@
+"""
+순수 ASGI 미들웨어
+- BaseHTTPMiddleware(@app.middleware("http"))와 달리 요청마다 태스크/메모리 스트림을 만들지 않음
+- 응답 본문은 그대로 통과 → StreamingResponse/SSE 청크가 즉시 전달됨
+- 헤더는 http.response.start 메시지에서만 수정
+"""
+import time
+from typing import Iterable, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from utils.metrics import api_requests_total, api_response_time, format_server_timing, start_request_spans
+
+
+def build_csp() -> str:
+    """CSP (Content Security Policy)"""
+    return (
+        "default-src 'self'; "
+        "script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
+        "style-src 'self' 'unsafe-inline'; "
+        "img-src 'self' data: https:; "
+        "font-src 'self' data:; "
+        "connect-src 'self';"
+    )
+
+
+class SecurityHeadersMiddleware:
+    """보안 헤더 추가 (같은 이름의 기존 헤더는 교체)"""
+
+    def __init__(self, app: ASGIApp, content_security_policy: Optional[str] = None):
+        """
+        Args:
+            app: 다음 ASGI 앱
+            content_security_policy: CSP 헤더 값 (None이면 추가하지 않음)
+        """
+        self.app = app
+
+        headers = [
+            ("X-Content-Type-Options", "nosniff"),
+            ("X-Frame-Options", "DENY"),
+            ("X-XSS-Protection", "1; mode=block"),
+            ("Strict-Transport-Security", "max-age=31536000; includeSubDomains"),
+        ]
+        if content_security_policy:
+            headers.append(("Content-Security-Policy", content_security_policy))
+
+        # 요청마다 인코딩하지 않도록 미리 바이트로 변환
+        self._headers: List[Tuple[bytes, bytes]] = [
+            (name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers
+        ]
+        self._names = {name for name, _ in self._headers}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                message["headers"] = _replace_headers(message.get("headers", ()), self._names, self._headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+class TimingMiddleware:
+    """
+    요청 단위 응답 시간 측정
+    - 라우트 템플릿(/api/faq/{faq_id} 등) 기준으로 api_response_time / api_requests_total 기록
+    - 응답 시작 전까지 기록된 파이프라인 스팬을 Server-Timing 헤더로 추가
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = True):
+        """
+        Args:
+            app: 다음 ASGI 앱
+            server_timing: Server-Timing 헤더 추가 여부
+        """
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        root_path = scope.get("root_path", "")
+        spans = start_request_spans()
+        status = 500
+
+        async def send_with_timing(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    value = format_server_timing(spans, time.perf_counter() - start_time)
+                    message["headers"] = list(message.get("headers", ())) + [
+                        (b"server-timing", value.encode("latin-1"))
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            # 스트리밍 응답은 마지막 청크까지 포함한 시간
+            endpoint = _route_template(scope, root_path)
+            api_response_time.labels(method=scope["method"], endpoint=endpoint).observe(time.perf_counter() - start_time)
+            api_requests_total.labels(method=scope["method"], endpoint=endpoint, status=status).inc()
+
+
+def _route_template(scope: Scope, root_path: str) -> str:
+    """
+    라우팅 후 scope에서 라우트 템플릿 추출 (라벨 카디널리티 제한)
+
+    - APIRoute: scope["route"].path
+    - Mount(/static 등): 라우터가 늘린 root_path
+    - 매칭 실패(404 등): "unmatched"
+    """
+    route = scope.get("route")
+    if route is not None and getattr(route, "path", None):
+        return route.path
+    mounted = scope.get("root_path", "")[len(root_path):]
+    return mounted or "unmatched"
+
+
+def _replace_headers(
+    raw: Iterable[Tuple[bytes, bytes]],
+    names: set,
+    extra: List[Tuple[bytes, bytes]]
+) -> List[Tuple[bytes, bytes]]:
+    """raw 헤더에서 names를 제거하고 extra를 덧붙임"""
+    return [(name, value) for name, value in raw if name.lower() not in names] + extra
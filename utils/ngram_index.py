@@ -0,0 +1,242 @@
+"""
+문자 n-gram BM25 색인
+- 한국어 어절 변화(휴가를/휴가는)와 영문 약어(VDI)에 강한 문자 2~3-gram 단위
+- 필드별 가중치(질문/키워드/답변)를 적용한 단어 빈도 → BM25 포화 가중치를 미리 계산
+- 질의는 n-gram별 역색인(열 단위 희소 벡터)을 모아 NumPy로 점수 합산 → argpartition 상위 k개
+- upsert/remove로 문서 단위 증분 갱신 (바뀐 n-gram의 역색인만 다시 계산)
+
+NumPy가 없으면 같은 역색인을 순수 파이썬으로 합산합니다.
+"""
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def char_ngrams(text: str, sizes: Sequence[int] = (2, 3)) -> Counter:
+    """
+    어절 안에서 문자 n-gram 추출 (소문자, 특수문자 제거)
+
+    예: "VDI 접속" → {"vd", "di", "vdi", "접속"}
+    한 글자 어절은 그 글자 자체를 사용합니다.
+    """
+    grams: Counter = Counter()
+    for token in _NON_WORD.sub(" ", text.lower()).split():
+        if len(token) < min(sizes):
+            grams[token] += 1
+            continue
+        for n in sizes:
+            for i in range(len(token) - n + 1):
+                grams[token[i:i + n]] += 1
+    return grams
+
+
+class NgramIndex:
+    """필드 가중 BM25 문자 n-gram 색인"""
+
+    def __init__(
+        self,
+        field_weights: Dict[str, float],
+        k1: float = 1.2,
+        b: float = 0.75,
+        ngram_sizes: Sequence[int] = (2, 3),
+        avgdl_drift: float = 0.2
+    ):
+        """
+        Args:
+            field_weights: 필드별 가중치 (예: {"question": 2.0, "keywords": 1.5, "answer": 0.5})
+            k1, b: BM25 파라미터
+            ngram_sizes: n-gram 길이
+            avgdl_drift: 평균 문서 길이가 이 비율 이상 바뀌면 전체 가중치 재계산
+        """
+        self.field_weights = field_weights
+        self.k1 = k1
+        self.b = b
+        self.ngram_sizes = tuple(ngram_sizes)
+        self.avgdl_drift = avgdl_drift
+        self._clear()
+
+    def _clear(self):
+        """색인 초기화"""
+        self._keys: List[Optional[Hashable]] = []      # 슬롯 → 문서 키
+        self._slots: Dict[Hashable, int] = {}          # 문서 키 → 슬롯
+        self._free: List[int] = []                     # 삭제되어 재사용 가능한 슬롯
+        self._doc_terms: List[Optional[Counter]] = []  # 슬롯별 가중 단어 빈도 (삭제용)
+        self._doc_len: List[float] = []
+        self._total_len = 0.0
+        self._avgdl = 1.0                              # 가중치 계산에 쓴 평균 문서 길이
+
+        self._postings: Dict[str, Dict[int, float]] = {}  # n-gram → {슬롯: 가중 빈도}
+        self._arrays: Dict[str, Tuple] = {}               # n-gram → (슬롯 배열, BM25 가중치 배열) 캐시
+
+    # ==================== 색인 ====================
+
+    @property
+    def size(self) -> int:
+        """색인된 문서 수"""
+        return len(self._slots)
+
+    def build(self, docs: Dict[Hashable, Dict[str, str]]):
+        """전체 색인 구축 (기존 내용 삭제)"""
+        self._clear()
+        for key, fields in docs.items():
+            self._add(key, fields)
+        self._reset_avgdl()
+
+    def upsert(self, key: Hashable, fields: Dict[str, str]):
+        """문서 추가 또는 교체"""
+        if key in self._slots:
+            self._remove(key)
+        self._add(key, fields)
+        self._check_drift()
+
+    def remove(self, key: Hashable):
+        """문서 삭제 (없으면 무시)"""
+        if key in self._slots:
+            self._remove(key)
+            self._check_drift()
+
+    def _term_frequencies(self, fields: Dict[str, str]) -> Counter:
+        """필드별 n-gram 빈도 × 필드 가중치"""
+        terms: Counter = Counter()
+        for field, text in fields.items():
+            weight = self.field_weights.get(field, 0.0)
+            if not weight or not text:
+                continue
+            for gram, count in char_ngrams(text, self.ngram_sizes).items():
+                terms[gram] += count * weight
+        return terms
+
+    def _add(self, key: Hashable, fields: Dict[str, str]):
+        terms = self._term_frequencies(fields)
+        if self._free:
+            slot = self._free.pop()
+            self._keys[slot] = key
+            self._doc_terms[slot] = terms
+            self._doc_len[slot] = sum(terms.values())
+        else:
+            slot = len(self._keys)
+            self._keys.append(key)
+            self._doc_terms.append(terms)
+            self._doc_len.append(sum(terms.values()))
+        self._slots[key] = slot
+        self._total_len += self._doc_len[slot]
+
+        for gram, tf in terms.items():
+            self._postings.setdefault(gram, {})[slot] = tf
+            self._arrays.pop(gram, None)
+
+    def _remove(self, key: Hashable):
+        slot = self._slots.pop(key)
+        for gram in self._doc_terms[slot]:
+            posting = self._postings[gram]
+            del posting[slot]
+            if not posting:
+                del self._postings[gram]
+            self._arrays.pop(gram, None)
+        self._total_len -= self._doc_len[slot]
+        self._keys[slot] = None
+        self._doc_terms[slot] = None
+        self._doc_len[slot] = 0.0
+        self._free.append(slot)
+
+    def _reset_avgdl(self):
+        self._avgdl = (self._total_len / len(self._slots)) if self._slots else 1.0
+        self._arrays.clear()
+
+    def _check_drift(self):
+        """평균 문서 길이가 크게 바뀌었을 때만 전체 가중치 무효화"""
+        if not self._slots:
+            return
+        current = self._total_len / len(self._slots)
+        if abs(current - self._avgdl) > self._avgdl * self.avgdl_drift:
+            self._reset_avgdl()
+
+    def _weight(self, tf: float, slot: int) -> float:
+        """BM25 단어 빈도 포화 (IDF 제외)"""
+        norm = self.k1 * (1 - self.b + self.b * self._doc_len[slot] / self._avgdl)
+        return tf * (self.k1 + 1) / (tf + norm)
+
+    def _term_arrays(self, gram: str) -> Tuple:
+        """n-gram 역색인 → (슬롯 배열, 가중치 배열) (NumPy 배열, 지연 계산 후 캐시)"""
+        cached = self._arrays.get(gram)
+        if cached is None:
+            posting = self._postings[gram]
+            slots = np.fromiter(posting.keys(), dtype=np.int64, count=len(posting))
+            weights = np.fromiter(
+                (self._weight(tf, slot) for slot, tf in posting.items()),
+                dtype=np.float64, count=len(posting)
+            )
+            cached = self._arrays[gram] = (slots, weights)
+        return cached
+
+    # ==================== 검색 ====================
+
+    def _idf(self, df: int) -> float:
+        n = len(self._slots)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[Hashable, float]]:
+        """
+        BM25 점수 상위 k개
+
+        점수는 질의 n-gram이 모두 최대로 일치할 때의 점수로 나눠 0~1로 정규화합니다.
+
+        Returns:
+            (문서 키, 점수) 리스트 (점수 내림차순, 0점 제외)
+        """
+        if not self._slots or top_k <= 0:
+            return []
+
+        query_terms = char_ngrams(query, self.ngram_sizes)
+        if not query_terms:
+            return []
+
+        max_score = 0.0
+        matched = []
+        for gram in query_terms:
+            posting = self._postings.get(gram)
+            idf = self._idf(len(posting) if posting else 0)
+            max_score += idf * (self.k1 + 1)
+            if posting:
+                matched.append((gram, idf))
+
+        if not matched:
+            return []
+        if np is None:
+            return self._search_python(matched, max_score, top_k)
+
+        scores = np.zeros(len(self._keys), dtype=np.float64)
+        for gram, idf in matched:
+            slots, weights = self._term_arrays(gram)
+            scores[slots] += idf * weights
+
+        if top_k < len(scores):
+            candidates = np.argpartition(scores, -top_k)[-top_k:]
+        else:
+            candidates = np.arange(len(scores))
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        return [
+            (self._keys[slot], float(scores[slot] / max_score))
+            for slot in candidates.tolist()
+            if scores[slot] > 0
+        ]
+
+    def _search_python(self, matched: List[Tuple[str, float]], max_score: float, top_k: int) -> List[Tuple[Hashable, float]]:
+        """NumPy 없이 같은 역색인을 딕셔너리로 합산"""
+        scores: Dict[int, float] = {}
+        for gram, idf in matched:
+            for slot, tf in self._postings[gram].items():
+                scores[slot] = scores.get(slot, 0.0) + idf * self._weight(tf, slot)
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        return [(self._keys[slot], score / max_score) for slot, score in best if score > 0]
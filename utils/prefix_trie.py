@@ -0,0 +1,54 @@
+"""
+접두사 트라이 (자동완성용)
+- 노드마다 상위 k개 항목 ID를 미리 저장 → 조회는 O(질의 길이 + k)
+- 항목은 순위 순서대로 추가해야 함 (먼저 추가한 항목이 우선)
+"""
+from typing import Dict, List
+
+
+class _Node:
+    __slots__ = ("children", "top")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.top: List[int] = []
+
+
+class PrefixTrie:
+    """상위 k개를 노드에 캐시하는 접두사 트라이"""
+
+    def __init__(self, top_k: int = 10):
+        """
+        Args:
+            top_k: 노드별로 보관할 최대 항목 수 (조회 limit 상한)
+        """
+        self.top_k = top_k
+        self.root = _Node()
+        self.node_count = 1
+
+    def insert(self, key: str, item_id: int):
+        """
+        key 경로의 모든 노드에 item_id 등록
+
+        같은 항목을 여러 키(단어 시작 위치별 접미사 등)로 넣어도 노드당 한 번만 저장됩니다.
+        """
+        node = self.root
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _Node()
+                self.node_count += 1
+            node = child
+            if len(node.top) < self.top_k and item_id not in node.top:
+                node.top.append(item_id)
+
+    def search(self, prefix: str, limit: int) -> List[int]:
+        """prefix로 시작하는 키를 가진 항목 ID (추가 순서 = 순위 순)"""
+        if not prefix:
+            return []
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return node.top[:limit]
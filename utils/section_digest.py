@@ -0,0 +1,106 @@
+"""
+섹션 다이제스트 (LLM 프롬프트용 정리본)
+- [Page N] 표식, 이미지/base64 참조, 구분선, 강조 기호(**), 빈 줄 제거
+- 한 섹션 안에서 반복된 문장과 여러 섹션에 반복된 상투 문구(boilerplate) 제거
+- 번호 매긴 절차(1. 2. ...)와 짧은 라벨([참고] 등)은 반복되어도 유지 (순서/구조 보존)
+
+tools/generate_metadata.py가 오프라인으로 만들어 data/section_digests.json에 저장하고,
+런타임(LLMSearchService)은 원문 해시가 같을 때만 원문 대신 다이제스트를 보냅니다.
+"""
+import math
+import re
+from typing import Iterable, Optional, Set
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")  # gpt-3.5-turbo 계열 토크나이저
+except Exception:
+    _ENCODING = None
+
+
+_PAGE_MARKER = re.compile(r"^\[Page\s*\d+\]$")
+_IMAGE = re.compile(r"!\[[^\]]*\]\([^)]*\)|<img\b[^>]*>|data:[\w/+.-]+;base64,[A-Za-z0-9+/=]+")
+_HTML_COMMENT = re.compile(r"<!--.*?-->")
+_RULE = re.compile(r"^([-*_])\1{2,}$")
+_EMPHASIS = re.compile(r"\*\*|__")
+_SPACES = re.compile(r"[ \t ]+")
+_NUMBERED = re.compile(r"^\d+[.)]\s")
+_HANGUL = re.compile(r"[가-힣]")
+
+# 반복 제거 대상 최소 길이 (짧은 라벨은 구조 표시라 유지)
+MIN_DEDUP_LENGTH = 15
+
+
+def count_tokens(text: str) -> int:
+    """
+    프롬프트 토큰 수
+
+    tiktoken이 있으면 정확히 세고, 없으면 추정 (한글 1자 = 약 2토큰, 그 외 약 4자 = 1토큰)
+    """
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    hangul = len(_HANGUL.findall(text))
+    return hangul * 2 + math.ceil((len(text) - hangul) / 4)
+
+
+def token_counter_name() -> str:
+    """리포트 표시용 토큰 계산 방식"""
+    return "tiktoken cl100k_base" if _ENCODING is not None else "추정치 (tiktoken 미설치)"
+
+
+def normalize_line(line: str) -> str:
+    """
+    한 줄 정리 (노이즈 줄이면 빈 문자열)
+
+    들여쓰기는 유지하고 줄 안의 연속 공백만 합칩니다.
+    """
+    line = line.replace("﻿", "").rstrip()
+    stripped = line.strip()
+    if not stripped or _PAGE_MARKER.match(stripped) or _RULE.match(stripped):
+        return ""
+    indent = line[:len(line) - len(line.lstrip())]
+    stripped = _IMAGE.sub("", stripped)
+    stripped = _HTML_COMMENT.sub("", stripped)
+    stripped = _EMPHASIS.sub("", stripped)
+    stripped = _SPACES.sub(" ", stripped).strip()
+    return indent + stripped if stripped else ""
+
+
+def is_dedupable(line: str) -> bool:
+    """반복 시 제거해도 되는 줄 (번호 매긴 절차, 제목, 짧은 라벨 제외)"""
+    stripped = line.strip()
+    return (
+        len(stripped) >= MIN_DEDUP_LENGTH
+        and not stripped.startswith("#")
+        and not _NUMBERED.match(stripped)
+    )
+
+
+def find_boilerplate(sections: Iterable[str], min_sections: int = 5) -> Set[str]:
+    """여러 섹션(min_sections개 이상)에 똑같이 반복되는 줄"""
+    counts = {}
+    for text in sections:
+        for line in {normalize_line(raw).strip() for raw in text.splitlines()}:
+            if line and is_dedupable(line):
+                counts[line] = counts.get(line, 0) + 1
+    return {line for line, count in counts.items() if count >= min_sections}
+
+
+def digest_section(text: str, boilerplate: Optional[Set[str]] = None) -> str:
+    """섹션 원문 → 다이제스트"""
+    boilerplate = boilerplate or set()
+    seen = set()
+    lines = []
+    for raw in text.splitlines():
+        line = normalize_line(raw)
+        if not line:
+            continue
+        key = line.strip()
+        if is_dedupable(line):
+            if key in seen or key in boilerplate:
+                continue
+            seen.add(key)
+        lines.append(line)
+    return "\n".join(lines)
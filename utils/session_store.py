@@ -0,0 +1,314 @@
+"""
+세션 저장소 (Write-behind)
+- 변경 사항은 메모리에 즉시 반영하고, 압축된 로그(JSONL)에 백그라운드로 추가 기록
+- 주기적으로 스냅샷(sessions.json)을 다시 쓰고 로그를 비움 (compaction)
+- 만료 시각 min-heap + 백그라운드 스위퍼로 만료 세션 정리
+"""
+import heapq
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+class SessionStore:
+    """세션 저장소 (스냅샷 + 추가 전용 로그 + 만료 힙)"""
+
+    def __init__(
+        self,
+        snapshot_file: str,
+        log_file: Optional[str] = None,
+        flush_interval: float = 2.0,
+        sweep_interval: float = 60.0,
+        compact_threshold: int = 1000,
+        touch_granularity: float = 60.0
+    ):
+        """
+        Args:
+            snapshot_file: 스냅샷 파일 경로 (기존 sessions.json 형식)
+            log_file: 변경 로그 파일 경로 (기본: 스냅샷과 같은 이름의 .log)
+            flush_interval: 로그 기록 주기 (초)
+            sweep_interval: 만료 세션 정리 주기 (초)
+            compact_threshold: 로그 항목이 이 수를 넘으면 스냅샷으로 압축
+            touch_granularity: 슬라이딩 만료 갱신을 로그에 남기는 최소 간격 (초)
+        """
+        self.snapshot_file = Path(snapshot_file)
+        self.log_file = Path(log_file) if log_file else self.snapshot_file.with_suffix(".log")
+        self.flush_interval = flush_interval
+        self.sweep_interval = sweep_interval
+        self.compact_threshold = compact_threshold
+        self.touch_granularity = touch_granularity
+
+        self._sessions: Dict[str, Dict] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._pending: List[Dict] = []            # 아직 로그에 기록되지 않은 변경
+        self._touched: Dict[str, datetime] = {}   # 토큰별 마지막 만료 갱신 (flush 시 병합 기록)
+        self._touch_marks: Dict[str, float] = {}  # 토큰별 마지막으로 기록한 만료 시각
+        self._log_entries = 0
+
+        self._lock = threading.Lock()      # 메모리 상태 보호
+        self._io_lock = threading.Lock()   # 파일 쓰기 직렬화
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._load()
+
+    # ==================== 조회/변경 ====================
+
+    def get(self, token: str) -> Optional[Dict]:
+        """세션 조회 (만료된 세션은 삭제 후 None)"""
+        with self._lock:
+            session = self._sessions.get(token)
+            if session is None:
+                return None
+
+            if datetime.now() > session["expire_time"]:
+                self._remove_locked(token)
+                return None
+
+            return session
+
+    def put(self, token: str, session: Dict):
+        """세션 저장 (user, login_time, expire_time)"""
+        with self._lock:
+            self._sessions[token] = session
+            expire_ts = session["expire_time"].timestamp()
+            heapq.heappush(self._expiry_heap, (expire_ts, token))
+            self._touch_marks[token] = expire_ts
+            self._touched.pop(token, None)
+            self._pending.append({
+                "op": "put",
+                "token": token,
+                "user": session["user"],
+                "login_time": session["login_time"].isoformat(),
+                "expire_time": session["expire_time"].isoformat()
+            })
+
+    def delete(self, token: str) -> bool:
+        """세션 삭제"""
+        with self._lock:
+            if token not in self._sessions:
+                return False
+            self._remove_locked(token)
+            return True
+
+    def touch(self, token: str, expire_time: datetime):
+        """
+        세션 만료 시각 연장 (슬라이딩 만료)
+
+        힙에는 넣지 않고, 스위퍼가 오래된 힙 항목을 만났을 때 다시 넣습니다.
+        로그에는 touch_granularity 이상 변했을 때만 flush 시 1건으로 병합 기록합니다.
+        """
+        with self._lock:
+            session = self._sessions.get(token)
+            if session is None:
+                return
+
+            session["expire_time"] = expire_time
+            expire_ts = expire_time.timestamp()
+            if expire_ts - self._touch_marks.get(token, 0) >= self.touch_granularity:
+                self._touch_marks[token] = expire_ts
+                self._touched[token] = expire_time
+
+    def purge_expired(self) -> int:
+        """만료 세션 정리 (힙 최상단부터 만료된 항목만 확인)"""
+        now = time.time()
+        removed = 0
+
+        with self._lock:
+            heap = self._expiry_heap
+            while heap and heap[0][0] <= now:
+                _, token = heapq.heappop(heap)
+                session = self._sessions.get(token)
+                if session is None:
+                    continue
+
+                expire_ts = session["expire_time"].timestamp()
+                if expire_ts > now:
+                    # 슬라이딩 갱신된 세션 → 새 만료 시각으로 다시 등록
+                    heapq.heappush(heap, (expire_ts, token))
+                    continue
+
+                self._remove_locked(token)
+                removed += 1
+
+        return removed
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, token: str) -> bool:
+        return token in self._sessions
+
+    def _remove_locked(self, token: str):
+        """세션 삭제 (잠금 보유 상태에서 호출)"""
+        del self._sessions[token]
+        self._touched.pop(token, None)
+        self._touch_marks.pop(token, None)
+        self._pending.append({"op": "del", "token": token})
+
+    # ==================== 영속화 ====================
+
+    def flush(self):
+        """대기 중인 변경을 로그에 추가 기록 (필요 시 압축)"""
+        with self._io_lock:
+            with self._lock:
+                ops = self._pending
+                self._pending = []
+                for token, expire_time in self._touched.items():
+                    ops.append({"op": "touch", "token": token, "expire_time": expire_time.isoformat()})
+                self._touched = {}
+
+            if ops:
+                try:
+                    self.log_file.parent.mkdir(parents=True, exist_ok=True)
+                    lines = "".join(json.dumps(op, ensure_ascii=False) + "\n" for op in ops)
+                    with open(self.log_file, "a", encoding="utf-8") as f:
+                        f.write(lines)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    self._log_entries += len(ops)
+                except Exception as e:
+                    print(f"⚠️  세션 로그 기록 실패: {e}")
+                    # 다음 flush에서 다시 시도
+                    with self._lock:
+                        self._pending = ops + self._pending
+                    return
+
+            if self._log_entries >= self.compact_threshold:
+                self._compact_locked()
+
+    def compact(self):
+        """스냅샷을 다시 쓰고 로그 비우기"""
+        with self._io_lock:
+            self._compact_locked()
+
+    def _compact_locked(self):
+        """압축 (io 잠금 보유 상태에서 호출)"""
+        with self._lock:
+            data = {
+                token: {
+                    "user": session["user"],
+                    "login_time": session["login_time"].isoformat(),
+                    "expire_time": session["expire_time"].isoformat()
+                }
+                for token, session in self._sessions.items()
+            }
+            # 스냅샷에 이미 반영된 변경은 로그에 남길 필요 없음
+            self._pending = []
+            self._touched = {}
+
+        try:
+            self.snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.snapshot_file.with_suffix(self.snapshot_file.suffix + ".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.snapshot_file)
+
+            # 스냅샷 교체 후 로그 비우기
+            with open(self.log_file, "w", encoding="utf-8"):
+                pass
+            self._log_entries = 0
+        except Exception as e:
+            print(f"⚠️  세션 스냅샷 저장 실패: {e}")
+
+    def _load(self):
+        """스냅샷 + 로그 재생으로 세션 복원"""
+        sessions: Dict[str, Dict] = {}
+
+        if self.snapshot_file.exists():
+            try:
+                with open(self.snapshot_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                for token, session in data.items():
+                    sessions[token] = {
+                        "user": session["user"],
+                        "login_time": datetime.fromisoformat(session["login_time"]),
+                        "expire_time": datetime.fromisoformat(session["expire_time"])
+                    }
+            except Exception as e:
+                print(f"⚠️  세션 스냅샷 로드 실패: {e}, 새로 시작합니다")
+                sessions = {}
+
+        log_entries = 0
+        if self.log_file.exists():
+            try:
+                with open(self.log_file, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            op = json.loads(line)
+                        except json.JSONDecodeError:
+                            # 비정상 종료로 잘린 마지막 줄은 무시
+                            continue
+                        log_entries += 1
+                        self._apply_op(sessions, op)
+            except Exception as e:
+                print(f"⚠️  세션 로그 재생 실패: {e}")
+
+        # 만료된 세션 제외 후 힙 구성
+        now = datetime.now()
+        self._sessions = {t: s for t, s in sessions.items() if s["expire_time"] > now}
+        self._expiry_heap = [(s["expire_time"].timestamp(), t) for t, s in self._sessions.items()]
+        heapq.heapify(self._expiry_heap)
+        self._touch_marks = {t: ts for ts, t in self._expiry_heap}
+        self._log_entries = log_entries
+
+        print(f"✅ {len(self._sessions)}개 세션 로드 완료")
+
+    @staticmethod
+    def _apply_op(sessions: Dict[str, Dict], op: Dict):
+        """로그 항목 1건을 세션 딕셔너리에 적용"""
+        kind = op.get("op")
+        token = op.get("token")
+
+        if kind == "put":
+            sessions[token] = {
+                "user": op["user"],
+                "login_time": datetime.fromisoformat(op["login_time"]),
+                "expire_time": datetime.fromisoformat(op["expire_time"])
+            }
+        elif kind == "touch":
+            if token in sessions:
+                sessions[token]["expire_time"] = datetime.fromisoformat(op["expire_time"])
+        elif kind == "del":
+            sessions.pop(token, None)
+
+    # ==================== 백그라운드 작업 ====================
+
+    def start(self):
+        """백그라운드 flush/스위퍼 스레드 시작"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="session-store", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """스레드 종료 + 만료 정리 + 최종 압축"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+        self.purge_expired()
+        self.flush()
+        self.compact()
+
+    def _run(self):
+        """flush_interval마다 로그 기록, sweep_interval마다 만료 정리"""
+        last_sweep = time.time()
+
+        while not self._stop_event.wait(self.flush_interval):
+            try:
+                if time.time() - last_sweep >= self.sweep_interval:
+                    self.purge_expired()
+                    last_sweep = time.time()
+                self.flush()
+            except Exception as e:
+                print(f"⚠️  세션 백그라운드 작업 오류: {e}")
@@ -0,0 +1,193 @@
+"""
+Stateless 서명 세션 토큰
+- HMAC-SHA256(SECRET_KEY) 서명, 사번/이름/부서/역할/만료 포함
+- 검증 시 공유 상태 없음 (워커/호스트 간 수평 확장 가능)
+- 로그아웃용 소형 폐기 목록 (만료되면 자동 제거, 파일로 워커 간 공유)
+"""
+import base64
+import hashlib
+import heapq
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from utils.file_lock import FileLock, atomic_write_json
+
+
+TOKEN_VERSION = "v1"
+
+
+def _b64encode(data: bytes) -> str:
+    """URL-safe base64 (패딩 제거)"""
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    """URL-safe base64 디코딩 (패딩 복원)"""
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def is_signed_token(token: str) -> bool:
+    """서명 토큰 형식인지 확인 (세션 토큰은 '.'을 포함하지 않음)"""
+    return token.startswith(TOKEN_VERSION + ".")
+
+
+class SignedTokenCodec:
+    """서명 토큰 발급/검증"""
+
+    def __init__(self, secret_key: str):
+        self._key = hashlib.sha256(secret_key.encode("utf-8")).digest()
+
+    def _sign(self, message: bytes) -> str:
+        return _b64encode(hmac.new(self._key, message, hashlib.sha256).digest())
+
+    def issue(self, claims: Dict, ttl_seconds: int) -> Tuple[str, Dict]:
+        """
+        토큰 발급
+
+        Args:
+            claims: 토큰에 담을 사용자 정보 (sub, name, dept, email, role)
+            ttl_seconds: 유효 시간 (초)
+
+        Returns:
+            (토큰, 최종 payload)
+        """
+        payload = dict(claims)
+        payload["exp"] = int(time.time()) + ttl_seconds
+        payload["jti"] = secrets.token_urlsafe(9)
+
+        body = _b64encode(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        signing_input = f"{TOKEN_VERSION}.{body}".encode("ascii")
+        return f"{TOKEN_VERSION}.{body}.{self._sign(signing_input)}", payload
+
+    def verify(self, token: str) -> Optional[Dict]:
+        """
+        토큰 검증 (서명 + 만료)
+
+        Returns:
+            payload 또는 None
+        """
+        try:
+            version, body, signature = token.split(".")
+        except ValueError:
+            return None
+
+        if version != TOKEN_VERSION:
+            return None
+
+        expected = self._sign(f"{version}.{body}".encode("ascii"))
+        if not hmac.compare_digest(expected, signature):
+            return None
+
+        try:
+            payload = json.loads(_b64decode(body))
+        except (ValueError, UnicodeDecodeError):
+            return None
+
+        if payload.get("exp", 0) < time.time():
+            return None
+
+        return payload
+
+
+class RevocationList:
+    """
+    폐기 토큰 목록 (jti → 만료 시각)
+
+    토큰 만료 이후에는 서명 검증에서 이미 걸러지므로 목록에서 제거합니다.
+    목록 파일의 mtime이 바뀌면 다시 읽어 다른 워커의 로그아웃도 반영합니다.
+    """
+
+    def __init__(self, file_path: str, reload_interval: float = 1.0):
+        self.file_path = Path(file_path)
+        self.reload_interval = reload_interval
+
+        self._revoked: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._mtime_ns = 0
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+        self._reload_if_changed(force=True)
+
+    def revoke(self, jti: str, exp: float):
+        """
+        토큰 폐기
+
+        다른 워커와 동시에 로그아웃해도 항목이 유실되지 않도록
+        파일 배타 잠금을 쥔 채로 다시 읽기 → 추가 → 저장합니다.
+        """
+        with self._lock:
+            try:
+                self.file_path.parent.mkdir(parents=True, exist_ok=True)
+                with FileLock(str(self.file_path)):
+                    self._reload_if_changed(force=True)
+                    self._add(jti, exp)
+                    self._save()
+            except (OSError, TimeoutError) as e:
+                # 파일 공유 실패 시에도 이 워커에서는 폐기 유지
+                print(f"⚠️  토큰 폐기 목록 잠금 실패: {e}")
+                self._add(jti, exp)
+
+    def _add(self, jti: str, exp: float):
+        """메모리 목록에 추가 (잠금 보유 상태에서 호출)"""
+        self._revoked[jti] = exp
+        heapq.heappush(self._heap, (exp, jti))
+        self._prune()
+
+    def is_revoked(self, jti: str) -> bool:
+        """폐기 여부 확인"""
+        now = time.time()
+        if now - self._last_check >= self.reload_interval:
+            with self._lock:
+                self._reload_if_changed()
+                self._prune()
+
+        return jti in self._revoked
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def _prune(self):
+        """만료된 항목 제거 (힙 최상단부터)"""
+        now = time.time()
+        while self._heap and self._heap[0][0] < now:
+            exp, jti = heapq.heappop(self._heap)
+            if self._revoked.get(jti) == exp:
+                del self._revoked[jti]
+
+    def _reload_if_changed(self, force: bool = False):
+        """파일이 바뀌었으면 다시 로드 (잠금 보유 상태에서 호출)"""
+        self._last_check = time.time()
+        try:
+            mtime_ns = os.stat(self.file_path).st_mtime_ns
+        except FileNotFoundError:
+            return
+
+        if not force and mtime_ns == self._mtime_ns:
+            return
+
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  토큰 폐기 목록 로드 실패: {e}")
+            return
+
+        self._revoked.update({jti: float(exp) for jti, exp in data.items()})
+        self._heap = [(exp, jti) for jti, exp in self._revoked.items()]
+        heapq.heapify(self._heap)
+        self._mtime_ns = mtime_ns
+
+    def _save(self):
+        """목록 저장 (고유 임시 파일 + 원자적 교체, 파일 잠금 보유 상태에서 호출)"""
+        try:
+            atomic_write_json(str(self.file_path), self._revoked, indent=None)
+            self._mtime_ns = os.stat(self.file_path).st_mtime_ns
+        except OSError as e:
+            print(f"⚠️  토큰 폐기 목록 저장 실패: {e}")
@@ -0,0 +1,176 @@
+"""
+도메인 용어 오타 교정 (SymSpell 방식)
+- 한글은 자모 단위로 분해해 비교 (연챠 → 연차, 녜트워크 → 네트워크)
+- 사전 단어의 삭제 이웃(최대 편집 거리까지 글자를 지운 변형)을 미리 계산
+  → 조회는 질의 토큰의 삭제 변형으로 후보를 바로 찾고 편집 거리로 검증 (토큰당 1ms 미만)
+- 인접 글자 뒤바뀜도 거리 1로 계산 (VID → VDI)
+
+사전은 메타데이터 키워드와 FAQ 키워드로 구성합니다 (startup_event에서 구축).
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.hangul import decompose, is_hangul_syllable
+
+
+_WORD = re.compile(r"[가-힣a-zA-Z0-9]+")
+
+# 교정 시 떼어 보는 조사 (긴 것부터)
+JOSA = ("에서", "으로", "이랑", "을", "를", "이", "가", "은", "는", "도", "에", "로", "의", "랑", "좀")
+
+
+def _deletes(key: str, max_distance: int) -> Set[str]:
+    """key에서 최대 max_distance개 글자를 지운 변형 (key 자신 포함)"""
+    result = {key}
+    frontier = {key}
+    for _ in range(max_distance):
+        frontier = {
+            variant[:i] + variant[i + 1:]
+            for variant in frontier if len(variant) > 1
+            for i in range(len(variant))
+        } - result
+        result |= frontier
+    return result
+
+
+def _edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    제한 편집 거리 (삽입/삭제/치환/인접 전치, Optimal String Alignment)
+
+    max_distance를 넘으면 max_distance + 1 반환
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+
+class SpellCorrector:
+    """자모 단위 SymSpell 사전"""
+
+    def __init__(self, max_distance: int = 2, prefix_length: int = 8):
+        """
+        Args:
+            max_distance: 최대 편집 거리 (자모 기준, 짧은 단어는 더 작게 적용)
+            prefix_length: 삭제 이웃을 계산할 앞부분 길이 (자모 기준, 메모리 절약)
+        """
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self._words: Dict[str, Tuple[str, int]] = {}  # 자모 키 → (원래 표기, 등장 횟수)
+        self._deletes: Dict[str, Tuple[str, ...]] = {}  # 삭제 변형 → 자모 키들
+
+    @property
+    def size(self) -> int:
+        """사전 단어 수"""
+        return len(self._words)
+
+    def build(self, words: Iterable[str]):
+        """사전 재구축"""
+        self._words = {}
+        self._deletes = {}
+        self.add_words(words)
+        print(f"✅ 오타 교정 사전 구축 완료 ({self.size}개 단어)")
+
+    def add_words(self, words: Iterable[str]):
+        """
+        사전에 단어 추가 (공백 등으로 구분된 구는 토큰별로 추가)
+
+        변형 목록은 새 튜플로 교체하므로 조회 중인 다른 스레드에 영향이 없습니다.
+        """
+        for phrase in words:
+            for token in _WORD.findall(phrase or ""):
+                if len(token) < 2:
+                    continue
+                key = decompose(token.lower())
+                if key in self._words:
+                    original, count = self._words[key]
+                    self._words[key] = (original, count + 1)
+                    continue
+                self._words[key] = (token, 1)
+                for variant in _deletes(key[:self.prefix_length], self.max_distance):
+                    self._deletes[variant] = self._deletes.get(variant, ()) + (key,)
+
+    def _distance_limit(self, key: str) -> int:
+        """짧은 단어일수록 허용 거리 축소 (과교정 방지)"""
+        if len(key) < 3:
+            return 0
+        if len(key) < 6:
+            return min(1, self.max_distance)
+        return self.max_distance
+
+    def lookup(self, token: str) -> Optional[str]:
+        """
+        토큰 교정
+
+        Returns:
+            교정된 사전 단어 (사전에 이미 있거나, 후보가 없거나, 같은 거리의 후보가 여럿이면 None)
+        """
+        key = decompose(token.lower())
+        if len(token) < 2 or key in self._words:
+            return None
+        limit = self._distance_limit(key)
+        if not limit:
+            return None
+
+        candidates: Set[str] = set()
+        for variant in _deletes(key[:self.prefix_length], limit):
+            candidates.update(self._deletes.get(variant, ()))
+
+        best: List[Tuple[int, int, str]] = []
+        for candidate in candidates:
+            distance = _edit_distance(key, candidate, limit)
+            if distance <= limit:
+                best.append((distance, -self._words[candidate][1], candidate))
+        if not best:
+            return None
+
+        best.sort()
+        if len(best) > 1 and best[0][:2] == best[1][:2]:
+            return None  # 애매하면 교정하지 않음
+        return self._words[best[0][2]][0]
+
+    def _is_word_with_josa(self, token: str) -> bool:
+        """사전 단어 + 조사 형태인지 (예: 네트워크가)"""
+        if not token or not is_hangul_syllable(token[-1]):
+            return False
+        return any(
+            token.endswith(josa) and len(token) - len(josa) >= 2
+            and decompose(token[:-len(josa)].lower()) in self._words
+            for josa in JOSA
+        )
+
+    def correct_token(self, token: str) -> str:
+        """토큰 교정 (사전 단어는 그대로, 조사가 붙은 한글 토큰은 조사를 떼고 시도, 실패하면 원래 토큰)"""
+        # 사전 단어(또는 사전 단어 + 조사)는 그대로 (끝 글자를 조사로 오인해 어간을 '교정'하지 않도록)
+        if decompose(token.lower()) in self._words or self._is_word_with_josa(token):
+            return token
+        corrected = self.lookup(token)
+        if corrected:
+            return corrected
+        if token and is_hangul_syllable(token[-1]):
+            for josa in JOSA:
+                stem = token[:-len(josa)]
+                if token.endswith(josa) and len(stem) >= 2:
+                    corrected = self.lookup(stem)
+                    if corrected:
+                        return corrected + josa
+        return token
+
+    def correct_text(self, text: str) -> str:
+        """문장 안의 단어를 교정 (공백/문장부호 유지)"""
+        return _WORD.sub(lambda match: self.correct_token(match.group(0)), text)
+
+
+# 싱글톤 인스턴스 (startup_event에서 구축)
+spell_corrector = SpellCorrector()
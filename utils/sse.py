@@ -0,0 +1,39 @@
+"""
+Server-Sent Events 프레이밍
+- 여러 줄 데이터는 줄마다 data: 필드로 분리 (클라이언트가 \n으로 다시 합침)
+- 이벤트는 빈 줄(\n\n)로 종료
+- 하트비트는 주석 줄(:)이라 클라이언트 onmessage에 전달되지 않음
+"""
+import json
+from typing import Any, Optional
+
+
+def format_event(data: Any, event: Optional[str] = None, event_id: Optional[str] = None) -> str:
+    """
+    SSE 이벤트 1개 생성
+
+    Args:
+        data: 문자열은 그대로, 그 외는 JSON으로 직렬화
+        event: 이벤트 타입 (None이면 기본 message)
+        event_id: 이벤트 ID (재연결 시 Last-Event-ID)
+
+    Returns:
+        "event: ...\\ndata: ...\\n\\n" 형식 문자열
+    """
+    if not isinstance(data, str):
+        data = json.dumps(data, ensure_ascii=False)
+
+    lines = []
+    if event:
+        lines.append(f"event: {event}")
+    if event_id:
+        lines.append(f"id: {event_id}")
+    # \r\n, \r, \n 모두 줄바꿈으로 취급 (SSE 명세)
+    for line in data.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+        lines.append(f"data: {line}")
+    return "\n".join(lines) + "\n\n"
+
+
+def heartbeat(comment: str = "ping") -> str:
+    """연결 유지용 주석 이벤트 (프록시 유휴 타임아웃 방지)"""
+    return f": {comment}\n\n"